@@ -1,34 +1,78 @@
 import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+import functools
+import io
 import json
 import os
-import requests
-import numpy as np
 from datetime import datetime
-from utils.analyzer import analyze_contract
-from utils.report_generator import SecurityReportGenerator
-from utils.file_manager import FileManager
+from utils.cache_stats import cache_stats
+from utils.startup_profile import startup_profiler
+from utils.reachability import REACHABILITY_FLAGS
+from utils.rules import get_ruleset
+from utils.dependency_index import DEPENDENCY_KINDS
+from utils.deep_analysis import DEEP_ANALYSIS_ENABLED
+from utils.tracing import flatten_trace, tracer
+from utils.guards import budget_message
+from utils.profiling import ProfileCapture
 
-# 파일 관리자 초기화
-file_manager = FileManager()
+# matplotlib, networkx, numpy, fpdf, requests 등 무거운 모듈은 처음 사용할 때 임포트합니다.
+# ETH_LENS_PROFILE_STARTUP=1 로 실행하면 임포트/초기화 단계별 시간이 사이드바에 표시됩니다.
 
-# 한글 폰트 설정
-import matplotlib.font_manager as fm
-import platform
+# 캐시 제한 (세션 수와 관계없이 프로세스 메모리 사용량을 일정하게 유지)
+ANALYSIS_CACHE_TTL = 3600          # 분석 결과 유지 시간 (초)
+ANALYSIS_CACHE_MAX_ENTRIES = 256   # 캐시할 최대 컨트랙트 수
+FIGURE_CACHE_TTL = 3600            # 렌더링된 그림 유지 시간 (초)
+FIGURE_CACHE_MAX_ENTRIES = 128     # 캐시할 최대 그림 수
 
-# 시스템에 설치된 한글 폰트 찾기
+def tracked_cache_data(name, **cache_kwargs):
+    """st.cache_data에 캐시 적중/미스 집계를 더한 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            # 캐시 미스일 때만 실행됨
+            cache_stats.record_miss(name)
+            return func(*args, **kwargs)
+        cached = st.cache_data(show_spinner=False, **cache_kwargs)(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_stats.record_call(name)
+            return cached(*args, **kwargs)
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+# 파일 관리자 초기화 (프로세스 전체에서 하나만 사용)
+@st.cache_resource(max_entries=1)
+def get_file_manager():
+    file_manager_module = startup_profiler.import_module("utils.file_manager")
+    with startup_profiler.stage("FileManager 초기화"):
+        return file_manager_module.FileManager()
+
+file_manager = get_file_manager()
+
+@st.cache_resource(max_entries=1)
+def get_metrics_server():
+    """ETH_LENS_METRICS_PORT가 설정되어 있으면 Prometheus 지표 엔드포인트를 한 번만 시작합니다."""
+    metrics = startup_profiler.import_module("utils.metrics")
+    return metrics.start_metrics_server()
+
+get_metrics_server()
+
+# 시스템에 설치된 한글 폰트 찾기 (프로세스당 한 번만 조회)
+@st.cache_resource(max_entries=1)
 def get_korean_font():
+    import platform
     if platform.system() == 'Darwin':  # macOS
-        # macOS에서 사용 가능한 한글 폰트들
+        # macOS에서 사용 가능한 한글 폰트들 (findfont는 폰트 캐시를 생성할 수 있어 느림)
+        fm = startup_profiler.import_module("matplotlib.font_manager")
         korean_fonts = ['AppleGothic', 'Apple SD Gothic Neo', 'NanumGothic', 'Malgun Gothic']
-        for font in korean_fonts:
-            try:
-                fm.findfont(font)
-                return font
-            except:
-                continue
+        with startup_profiler.stage("한글 폰트 조회"):
+            for font in korean_fonts:
+                try:
+                    fm.findfont(font)
+                    return font
+                except:
+                    continue
     elif platform.system() == 'Windows':
         return 'Malgun Gothic'
     else:  # Linux
@@ -37,125 +81,278 @@ def get_korean_font():
     # 기본값
     return 'DejaVu Sans'
 
-# 폰트 설정
-plt.rcParams['font.family'] = get_korean_font()
-plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+@st.cache_resource(max_entries=1)
+def get_pyplot():
+    """matplotlib을 처음 사용할 때 임포트하고 백엔드와 폰트를 한 번만 설정합니다."""
+    matplotlib = startup_profiler.import_module("matplotlib")
+    matplotlib.use('Agg')
+    plt = startup_profiler.import_module("matplotlib.pyplot")
+    # 폰트 설정
+    plt.rcParams['font.family'] = get_korean_font()
+    plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+    return plt
+
+def _figure_to_png(fig) -> bytes:
+    """matplotlib 그림을 PNG 바이트로 변환하고 닫습니다."""
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', bbox_inches='tight')
+    get_pyplot().close(fig)  # 메모리 정리
+    return img_buffer.getvalue()
+
+@tracked_cache_data("analysis", ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES)
+def run_analysis(address, ruleset_version):
+    """컨트랙트 분석 결과를 프로세스 전체에서 공유하도록 캐시합니다.
+
+    같은 주소의 저장된 분석 결과가 있으면 변경된 함수만 다시 분석합니다.
+    ETH_LENS_SERVICE_URL이 설정되어 있으면 앱 대신 분석 서비스(utils.service)가 분석합니다.
+    규칙 파일이 바뀌면 ruleset_version이 달라지므로 캐시된 결과를 재사용하지 않습니다.
+    """
+    service_client = startup_profiler.import_module("utils.service").get_service_client()
+    if service_client is not None:
+        # 분석 서비스(ETH_LENS_SERVICE_URL)가 설정되어 있으면 서비스에 분석을 요청
+        return service_client.analyze(address)
+    analyzer = startup_profiler.import_module("utils.analyzer")
+    previous_result = file_manager.get_latest_analysis(address)
+    return analyzer.analyze_contract(address, previous_result=previous_result)
+
+@tracked_cache_data("analysis_comparison", ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES)
+def compare_saved_analyses(base_filename, target_filename):
+    """저장된 두 분석 결과와 그 차이를 반환합니다 (파일명에 저장 일시가 들어 있어 내용이 바뀌지 않으므로 캐시)."""
+    analyzer = startup_profiler.import_module("utils.analyzer")
+    base_result = file_manager.load_analysis(base_filename)
+    target_result = file_manager.load_analysis(target_filename)
+    comparison = analyzer.compare_graphs(analyzer.graph_from_result(base_result),
+                                         analyzer.graph_from_result(target_result))
+    return base_result, target_result, comparison
+
+@tracked_cache_data("contract_source", ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES)
+def get_source_code(address):
+    """컨트랙트 소스코드를 캐시합니다 (유사 코드 탐지와 정밀 분석이 함께 사용)."""
+    analyzer = startup_profiler.import_module("utils.analyzer")
+    return analyzer.load_source_code(address)
+
+@tracked_cache_data("exploit_clones", ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES)
+def find_exploit_clones(address):
+    """컨트랙트 함수 중 알려진 취약 코드와 비슷한 함수를 찾습니다 (MinHash/LSH 색인 조회)."""
+    return file_manager.clone_detector.scan_source(get_source_code(address))
+
+@st.cache_resource(max_entries=1)
+def get_deep_analysis_engine():
+    """Slither 정밀 분석 엔진(작업 스레드 풀과 결과 캐시)을 프로세스 전체에서 공유합니다."""
+    deep_analysis = startup_profiler.import_module("utils.deep_analysis")
+    return deep_analysis.DeepAnalysisEngine(os.path.join(file_manager.save_dir, "deep_cache"))
+
+def get_deep_result(address):
+    """현재 세션에서 요청한 정밀 분석이 해당 주소의 것이면 그 결과(완료 전이면 None)를 반환합니다."""
+    job = st.session_state.get('deep_analysis_job')
+    if not deep_analysis_enabled or not job or job['address'] != address:
+        return None
+    return get_deep_analysis_engine().result(job['key'])
+
+@tracked_cache_data("findings_overview", max_entries=8)
+def get_findings_overview(generation):
+    """발견 사항 색인의 통계와 위험 유형 목록 (색인 세대가 바뀌면 다시 읽음)"""
+    return file_manager.findings_index.get_stats(), file_manager.findings_index.get_categories()
+
+def get_report_graph(address):
+    """저장/보고서용 분석 그래프를 반환합니다. 정밀 분석이 완료되었으면 그 발견 사항을 합칩니다."""
+    graph, dangerous_functions = run_analysis(address, ruleset.version)
+    deep_result = get_deep_result(address)
+    if deep_result and deep_result['status'] == 'completed':
+        deep_analysis = startup_profiler.import_module("utils.deep_analysis")
+        graph = deep_analysis.merge_deep_findings(graph, deep_result)
+        dangerous_functions = [node for node, dangers in graph.nodes(data='dangers') if dangers]
+    return graph, dangerous_functions
+
+@tracked_cache_data("call_graph_figure", ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def render_call_graph(address, ruleset_version):
+    """함수 호출 구조 그래프를 PNG로 렌더링하고 (PNG, 단계별 소요 시간)을 반환합니다."""
+    graph, dangerous_functions = run_analysis(address, ruleset_version)
+    nx = startup_profiler.import_module("networkx")
+    mpatches = startup_profiler.import_module("matplotlib.patches")
+    plt = get_pyplot()
+    with tracer.span("render_call_graph", nodes=len(graph.nodes())) as root:
+        fig, ax = plt.subplots(figsize=(12, 8))  # 보기 편한 크기로 조절
+        
+        # 더 나은 레이아웃 알고리즘 사용
+        with tracer.span("spring_layout"):
+            pos = nx.spring_layout(graph, k=3, iterations=100) if len(graph.nodes()) > 1 else nx.spring_layout(graph)
+        
+        # 노드 색상 및 크기 설정
+        node_colors = ['red' if node in dangerous_functions else 'lightblue' for node in graph.nodes()]
+        node_sizes = [4000 if node in dangerous_functions else 3000 for node in graph.nodes()]  # 노드 크기 증가
+        
+        # 엣지 색상 설정 (위험 함수로 가는 엣지는 빨간색)
+        edge_colors = []
+        for u, v in graph.edges():
+            if v in dangerous_functions:
+                edge_colors.append('red')
+            else:
+                edge_colors.append('gray')
+        
+        # 그래프 그리기
+        with tracer.span("draw"):
+            nx.draw(
+                graph, pos,
+                node_color=node_colors,
+                node_size=node_sizes,
+                font_size=10,  # 폰트 크기 증가
+                font_weight='bold',
+                arrows=True,
+                edge_color=edge_colors,
+                width=2.5,  # 엣지 두께 증가
+                with_labels=True,
+                ax=ax,
+                arrowstyle='->',
+                arrowsize=25  # 화살표 크기 증가
+            )
+        
+        # 범례 위치 조정
+        legend_elements = [
+            mpatches.Patch(color='red', label='Dangerous Functions'),
+            mpatches.Patch(color='lightblue', label='Normal Functions')
+        ]
+        ax.legend(handles=legend_elements, loc='upper right', fontsize=14, bbox_to_anchor=(1.15, 1))
+        ax.set_title("Function Call Structure", fontsize=18, fontweight='bold', pad=30)
+        
+        # 그래프 여백 조정
+        plt.tight_layout()
+        plt.subplots_adjust(right=0.85)  # 범례를 위한 여백
+        with tracer.span("render_png"):
+            png = _figure_to_png(fig)
+    return png, root.to_dict() if root is not None else None
+
+def render_trace(traces):
+    """단계별 소요 시간 스팬 트리들을 하나의 표로 표시합니다."""
+    rows = [
+        {"단계": "\u3000" * row['depth'] + row['stage'], "시간(ms)": round(row['seconds'] * 1000, 2),
+         "비율": f"{row['share']:.0%}"}
+        for trace in traces for row in flatten_trace(trace)
+    ]
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    else:
+        st.caption("단계별 시간이 기록되지 않았습니다 (ETH_LENS_TRACING=0).")
+
+@tracked_cache_data("yearly_chart", ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def render_yearly_chart(year_counts):
+    """연도별 사건 수 막대 그래프를 PNG로 렌더링합니다."""
+    np = startup_profiler.import_module("numpy")
+    plt = get_pyplot()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    years_list = [year for year, _ in year_counts]
+    counts = [count for _, count in year_counts]
+    colors = plt.cm.viridis(np.linspace(0, 1, len(years_list)))
+    bars = ax.bar(years_list, counts, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
+    ax.set_xlabel('Year', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Number of Incidents', fontsize=14, fontweight='bold')
+    ax.set_title('Incidents per Year', fontsize=16, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3, axis='y')
+    for bar, count in zip(bars, counts):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.05,
+               f'{count}', ha='center', va='bottom', fontweight='bold', fontsize=13)
+    plt.tight_layout()
+    return _figure_to_png(fig)
 
-# 이더스캔 API 설정
-ETHERSCAN_API_KEY = "YourApiKeyToken"  # 실제 사용시 API 키 필요
-ETHERSCAN_BASE_URL = "https://api.etherscan.io/api"
+@tracked_cache_data("loss_chart", ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def render_loss_chart(platform_losses):
+    """플랫폼별 손실액 파이 차트를 PNG로 렌더링합니다."""
+    plt = get_pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    platforms = [platform for platform, _ in platform_losses]
+    losses = [loss for _, loss in platform_losses]
+    colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99']
+    wedges, texts, autotexts = ax.pie(losses, labels=platforms, autopct='%1.1f%%', 
+                                     colors=colors[:len(platforms)], startangle=90, textprops={'fontsize': 13})
+    ax.set_title('Loss Distribution by Platform', fontsize=16, fontweight='bold', pad=20)
+    ax.legend(wedges, [f'{p}: ${l/1000000:.1f}M' for p, l in zip(platforms, losses)],
+             title="Loss by Platform", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1), fontsize=13)
+    plt.tight_layout()
+    return _figure_to_png(fig)
+
+@tracked_cache_data("attack_type_chart", ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def render_attack_type_chart(attack_types):
+    """공격 유형별 사건 수 가로 막대 그래프를 PNG로 렌더링합니다."""
+    np = startup_profiler.import_module("numpy")
+    plt = get_pyplot()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    causes = [cause for cause, _ in attack_types]
+    counts = [count for _, count in attack_types]
+    y_pos = np.arange(len(causes))
+    bars = ax.barh(y_pos, counts, color='lightcoral', alpha=0.8, edgecolor='darkred')
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(causes, fontsize=13)
+    ax.set_xlabel('Number of Incidents', fontsize=14, fontweight='bold')
+    ax.set_title('Incident Count by Attack Type', fontsize=16, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3, axis='x')
+    for bar, count in zip(bars, counts):
+        width = bar.get_width()
+        ax.text(width + 0.1, bar.get_y() + bar.get_height()/2,
+               f'{count}', ha='left', va='center', fontweight='bold', fontsize=13)
+    plt.tight_layout()
+    return _figure_to_png(fig)
+
+@tracked_cache_data("timeline_chart", ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def render_timeline_chart(year_stats):
+    """연도별 사건 수와 손실액 추이 그래프를 PNG로 렌더링합니다."""
+    plt = get_pyplot()
+    years = [year for year, _, _ in year_stats]
+    counts = [count for _, count, _ in year_stats]
+    losses = [loss for _, _, loss in year_stats]
+    fig, ax1 = plt.subplots(figsize=(12, 6))
+    ax1.plot(years, counts, marker='o', color='#4e79a7', label='Incidents', linewidth=2)
+    ax1.set_xlabel('Year', fontsize=14)
+    ax1.set_ylabel('Number of Incidents', fontsize=14, color='#4e79a7')
+    ax1.tick_params(axis='y', labelcolor='#4e79a7', labelsize=13)
+    ax1.set_title('Incident Trend by Year', fontsize=16, fontweight='bold', pad=10)
+    ax1.grid(True, axis='y', alpha=0.2, linestyle='--')
+    ax2 = ax1.twinx()
+    ax2.plot(years, [l/1_000_000 for l in losses], marker='s', color='#e15759', label='Loss (M USD)', linewidth=2, linestyle='dashed')
+    ax2.set_ylabel('Loss (Million USD)', fontsize=14, color='#e15759')
+    ax2.tick_params(axis='y', labelcolor='#e15759', labelsize=13)
+    lines1, labels1 = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper left', fontsize=13, framealpha=0.9)
+    plt.tight_layout()
+    return _figure_to_png(fig)
 
 def get_contract_info(address):
-    """이더스캔 API를 통해 컨트랙트 정보 가져오기"""
+    """이더스캔 API를 통해 컨트랙트 정보 가져오기 (분석과 같은 요청을 공유)"""
     try:
-        params = {
-            'module': 'contract',
-            'action': 'getsourcecode',
-            'address': address,
-            'apikey': ETHERSCAN_API_KEY
-        }
-        response = requests.get(ETHERSCAN_BASE_URL, params=params)
-        data = response.json()
-        
-        if data['status'] == '1' and data['result']:
-            contract_info = data['result'][0]
-            return {
-                'contract_name': contract_info.get('ContractName', 'Unknown'),
-                'compiler_version': contract_info.get('CompilerVersion', 'Unknown'),
-                'optimization_used': contract_info.get('OptimizationUsed', 'Unknown'),
-                'source_code': contract_info.get('SourceCode', ''),
-                'abi': contract_info.get('ABI', ''),
-                'verified': contract_info.get('SourceCode', '') != ''
-            }
+        fetcher = startup_profiler.import_module("utils.fetcher")
+        return fetcher.get_fetcher().fetch_contract(address)
     except Exception as e:
         st.error(f"이더스캔 API 오류: {str(e)}")
     return None
 
-def get_historical_incidents():
-    """2020~2025년 7월까지 실제 기사/보고서가 열리는 사건만 incidents에 반영."""
-    return [
-        {
-            "date": "2021-08-10",
-            "platform": "🔵 이더리움 (Ethereum)",
-            "incident": "Poly Network 해킹",
-            "description": "크로스체인 브리지 취약점으로 $600M 탈취",
-            "loss": "$600M",
-            "cause": "브리지 취약점",
-            "source": "https://www.coindesk.com/markets/2021/08/10/cross-chain-defi-site-poly-network-hacked-hundreds-of-millions-potentially-lost?utm_source=chatgpt.com"
-        },
-        {
-            "date": "2022-03-23",
-            "platform": "🔵 이더리움 (Ethereum)",
-            "incident": "Ronin Network 해킹",
-            "description": "Axie Infinity 게임 브리지 해킹, $625M 탈취",
-            "loss": "$625M",
-            "cause": "브리지 취약점",
-            "source": "https://www.coindesk.com/tech/2022/03/29/axie-infinitys-ronin-network-suffers-625m-exploit?utm_source=chatgpt.com"
-        },
-        {
-            "date": "2022-11-11",
-            "platform": "🟣 거래소 (Exchange)",
-            "incident": "FTX 붕괴",
-            "description": "FTX 거래소 파산, 고객 자산 $8B 손실",
-            "loss": "$8B",
-            "cause": "거래소 운영 부실",
-            "source": "https://apnews.com/article/ftx-sam-bankmanfried-crypto-gary-wang-09f59a3575d8a8b9fb0b444679f9c109"
-        },
-        {
-            "date": "2023-03-13",
-            "platform": "🔵 이더리움 (Ethereum)",
-            "incident": "Euler Finance 해킹",
-            "description": "플래시론 공격으로 $197M 탈취",
-            "loss": "$197M",
-            "cause": "플래시론 공격",
-            "source": "https://www.chainalysis.com/blog/euler-finance-flash-loan-attack/?utm_source=chatgpt.com"
-        },
-        {
-            "date": "2022-08-01",
-            "platform": "🔵 이더리움 (Ethereum)",
-            "incident": "Nomad Bridge 해킹",
-            "description": "브리지 취약점으로 $45M 탈취",
-            "loss": "$45M",
-            "cause": "브리지 취약점",
-            "source": "https://thedefiant.io/nomad-bridge-exploit"
-        },
-        {
-            "date": "2023-06-03",
-            "platform": "🔵 이더리움 (Ethereum)",
-            "incident": "Atomic Wallet 해킹",
-            "description": "지갑 보안 취약점으로 $100M 탈취",
-            "loss": "$100M",
-            "cause": "지갑 보안 취약점",
-            "source": "https://www.elliptic.co/blog/analysis/north-korea-linked-atomic-wallet-heist-tops-100-million?utm_source=chatgpt.com"
-        },
-        {
-            "date": "2022-06-24",
-            "platform": "🔵 이더리움 (Ethereum)",
-            "incident": "Harmony Bridge 해킹",
-            "description": "브리지 취약점으로 $100M 탈취",
-            "loss": "$100M",
-            "cause": "브리지 취약점",
-            "source": "https://www.elliptic.co/hubfs/Harmony%20Horizon%20Bridge%20Hack%20P1%20briefing%20note%20final.pdf?utm_source=chatgpt.com"
-        },
-        {
-            "date": "2023-09-20",
-            "platform": "🔵 이더리움 (Ethereum)",
-            "incident": "Mixin Network 해킹",
-            "description": "클라우드 서비스 공격으로 $200M 탈취",
-            "loss": "$200M",
-            "cause": "클라우드 서비스 취약점",
-            "source": "https://www.elliptic.co/blog/mixin-network-hacked-for-200-million?utm_source=chatgpt.com"
-        },
-        {
-            "date": "2025-03-15",
-            "platform": "🟣 거래소 (Exchange)",
-            "incident": "Bybit 해킹",
-            "description": "중앙화 거래소 해킹, $1.5B 탈취",
-            "loss": "$1.5B",
-            "cause": "거래소 보안 취약점",
-            "source": "https://www.chainalysis.com/blog/2025-crypto-crime-mid-year-update/"
-        }
-    ]
+@st.cache_resource(max_entries=1)
+def get_incident_table():
+    """사건사고 데이터 파일을 프로세스당 한 번만 로드합니다."""
+    incidents_module = startup_profiler.import_module("utils.incidents")
+    with startup_profiler.stage("사건사고 데이터 로드"):
+        return incidents_module.load_incidents()
+
+@st.cache_resource(max_entries=1)
+def get_incident_search_index():
+    """사건명/설명/원인/플랫폼 트라이그램 색인을 프로세스당 한 번만 생성합니다."""
+    with startup_profiler.stage("사건사고 검색 색인 생성"):
+        return get_incident_table().build_search_index()
+
+def filter_incidents(platform_filter, search_term):
+    """플랫폼과 검색어 조건에 맞는 사건사고 테이블을 반환합니다 (검색 시 관련도순)."""
+    matched = get_incident_table().search(get_incident_search_index(), search_term)
+    return matched.take(matched.platform_mask(platform_filter))
+
+@tracked_cache_data("incident_aggregates", ttl=FIGURE_CACHE_TTL, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def get_incident_aggregates(platform_filter, search_term):
+    """필터 조건별 연도/플랫폼/원인 집계를 계산합니다."""
+    filtered = filter_incidents(platform_filter, search_term)
+    return {
+        'per_year': filtered.per_year(),
+        'per_platform_loss': filtered.per_platform_loss(),
+        'per_cause_count': filtered.per_cause_count()
+    }
 
 st.set_page_config(
     page_title="ETH Anomaly Lens",
@@ -167,29 +364,42 @@ st.title("🚨 ETH Anomaly Lens: Attack Flow Diagram")
 st.markdown("이더리움 스마트 컨트랙트의 위험 함수 호출 구조를 시각화합니다.")
 
 st.sidebar.header("설정")
-st.sidebar.markdown("""
-### 위험 함수 목록
-- `selfdestruct`: 컨트랙트 자체 파괴
-- `delegatecall`: 위임 호출 (위험한 컨텍스트 변경)
-- `tx.origin`: 트랜잭션 원본 주소 (피싱 공격 위험)
-- `suicide`: selfdestruct의 이전 이름
-- `callcode`: delegatecall의 이전 이름
-- `assembly`: 인라인 어셈블리
-- `low-level-call`: 저수준 호출
-""")
+# 위험 패턴 규칙 (data/danger_rules.json, 파일이 바뀌면 자동으로 다시 로드)
+ruleset = get_ruleset()
+st.sidebar.markdown("### 위험 함수 목록\n" + "\n".join(
+    f"- `{rule['category']}` ({rule['severity']}): {rule.get('description', '')}" for rule in ruleset.rules
+))
+st.sidebar.caption(f"규칙 버전: {ruleset.version}")
+# Slither 정밀 분석 (빠른 분석 결과를 먼저 보여주고, 결과는 별도 프로세스에서 비동기로 도착)
+deep_analysis_enabled = st.sidebar.checkbox(
+    "🔬 Slither 정밀 분석", value=DEEP_ANALYSIS_ENABLED,
+    help="분석 후 Slither를 격리된 프로세스에서 실행합니다 (slither-analyzer와 solc 필요)"
+)
+# 디버그 모드: 이번 분석/보고서 생성을 cProfile과 tracemalloc으로 측정해 saved_reports에 저장
+profiling_enabled = st.sidebar.checkbox(
+    "🐢 프로파일링 (디버그)", value=False,
+    help="캐시를 건너뛰고 분석과 PDF 생성의 함수별 소요 시간과 메모리 할당 위치를 기록합니다"
+)
 
 # 세션 상태 초기화
 if 'analysis_complete' not in st.session_state:
     st.session_state.analysis_complete = False
 if 'pdf_generated' not in st.session_state:
     st.session_state.pdf_generated = False
-if 'pdf_bytes' not in st.session_state:
-    st.session_state.pdf_bytes = None
 if 'pdf_filename' not in st.session_state:
     st.session_state.pdf_filename = None
+if 'profiles' not in st.session_state:
+    st.session_state.profiles = []
+
+def record_profile(address, capture):
+    """프로파일을 저장하고 화면에 표시할 요약을 세션에 남깁니다."""
+    if capture.enabled:
+        files = file_manager.save_profile(address, capture)
+        st.session_state.profiles = [p for p in st.session_state.profiles if p['stage'] != capture.stage]
+        st.session_state.profiles.append({'summary': capture.summary(), 'stage': capture.stage, 'files': files})
 
 # 탭 생성
-tab1, tab2 = st.tabs(["🔍 컨트랙트 분석", "📊 보안 사건사고"])
+tab1, tab2, tab3, tab4 = st.tabs(["🔍 컨트랙트 분석", "📊 보안 사건사고", "🗂️ 발견 사항 검색", "🆚 분석 비교"])
 
 with tab1:
     col1, col2 = st.columns([2, 1])
@@ -224,20 +434,50 @@ with tab1:
             if contract_address:
                 with st.spinner("컨트랙트를 분석하고 있습니다..."):
                     try:
-                        graph, dangerous_functions = analyze_contract(contract_address)
+                        profile_capture = ProfileCapture("analysis", enabled=profiling_enabled)
+                        if profiling_enabled:
+                            # 캐시된 결과가 아니라 실제 분석을 측정
+                            run_analysis.clear(contract_address, ruleset.version)
+                        try:
+                            with profile_capture:
+                                graph, dangerous_functions = run_analysis(contract_address, ruleset.version)
+                        finally:
+                            # 분석이 실패해도 느린 원인을 볼 수 있도록 프로파일은 저장
+                            record_profile(contract_address, profile_capture)
                         if graph.nodes():
                             st.success("분석이 완료되었습니다!")
+                            if graph.graph.get('budget_exceeded'):
+                                st.warning(f"⚠️ 일부만 분석된 결과입니다. {budget_message(graph.graph['budget_exceeded'])}")
+                            proxy_info = graph.graph.get('proxy')
+                            if proxy_info:
+                                if proxy_info.get('error'):
+                                    st.warning(f"⚠️ 프록시 컨트랙트입니다 (구현: {proxy_info['implementation']}). "
+                                               f"구현 컨트랙트는 분석하지 못했습니다: {proxy_info['error']}")
+                                else:
+                                    st.info(f"🔀 프록시 컨트랙트입니다. 구현 컨트랙트 "
+                                            f"{proxy_info.get('contract_name') or ''} ({proxy_info['implementation']})를 "
+                                            f"함께 분석했습니다. (감지: {proxy_info['detected_by']}, "
+                                            f"delegatecall 엣지 {proxy_info.get('delegatecall_edges', 0)}개)")
                             
-                            # 분석 결과를 세션에 저장
+                            # 분석 결과는 프로세스 캐시에 두고 세션에는 주소만 저장
                             st.session_state.analysis_complete = True
                             st.session_state.contract_address = contract_address
-                            st.session_state.graph = graph
-                            st.session_state.dangerous_functions = dangerous_functions
+                            if deep_analysis_enabled:
+                                st.session_state.deep_analysis_job = {
+                                    'address': contract_address,
+                                    'key': get_deep_analysis_engine().submit(get_source_code(contract_address))
+                                }
                             
                             with col2:
                                 st.header("📊 분석 결과")
                                 st.metric("발견된 위험 함수", len(dangerous_functions))
                                 st.metric("전체 함수", len(graph.nodes()))
+                                analyzer = startup_profiler.import_module("utils.analyzer")
+                                risk_scoring = startup_profiler.import_module("utils.risk_scoring")
+                                assessment = risk_scoring.RiskModel(ruleset).assess(
+                                    analyzer.build_analysis_result(contract_address, graph, dangerous_functions))
+                                st.metric("위험 등급", assessment['risk_level'], f"점수 {assessment['score']}",
+                                          delta_color="off")
                                 if dangerous_functions:
                                     st.warning("🚨 발견된 위험 함수:")
                                     for func in dangerous_functions:
@@ -247,66 +487,76 @@ with tab1:
                             
                             st.header("🔄 함수 호출 구조")
                             
-                            # 그래프 생성 전에 matplotlib 백엔드 설정
-                            plt.switch_backend('Agg')
-                            fig, ax = plt.subplots(figsize=(12, 8))  # 보기 편한 크기로 조절
+                            # 그래프 표시 (렌더링된 이미지는 캐시에서 재사용)
+                            graph_png, render_timings = render_call_graph(contract_address, ruleset.version)
+                            st.image(graph_png, use_container_width=True)
                             
-                            # 더 나은 레이아웃 알고리즘 사용
-                            pos = nx.spring_layout(graph, k=3, iterations=100) if len(graph.nodes()) > 1 else nx.spring_layout(graph)
+                            with st.expander("⏱️ 단계별 소요 시간"):
+                                st.caption("캐시된 결과는 처음 분석/렌더링했을 때의 시간입니다.")
+                                render_trace([graph.graph.get('trace'), render_timings])
                             
-                            # 노드 색상 및 크기 설정
-                            node_colors = ['red' if node in dangerous_functions else 'lightblue' for node in graph.nodes()]
-                            node_sizes = [4000 if node in dangerous_functions else 3000 for node in graph.nodes()]  # 노드 크기 증가
+                            diff = graph.graph.get('diff')
+                            if diff:
+                                with st.expander(f"🔀 이전 분석({graph.graph.get('previous_analysis_date')}) 대비 변경 사항", expanded=True):
+                                    st.caption(f"다시 분석한 함수: {diff['reanalyzed_functions']}개 / 전체 {len(graph.nodes())}개")
+                                    diff_col1, diff_col2 = st.columns(2)
+                                    with diff_col1:
+                                        st.markdown("**➕ 추가**")
+                                        for func in diff['added_functions']:
+                                            st.write(f"• 함수 `{func}`")
+                                        for caller, callee in diff['added_edges']:
+                                            st.write(f"• 호출 `{caller}` → `{callee}`")
+                                        for func, category in diff['added_findings']:
+                                            st.write(f"• 🔴 `{func}`: {category}")
+                                    with diff_col2:
+                                        st.markdown("**➖ 삭제**")
+                                        for func in diff['removed_functions']:
+                                            st.write(f"• 함수 `{func}`")
+                                        for caller, callee in diff['removed_edges']:
+                                            st.write(f"• 호출 `{caller}` → `{callee}`")
+                                        for func, category in diff['removed_findings']:
+                                            st.write(f"• 🟢 `{func}`: {category}")
+                                    if diff['changed_functions']:
+                                        st.write("✏️ 변경된 함수: " + ", ".join(f"`{f}`" for f in diff['changed_functions']))
                             
-                            # 엣지 색상 설정 (위험 함수로 가는 엣지는 빨간색)
-                            edge_colors = []
-                            for u, v in graph.edges():
-                                if v in dangerous_functions:
-                                    edge_colors.append('red')
-                                else:
-                                    edge_colors.append('gray')
+                            clones = find_exploit_clones(contract_address)
+                            if clones:
+                                with st.expander(f"🧬 알려진 취약 코드와 유사한 함수 ({len(clones)}개)", expanded=True):
+                                    for func, matches in clones.items():
+                                        for match in matches:
+                                            st.markdown(
+                                                f"⚠️ **{func}** ≈ `{match['id']}` ({match['incident']}, "
+                                                f"유사도 {match['similarity']:.0%}): {match['description']}"
+                                            )
                             
-                            # 그래프 그리기
-                            nx.draw(
-                                graph, pos,
-                                node_color=node_colors,
-                                node_size=node_sizes,
-                                font_size=10,  # 폰트 크기 증가
-                                font_weight='bold',
-                                arrows=True,
-                                edge_color=edge_colors,
-                                width=2.5,  # 엣지 두께 증가
-                                with_labels=True,
-                                ax=ax,
-                                arrowstyle='->',
-                                arrowsize=25  # 화살표 크기 증가
-                            )
-                            
-                            # 범례 위치 조정
-                            legend_elements = [
-                                mpatches.Patch(color='red', label='Dangerous Functions'),
-                                mpatches.Patch(color='lightblue', label='Normal Functions')
+                            selector_rows = [
+                                {"함수": node, "시그니처": signature, "선택자": selector}
+                                for node, data in graph.nodes(data=True)
+                                for signature, selector in zip(data.get('signatures', []), data.get('selectors', []))
                             ]
-                            ax.legend(handles=legend_elements, loc='upper right', fontsize=14, bbox_to_anchor=(1.15, 1))
-                            ax.set_title("Function Call Structure", fontsize=18, fontweight='bold', pad=30)
-                            
-                            # 그래프 여백 조정
-                            plt.tight_layout()
-                            plt.subplots_adjust(right=0.85)  # 범례를 위한 여백
+                            if selector_rows:
+                                with st.expander(f"🔑 외부 호출 가능 함수 선택자 ({len(selector_rows)}개)"):
+                                    st.dataframe(selector_rows, use_container_width=True, hide_index=True)
                             
-                            # 그래프 표시
-                            st.pyplot(fig, clear_figure=True)
-                            plt.close(fig)  # 메모리 정리
+                            dependencies = graph.graph.get('dependencies', [])
+                            if dependencies:
+                                with st.expander(f"🕸️ 컨트랙트 간 의존 관계 ({len(dependencies)}개)"):
+                                    st.dataframe([
+                                        {"컨트랙트": d['source'], "종류": d['kind'], "대상": d['target'],
+                                         "호출 함수": d['function'] or "", "대상 함수": d['target_function'] or ""}
+                                        for d in dependencies
+                                    ], use_container_width=True, hide_index=True)
                             
                             st.header("📋 함수 호출 관계")
                             if graph.edges():
                                 # 함수 호출 관계를 더 깔끔하게 표시
                                 st.markdown("**함수 호출 관계:**")
-                                for caller, callee in graph.edges():
+                                for caller, callee, kind in graph.edges(data='kind', default='internal'):
+                                    kind_label = "" if kind == 'internal' else f" `{kind}`"
                                     if callee in dangerous_functions:
-                                        st.markdown(f"🔴 **{caller}** → **{callee}** (위험)")
+                                        st.markdown(f"🔴 **{caller}** → **{callee}**{kind_label} (위험)")
                                     else:
-                                        st.markdown(f"🔵 **{caller}** → **{callee}**")
+                                        st.markdown(f"🔵 **{caller}** → **{callee}**{kind_label}")
                             else:
                                 st.info("함수 간 호출 관계가 없습니다.")
                             
@@ -317,6 +567,64 @@ with tab1:
             else:
                 st.warning("컨트랙트 주소를 입력해주세요.")
 
+    # 정밀 분석 섹션 (정밀 분석을 요청한 경우에만 표시)
+    deep_job = st.session_state.get('deep_analysis_job')
+    if st.session_state.analysis_complete and deep_analysis_enabled and deep_job:
+        st.header("🔬 정밀 분석 (Slither)")
+        deep_status = get_deep_analysis_engine().status(deep_job['key'])
+        deep_result = get_deep_result(deep_job['address'])
+        st.caption(f"대상: {deep_job['address']} · 작업 키 {deep_job['key'][:12]}")
+        if deep_status in ("queued", "running"):
+            st.info("⏳ 정밀 분석이 진행 중입니다. 빠른 분석 결과는 위에서 먼저 확인할 수 있습니다.")
+            if st.button("🔄 정밀 분석 상태 확인", key="refresh_deep"):
+                st.rerun()
+        elif deep_result and deep_status == 'completed':
+            st.success(f"✅ 정밀 분석 완료 ({deep_result.get('elapsed_seconds', 0)}초, "
+                       f"발견 사항 {len(deep_result['findings'])}개). 저장/보고서에 함께 반영됩니다.")
+            if deep_result['findings']:
+                st.dataframe([
+                    {"함수": f['function'] or "(컨트랙트 수준)", "탐지기": f['category'],
+                     "심각도": f['severity'], "신뢰도": f['confidence'], "설명": f['description']}
+                    for f in deep_result['findings']
+                ], use_container_width=True, hide_index=True)
+        elif deep_result:
+            st.warning(f"정밀 분석을 완료하지 못했습니다 ({deep_status}): {deep_result.get('error', '')}")
+
+    # 분석 결과 저장 섹션 (분석이 완료된 경우에만 표시)
+    if st.session_state.analysis_complete:
+        st.header("💾 분석 결과 저장")
+        
+        export_format = st.selectbox(
+            "저장 형식", ["json", "msgpack", "sarif"],
+            format_func=lambda f: {"json": "JSON (검색 색인 포함)", "msgpack": "MessagePack (압축 바이너리)",
+                                   "sarif": "SARIF 2.1.0 (코드 스캐닝 도구용)"}[f],
+            key="export_format"
+        )
+        if st.button("💾 분석 결과 저장", key="save_json"):
+            try:
+                from utils.analyzer import build_analysis_result
+                graph, dangerous_functions = get_report_graph(st.session_state.contract_address)
+                analysis_result = build_analysis_result(
+                    contract_address=st.session_state.contract_address,
+                    graph=graph,
+                    dangerous_functions=dangerous_functions
+                )
+                if export_format == "json":
+                    saved_filename = file_manager.save_json_report(st.session_state.contract_address, analysis_result)
+                else:
+                    saved_filename = file_manager.save_export(st.session_state.contract_address, analysis_result, export_format)
+                st.success(f"✅ 분석 결과가 저장되었습니다: {saved_filename}")
+                st.download_button(
+                    label="📥 저장한 파일 다운로드",
+                    data=file_manager.get_file_content(saved_filename),
+                    file_name=saved_filename,
+                    mime="application/json" if export_format == "json" else
+                         "application/sarif+json" if export_format == "sarif" else "application/x-msgpack",
+                    key="download_export"
+                )
+            except Exception as e:
+                st.error(f"분석 결과 저장 중 오류가 발생했습니다: {str(e)}")
+
     # PDF 보고서 생성 섹션 (분석이 완료된 경우에만 표시)
     if st.session_state.analysis_complete:
         st.header("📋 PDF 보고서 생성")
@@ -327,23 +635,26 @@ with tab1:
                 with st.spinner("PDF 보고서를 생성하고 있습니다..."):
                     # 이전 분석 결과 사용
                     contract_address = st.session_state.contract_address
-                    graph = st.session_state.graph
-                    dangerous_functions = st.session_state.dangerous_functions
+                    graph, dangerous_functions = get_report_graph(contract_address)
                     
-                    # PDF 보고서 생성
+                    # PDF 보고서 생성 (fpdf는 처음 생성할 때 임포트)
+                    from utils.report_generator import SecurityReportGenerator
                     report_generator = SecurityReportGenerator()
-                    pdf_bytes = report_generator.generate_report(
-                        contract_address=contract_address,
-                        graph=graph,
-                        dangerous_functions=dangerous_functions
-                    )
+                    profile_capture = ProfileCapture("report", enabled=profiling_enabled)
+                    with profile_capture:
+                        pdf_bytes = report_generator.generate_report(
+                            contract_address=contract_address,
+                            graph=graph,
+                            dangerous_functions=dangerous_functions
+                        )
+                    record_profile(contract_address, profile_capture)
                     
                     # 파일 저장
                     pdf_filename = file_manager.save_pdf_report(contract_address, pdf_bytes)
                     
-                    # 세션 상태 업데이트
+                    # 세션 상태 업데이트 (PDF 내용은 세션 대신 저장된 파일에서 읽음)
                     st.session_state.pdf_generated = True
-                    st.session_state.pdf_bytes = pdf_bytes
+                    st.session_state.pdf_trace = report_generator.last_trace
                     st.session_state.pdf_filename = pdf_filename
                     
                     st.success(f"✅ PDF 보고서가 생성되었습니다!")
@@ -364,13 +675,13 @@ with tab1:
                 st.write(f"오류 상세: {e}")
         
         # PDF 다운로드 버튼 (생성된 경우에만 표시)
-        if st.session_state.pdf_generated and st.session_state.pdf_bytes:
+        if st.session_state.pdf_generated and st.session_state.pdf_filename:
             st.success("📋 PDF 보고서가 준비되었습니다!")
             
             # 다운로드 버튼
             st.download_button(
                 label="📥 PDF 보고서 다운로드",
-                data=st.session_state.pdf_bytes,
+                data=file_manager.get_file_content(st.session_state.pdf_filename),
                 file_name=st.session_state.pdf_filename,
                 mime="application/pdf",
                 key="download_pdf"
@@ -378,19 +689,43 @@ with tab1:
             
             # 저장된 파일 정보
             st.info(f"💾 파일명: {st.session_state.pdf_filename}")
+            if st.session_state.get('pdf_trace'):
+                with st.expander("⏱️ 보고서 생성 단계별 소요 시간"):
+                    render_trace([st.session_state.pdf_trace])
             
             # 새로고침 버튼
             if st.button("🔄 새로고침", key="refresh"):
                 st.session_state.pdf_generated = False
-                st.session_state.pdf_bytes = None
                 st.session_state.pdf_filename = None
                 st.rerun()
 
+    # 프로파일 결과 섹션 (디버그 모드로 측정한 경우에만 표시)
+    if st.session_state.profiles:
+        st.header("🐢 프로파일 결과")
+        for profile in st.session_state.profiles:
+            summary = profile['summary']
+            with st.expander(f"{summary['stage']}: {summary['elapsed_seconds']}초, "
+                             f"최대 추적 메모리 {summary['peak_memory_bytes'] / 1024 / 1024:.1f}MB"):
+                if summary['hot_functions']:
+                    st.markdown("**누적 시간 상위 함수**")
+                    st.dataframe(summary['hot_functions'], use_container_width=True, hide_index=True)
+                if summary['allocations']:
+                    st.markdown("**메모리 할당 상위 위치**")
+                    st.dataframe(summary['allocations'], use_container_width=True, hide_index=True)
+                for filename in profile['files']:
+                    st.download_button(
+                        label=f"📥 {filename}",
+                        data=file_manager.get_file_content(filename),
+                        file_name=filename,
+                        mime="text/plain" if filename.endswith('.txt') else "application/octet-stream",
+                        key=f"download_{filename}"
+                    )
+
 with tab2:
     st.header("📊 주요 암호화폐 보안 사건사고 분석 보고서")
     st.markdown("비트코인과 이더리움의 주요 보안 사건사고를 종합적으로 분석한 보고서입니다.")
     
-    incidents = get_historical_incidents()
+    incidents = get_incident_table()
     
     # 대시보드 스타일 개선
     st.markdown("---")
@@ -404,14 +739,14 @@ with tab2:
             delta=f"{len(incidents)} major incidents"
         )
     with col2:
-        ethereum_incidents = len([inc for inc in incidents if inc["platform"] == "🔵 이더리움 (Ethereum)"])
+        ethereum_incidents = incidents.count_platform("🔵 이더리움 (Ethereum)")
         st.metric(
             label="Ethereum Incidents",
             value=ethereum_incidents,
             delta="Smart contract/bridge-centered"
         )
     with col3:
-        exchange_incidents = len([inc for inc in incidents if inc["platform"] == "🟣 거래소 (Exchange)"])
+        exchange_incidents = incidents.count_platform("🟣 거래소 (Exchange)")
         st.metric(
             label="Exchange Incidents",
             value=exchange_incidents,
@@ -431,16 +766,12 @@ with tab2:
     with col2:
         search_term = st.text_input(
             "Search Incident",
-            placeholder="Poly, Ronin, FTX, Bybit etc.",
-            help="Search incident names"
+            placeholder="Poly, Ronin, FTX, Bybit, bridge etc.",
+            help="Fuzzy search over incident names, descriptions, causes and platforms"
         )
     
-    filtered_incidents = incidents
-    if platform_filter != "All":
-        filtered_incidents = [inc for inc in incidents if inc["platform"] == platform_filter]
-    
-    if search_term:
-        filtered_incidents = [inc for inc in filtered_incidents if search_term.lower() in inc["incident"].lower()]
+    filtered_incidents = filter_incidents(platform_filter, search_term)
+    aggregates = get_incident_aggregates(platform_filter, search_term)
     
     # 시각화 섹션
     st.subheader("📈 Visual Analysis")
@@ -450,161 +781,30 @@ with tab2:
     
     # 연도별 분석
     with viz_tab1:
-        years = {}
-        for incident in filtered_incidents:
-            year = incident['date'][:4]
-            years[year] = years.get(year, 0) + 1
-        if years:
-            fig, ax = plt.subplots(figsize=(12, 6))
-            years_list = sorted(years.keys())
-            counts = [years[year] for year in years_list]
-            colors = plt.cm.viridis(np.linspace(0, 1, len(years_list)))
-            bars = ax.bar(years_list, counts, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
-            ax.set_xlabel('Year', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Number of Incidents', fontsize=14, fontweight='bold')
-            ax.set_title('Incidents per Year', fontsize=16, fontweight='bold', pad=20)
-            ax.grid(True, alpha=0.3, axis='y')
-            for bar, count in zip(bars, counts):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.05,
-                       f'{count}', ha='center', va='bottom', fontweight='bold', fontsize=13)
-            plt.tight_layout()
-            st.pyplot(fig, clear_figure=True)
-            plt.close(fig)
+        year_counts = tuple((year, count) for year, count, _ in aggregates['per_year'])
+        if year_counts:
+            st.image(render_yearly_chart(year_counts), use_container_width=True)
+            busiest_year, busiest_count = max(year_counts, key=lambda item: item[1])
             col1, col2 = st.columns(2)
             with col1:
-                st.info(f"**Year with Most Incidents**: {max(years, key=years.get)} ({max(years.values())})")
+                st.info(f"**Year with Most Incidents**: {busiest_year} ({busiest_count})")
             with col2:
-                st.info(f"**Period**: {min(years.keys())} ~ {max(years.keys())}")
+                st.info(f"**Period**: {year_counts[0][0]} ~ {year_counts[-1][0]}")
 
     # 손실액 분석
     with viz_tab2:
-        # 플랫폼 영어 변환 맵
-        platform_map = {
-            "🔵 이더리움 (Ethereum)": "Ethereum",
-            "🟣 거래소 (Exchange)": "Exchange"
-        }
-        platform_losses = {}
-        for incident in filtered_incidents:
-            platform = incident["platform"]
-            platform_en = platform_map.get(platform, platform)
-            loss_str = incident["loss"]
-            loss_str = loss_str.replace("$", "")
-            if "B" in loss_str:
-                loss = float(loss_str.replace("B", "")) * 1000000000
-            elif "M" in loss_str:
-                loss = float(loss_str.replace("M", "")) * 1000000
-            elif "K" in loss_str:
-                loss = float(loss_str.replace("K", "")) * 1000
-            else:
-                loss = float(loss_str)
-            platform_losses[platform_en] = platform_losses.get(platform_en, 0) + loss
-        if platform_losses:
-            fig, ax = plt.subplots(figsize=(10, 6))
-            platforms = list(platform_losses.keys())
-            losses = list(platform_losses.values())
-            colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99']
-            wedges, texts, autotexts = ax.pie(losses, labels=platforms, autopct='%1.1f%%', 
-                                             colors=colors[:len(platforms)], startangle=90, textprops={'fontsize': 13})
-            ax.set_title('Loss Distribution by Platform', fontsize=16, fontweight='bold', pad=20)
-            ax.legend(wedges, [f'{p}: ${l/1000000:.1f}M' for p, l in zip(platforms, losses)],
-                     title="Loss by Platform", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1), fontsize=13)
-            plt.tight_layout()
-            st.pyplot(fig, clear_figure=True)
-            plt.close(fig)
+        if aggregates['per_platform_loss']:
+            st.image(render_loss_chart(aggregates['per_platform_loss']), use_container_width=True)
 
     # 공격 유형 분석
     with viz_tab3:
-        import re
-        import unicodedata
-        # cause 영어 변환 맵 (실제 incidents 데이터 기반 상세)
-        cause_map = {
-            "브리지 취약점": "Bridge Vulnerability",
-            "거래소 운영 부실": "Exchange Mismanagement",
-            "플래시론 공격": "Flash Loan Attack",
-            "지갑 보안 취약점": "Wallet Security Vulnerability",
-            "클라우드 서비스 취약점": "Cloud Service Vulnerability",
-            "거래소 보안 취약점": "Exchange Security Vulnerability",
-        }
-        def romanize_korean(text):
-            try:
-                from unidecode import unidecode
-                return unidecode(text)
-            except ImportError:
-                return text
-        attack_types = {}
-        for incident in filtered_incidents:
-            cause = incident["cause"]
-            cause_no_emoji = ''.join(c for c in cause if c.isalnum() or c.isspace())
-            cause_en = cause_map.get(cause_no_emoji.strip(), None)
-            if not cause_en:
-                if re.search(r'[가-힣]', cause_no_emoji):
-                    cause_en = romanize_korean(cause_no_emoji.strip())
-                else:
-                    cause_en = cause_no_emoji.strip()
-            # 알파벳/숫자/공백만 남기고 모두 제거
-            cause_en_clean = re.sub(r'[^a-zA-Z0-9 ]', '', cause_en)
-            cause_en_clean = cause_en_clean.strip()
-            if not cause_en_clean:
-                continue  # 완전히 빈 값은 그래프에서 제외
-            attack_types[cause_en_clean] = attack_types.get(cause_en_clean, 0) + 1
-        if attack_types:
-            fig, ax = plt.subplots(figsize=(12, 6))
-            causes = list(attack_types.keys())
-            counts = list(attack_types.values())
-            y_pos = np.arange(len(causes))
-            bars = ax.barh(y_pos, counts, color='lightcoral', alpha=0.8, edgecolor='darkred')
-            ax.set_yticks(y_pos)
-            ax.set_yticklabels(causes, fontsize=13)
-            ax.set_xlabel('Number of Incidents', fontsize=14, fontweight='bold')
-            ax.set_title('Incident Count by Attack Type', fontsize=16, fontweight='bold', pad=20)
-            ax.grid(True, alpha=0.3, axis='x')
-            for bar, count in zip(bars, counts):
-                width = bar.get_width()
-                ax.text(width + 0.1, bar.get_y() + bar.get_height()/2,
-                       f'{count}', ha='left', va='center', fontweight='bold', fontsize=13)
-            plt.tight_layout()
-            st.pyplot(fig, clear_figure=True)
-            plt.close(fig)
+        if aggregates['per_cause_count']:
+            st.image(render_attack_type_chart(aggregates['per_cause_count']), use_container_width=True)
 
     # 타임라인(꺾은선)
     with viz_tab4:
-        if filtered_incidents:
-            year_count = {}
-            year_loss = {}
-            for inc in filtered_incidents:
-                year = inc['date'][:4]
-                year_count[year] = year_count.get(year, 0) + 1
-                loss_str = inc['loss'].replace('$', '')
-                if 'B' in loss_str:
-                    loss = float(loss_str.replace('B', '')) * 1_000_000_000
-                elif 'M' in loss_str:
-                    loss = float(loss_str.replace('M', '')) * 1_000_000
-                elif 'K' in loss_str:
-                    loss = float(loss_str.replace('K', '')) * 1_000
-                else:
-                    loss = float(loss_str)
-                year_loss[year] = year_loss.get(year, 0) + loss
-            years = sorted(year_count.keys())
-            counts = [year_count[y] for y in years]
-            losses = [year_loss[y] for y in years]
-            fig, ax1 = plt.subplots(figsize=(12, 6))
-            ax1.plot(years, counts, marker='o', color='#4e79a7', label='Incidents', linewidth=2)
-            ax1.set_xlabel('Year', fontsize=14)
-            ax1.set_ylabel('Number of Incidents', fontsize=14, color='#4e79a7')
-            ax1.tick_params(axis='y', labelcolor='#4e79a7', labelsize=13)
-            ax1.set_title('Incident Trend by Year', fontsize=16, fontweight='bold', pad=10)
-            ax1.grid(True, axis='y', alpha=0.2, linestyle='--')
-            ax2 = ax1.twinx()
-            ax2.plot(years, [l/1_000_000 for l in losses], marker='s', color='#e15759', label='Loss (M USD)', linewidth=2, linestyle='dashed')
-            ax2.set_ylabel('Loss (Million USD)', fontsize=14, color='#e15759')
-            ax2.tick_params(axis='y', labelcolor='#e15759', labelsize=13)
-            lines1, labels1 = ax1.get_legend_handles_labels()
-            lines2, labels2 = ax2.get_legend_handles_labels()
-            ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper left', fontsize=13, framealpha=0.9)
-            plt.tight_layout()
-            st.pyplot(fig, clear_figure=True)
-            plt.close(fig)
+        if aggregates['per_year']:
+            st.image(render_timeline_chart(aggregates['per_year']), use_container_width=True)
         else:
             st.info('No incidents found for the selected condition.')
     
@@ -618,22 +818,17 @@ with tab2:
     with col1:
         sort_by = st.selectbox(
             "Sort by",
-            ["Date", "Loss", "Platform"],
+            (["Relevance"] if search_term else []) + ["Date", "Loss", "Platform"],
             help="Select a sorting criterion for incidents"
         )
     with col2:
         show_details = st.checkbox("Show Details", value=True)
 
-    # 정렬 로직
-    if sort_by == "Date":
-        sorted_incidents = sorted(filtered_incidents, key=lambda x: x['date'])
-    elif sort_by == "Loss":
-        def parse_loss(incident):
-            loss_str = incident["loss"].replace("$", "").replace("B", "000000000").replace("M", "000000").replace("K", "000")
-            return float(loss_str)
-        sorted_incidents = sorted(filtered_incidents, key=parse_loss, reverse=True)
-    else:  # 플랫폼별
-        sorted_incidents = sorted(filtered_incidents, key=lambda x: x['platform'])
+    # 정렬 로직 (손실액은 로드 시 숫자로 변환되어 있음)
+    if sort_by == "Relevance":
+        sorted_incidents = filtered_incidents.records()
+    else:
+        sorted_incidents = filtered_incidents.sorted_by(sort_by).records()
 
     # 카드형 UI로 사건사고 표시
     for i, incident in enumerate(sorted_incidents, 1):
@@ -708,4 +903,204 @@ with tab2:
         - Learning security best practices
         - Regular security checks
         - Consult with experts
-        """) 
\ No newline at end of file
+        """)
+
+with tab3:
+    st.header("🗂️ 저장된 분석 결과 검색")
+    st.markdown("저장된 모든 분석 결과의 위험 함수 발견 사항을 조건별로 검색합니다.")
+    
+    # 색인은 NumPy와 디스크의 세그먼트를 읽으므로 사용자가 검색을 열었을 때만 불러옴
+    show_findings = st.checkbox("발견 사항 색인 불러오기", key="findings_open")
+    col1, col2, col3 = st.columns(3)
+    if show_findings:
+        index_stats, index_categories = get_findings_overview(file_manager.findings_index_generation())
+        with col1:
+            st.metric("색인된 발견 사항", index_stats['total_findings'])
+        with col2:
+            st.metric("분석된 컨트랙트", index_stats['total_contracts'])
+    with col3:
+        if st.button("🔄 색인 재생성", key="rebuild_index"):
+            with st.spinner("저장된 분석 결과로 색인을 다시 생성하고 있습니다..."):
+                rebuilt = file_manager.rebuild_findings_index()
+                rebuilt_dependencies = file_manager.rebuild_dependency_index()
+            st.success(f"✅ {rebuilt}개의 발견 사항과 {rebuilt_dependencies}개의 의존 관계를 색인했습니다.")
+    
+    st.subheader("🔎 컨트랙트/함수 빠른 검색")
+    quick_query = st.text_input(
+        "주소 또는 함수명",
+        placeholder="0x1234..., withdraw, delegate ...",
+        help="분석된 컨트랙트 주소와 함수명을 오타를 허용하여 검색합니다",
+        key="contract_quick_search"
+    )
+    if quick_query:
+        quick_results = file_manager.contract_search_index.search(quick_query)
+        if quick_results:
+            st.dataframe(quick_results, use_container_width=True, hide_index=True)
+        else:
+            st.info("일치하는 컨트랙트나 함수가 없습니다.")
+    
+    st.subheader("🔑 함수 선택자 조회")
+    selector_query = st.text_input(
+        "4바이트 선택자 또는 calldata",
+        placeholder="0xa9059cbb...",
+        help="분석된 컨트랙트에서 수집한 선택자에서 함수 시그니처를 찾습니다",
+        key="selector_lookup"
+    )
+    if selector_query:
+        try:
+            decoded = file_manager.selector_index.decode_calldata(selector_query.strip())
+            if decoded['signatures']:
+                for signature in decoded['signatures']:
+                    st.write(f"• `{decoded['selector']}` → `{signature}`")
+            else:
+                st.info(f"`{decoded['selector']}`에 해당하는 시그니처가 없습니다.")
+        except Exception as e:
+            st.error(f"선택자를 해석할 수 없습니다: {str(e)}")
+    
+    st.subheader("🕸️ 컨트랙트 의존성 검색")
+    dep_col1, dep_col2 = st.columns([2, 1])
+    with dep_col1:
+        dependency_target = st.text_input(
+            "라이브러리/컨트랙트/인터페이스 이름",
+            placeholder="SafeMath, IERC20, Ownable ...",
+            help="저장된 분석 결과 중 이 대상을 상속, 사용, 호출하는 컨트랙트를 찾습니다",
+            key="dependency_target"
+        )
+    with dep_col2:
+        dependency_kinds = st.multiselect("의존 종류", DEPENDENCY_KINDS, key="dependency_kinds")
+    if dependency_target:
+        dependents = file_manager.dependency_index.dependents(dependency_target.strip(), kinds=dependency_kinds)
+        if dependents:
+            st.dataframe([
+                {"주소": d['address'], "컨트랙트": d['source'], "종류": d['kind'],
+                 "호출 함수": d['function'] or "", "대상 함수": d['target_function'] or ""}
+                for d in dependents
+            ], use_container_width=True, hide_index=True)
+        else:
+            st.info(f"`{dependency_target}`에 의존하는 분석된 컨트랙트가 없습니다.")
+    
+    st.subheader("🧮 발견 사항 조건 검색")
+    if not show_findings:
+        st.info("위의 '발견 사항 색인 불러오기'를 선택하면 조건 검색을 사용할 수 있습니다.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            search_contract = st.text_input("컨트랙트 주소", placeholder="0x...", key="findings_contract")
+            search_function = st.text_input("함수명", placeholder="destroy, withdraw ...", key="findings_function")
+        with col2:
+            search_categories = st.multiselect("위험 유형", index_categories, key="findings_categories")
+            search_entries = st.multiselect(
+                "도달 가능한 진입 지점",
+                list(REACHABILITY_FLAGS),
+                help="선택한 모든 진입 지점에서 도달 가능한 발견 사항만 표시합니다",
+                key="findings_entries"
+            )
+        search_since = st.date_input("분석 시작일", value=None, key="findings_since")
+    
+        findings = file_manager.findings_index.query(
+            contract=search_contract or None,
+            function=search_function or None,
+            categories=search_categories,
+            reachable_from=search_entries,
+            since=datetime.combine(search_since, datetime.min.time()) if search_since else None
+        )
+        if findings:
+            st.dataframe([
+                {**finding, 'reachable_from': ', '.join(finding['reachable_from'])}
+                for finding in findings
+            ], use_container_width=True)
+        else:
+            st.info("조건에 맞는 발견 사항이 없습니다.")
+
+with tab4:
+    st.header("🆚 분석 결과 비교")
+    st.markdown("저장된 두 분석 결과(두 버전 또는 두 포크)를 다시 조회하거나 분석하지 않고 비교합니다.")
+    
+    analysis_files = [f['filename'] for f in file_manager.get_analysis_files()]
+    if len(analysis_files) < 2:
+        st.info("비교하려면 저장된 분석 결과가 두 개 이상 필요합니다. 분석 후 '💾 분석 결과 저장'을 눌러 주세요.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            base_filename = st.selectbox("기준 (이전 버전)", analysis_files, index=1, key="compare_base")
+        with col2:
+            target_filename = st.selectbox("대상 (새 버전)", analysis_files, index=0, key="compare_target")
+        
+        if base_filename == target_filename:
+            st.warning("서로 다른 두 분석 결과를 선택해 주세요.")
+        else:
+            try:
+                base_result, target_result, comparison = compare_saved_analyses(base_filename, target_filename)
+            except Exception as e:
+                st.error(f"분석 결과를 비교할 수 없습니다: {str(e)}")
+            else:
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("새 위험 경로", len(comparison['added_danger_paths']))
+                with col2:
+                    st.metric("사라진 위험 경로", len(comparison['removed_danger_paths']))
+                with col3:
+                    st.metric("발견 사항 (추가/삭제)",
+                              f"+{len(comparison['added_findings'])} / -{len(comparison['removed_findings'])}")
+                with col4:
+                    st.metric("함수 (추가/삭제/변경)", f"+{len(comparison['added_functions'])} / "
+                              f"-{len(comparison['removed_functions'])} / ~{len(comparison['changed_functions'])}")
+                
+                def danger_path_rows(paths):
+                    return [{"진입 함수": p['entry'], "위험 함수": p['function'], "위험 유형": ", ".join(p['dangers']),
+                             "경로": " → ".join(p['path']) if p['path'] else "(생략)"} for p in paths]
+                
+                if comparison['added_danger_paths']:
+                    st.error(f"🚨 새로 생긴 위험 경로 {len(comparison['added_danger_paths'])}개")
+                    st.dataframe(danger_path_rows(comparison['added_danger_paths']), use_container_width=True, hide_index=True)
+                if comparison['removed_danger_paths']:
+                    st.success(f"✅ 사라진 위험 경로 {len(comparison['removed_danger_paths'])}개")
+                    st.dataframe(danger_path_rows(comparison['removed_danger_paths']), use_container_width=True, hide_index=True)
+                if not comparison['added_danger_paths'] and not comparison['removed_danger_paths']:
+                    st.info(f"위험 경로 변화가 없습니다. (유지된 위험 경로 {comparison['unchanged_danger_paths']}개)")
+                
+                with st.expander("🔀 함수/호출/발견 사항 변경 상세"):
+                    st.write("**추가된 발견 사항:**", [f"{n}: {c}" for n, c in comparison['added_findings']] or "없음")
+                    st.write("**삭제된 발견 사항:**", [f"{n}: {c}" for n, c in comparison['removed_findings']] or "없음")
+                    st.write("**추가된 함수:**", comparison['added_functions'] or "없음")
+                    st.write("**삭제된 함수:**", comparison['removed_functions'] or "없음")
+                    st.write("**본문이 바뀐 함수:**", comparison['changed_functions'] or "없음")
+                    st.write("**추가된 호출:**", [f"{a} → {b}" for a, b in comparison['added_edges']] or "없음")
+                    st.write("**삭제된 호출:**", [f"{a} → {b}" for a, b in comparison['removed_edges']] or "없음")
+                
+                if st.button("📋 비교 보고서 PDF 생성", key="save_comparison_pdf"):
+                    try:
+                        with st.spinner("비교 보고서를 생성하고 있습니다..."):
+                            from utils.report_generator import SecurityReportGenerator
+                            comparison_pdf = SecurityReportGenerator().generate_comparison_report(
+                                base_result, target_result, comparison=comparison)
+                            comparison_filename = file_manager.save_comparison_report(
+                                base_result.get('contract_address', 'unknown'),
+                                target_result.get('contract_address', 'unknown'), comparison_pdf)
+                        st.success(f"✅ 비교 보고서가 생성되었습니다: {comparison_filename}")
+                        st.download_button(
+                            label="📥 비교 보고서 다운로드",
+                            data=comparison_pdf,
+                            file_name=comparison_filename,
+                            mime="application/pdf",
+                            key="download_comparison_pdf"
+                        )
+                    except Exception as e:
+                        st.error(f"비교 보고서 생성 중 오류가 발생했습니다: {str(e)}")
+
+# 캐시 통계 (이번 실행의 호출까지 반영되도록 마지막에 표시)
+with st.sidebar.expander("⚙️ 캐시 통계"):
+    st.caption(f"분석 캐시: 최대 {ANALYSIS_CACHE_MAX_ENTRIES}개, {ANALYSIS_CACHE_TTL}초 / "
+               f"그림 캐시: 최대 {FIGURE_CACHE_MAX_ENTRIES}개, {FIGURE_CACHE_TTL}초")
+    stats = cache_stats.snapshot()
+    if stats:
+        st.dataframe(stats, use_container_width=True, hide_index=True)
+    else:
+        st.write("아직 캐시 사용 기록이 없습니다.")
+
+# 시작 시간 프로파일 (ETH_LENS_PROFILE_STARTUP=1 일 때만)
+if startup_profiler.enabled:
+    with st.sidebar.expander("⏱️ 시작 시간 프로파일", expanded=True):
+        records = startup_profiler.records()
+        st.metric("기록된 단계 합계", f"{sum(r['seconds'] for r in records):.3f}s")
+        st.dataframe(records, use_container_width=True, hide_index=True)
@@ -0,0 +1,75 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.7.0;
+
+interface IPriceOracle {
+    function getPrice(address token) external view returns (uint256);
+}
+
+contract VulnerableBank {
+    mapping(address => uint256) public balances;
+    mapping(address => uint256) public lastDeposit;
+    address public owner;
+    IPriceOracle public oracle;
+    uint256 public totalDeposits;
+
+    event Deposit(address indexed account, uint256 amount);
+    event Withdrawal(address indexed account, uint256 amount);
+
+    constructor(address oracleAddress) {
+        owner = msg.sender;
+        oracle = IPriceOracle(oracleAddress);
+    }
+
+    modifier onlyOwner() {
+        require(tx.origin == owner, "not owner");
+        _;
+    }
+
+    function deposit() public payable {
+        balances[msg.sender] += msg.value;
+        lastDeposit[msg.sender] = block.timestamp;
+        totalDeposits += msg.value;
+        emit Deposit(msg.sender, msg.value);
+    }
+
+    function withdraw(uint256 amount) public {
+        require(balances[msg.sender] >= amount, "insufficient balance");
+        (bool success, ) = msg.sender.call{value: amount}("");
+        require(success, "transfer failed");
+        balances[msg.sender] -= amount;
+        totalDeposits -= amount;
+        emit Withdrawal(msg.sender, amount);
+    }
+
+    function withdrawAll() external {
+        withdraw(balances[msg.sender]);
+    }
+
+    function collateralValue(address account, address token) public view returns (uint256) {
+        return balances[account] * oracle.getPrice(token) / 1e18;
+    }
+
+    function lottery() external payable {
+        require(msg.value == 0.1 ether, "fee");
+        if (uint256(keccak256(abi.encodePacked(block.timestamp, block.number))) % 10 == 0) {
+            msg.sender.transfer(address(this).balance);
+        }
+    }
+
+    function execute(address target, bytes memory data) public onlyOwner {
+        (bool success, ) = target.delegatecall(data);
+        require(success, "delegatecall failed");
+    }
+
+    function setOracle(address oracleAddress) external onlyOwner {
+        oracle = IPriceOracle(oracleAddress);
+    }
+
+    function close() external onlyOwner {
+        selfdestruct(payable(owner));
+    }
+
+    receive() external payable {
+        deposit();
+    }
+}
@@ -0,0 +1,34 @@
+import json
+import pytest
+from utils.analyzer import analyze_solidity_code, build_analysis_result
+from utils.exporters import EXPORT_FORMATS, export_analysis, load_analysis
+
+SOURCE = '''
+contract Vault {
+    address owner;
+    function withdraw(uint amount) external { (bool ok, ) = msg.sender.call{value: amount}(""); require(ok); pay(amount); }
+    function pay(uint amount) internal { }
+    function destroy() public { require(tx.origin == owner); selfdestruct(payable(owner)); }
+}
+'''
+
+def _analysis_result() -> dict:
+    """저장했다가 다시 읽은 것과 같은 분석 결과를 만듭니다."""
+    graph, dangerous_functions = analyze_solidity_code(SOURCE)
+    return json.loads(json.dumps(build_analysis_result("0x1", graph, dangerous_functions)))
+
+@pytest.mark.parametrize("export_format", list(EXPORT_FORMATS))
+def test_round_trip(tmp_path, export_format):
+    result = _analysis_result()
+    path = tmp_path / f"analysis{EXPORT_FORMATS[export_format][0]}"
+    export_analysis(result, str(path), export_format)
+    assert load_analysis(str(path)) == result
+
+@pytest.mark.parametrize("extension", [".sarif", ".json", ".txt"])
+def test_loads_json_with_bom_and_leading_whitespace(tmp_path, extension):
+    result = _analysis_result()
+    exported = tmp_path / "analysis.sarif"
+    export_analysis(result, str(exported), "sarif")
+    path = tmp_path / f"other_tool{extension}"
+    path.write_bytes(b"\xef\xbb\xbf\n  " + exported.read_bytes())
+    assert load_analysis(str(path)) == result
@@ -0,0 +1,15 @@
+import pytest
+from utils.guards import check_linear_pattern
+
+@pytest.mark.parametrize("pattern", [
+    r"(a+)+", r"(?:a|a)*b", r"(?:a|ab)*c", r"\w*\w*\w*\w*\w*!", r"(\w*)(\w*)!", r"\w+\s*\w+x",
+])
+def test_rejects_backtracking_patterns(pattern):
+    with pytest.raises(Exception):
+        check_linear_pattern(pattern)
+
+@pytest.mark.parametrize("pattern", [
+    r"\.call\s*\(", r"function\s+\w+\s*\(", r"(?:ab|cd)*", r"[a-z]\w*", r"\w+\s+\w+", r"a{2}b*",
+])
+def test_accepts_linear_patterns(pattern):
+    check_linear_pattern(pattern)
@@ -0,0 +1,81 @@
+import json
+from utils.analyzer import analyze_solidity_code, reanalyze_incremental, build_analysis_result
+
+def _previous_result(source_code: str) -> dict:
+    """저장했다가 다시 읽은 것과 같은 이전 분석 결과를 만듭니다."""
+    graph, dangerous_functions = analyze_solidity_code(source_code)
+    return json.loads(json.dumps(build_analysis_result("0x1", graph, dangerous_functions)))
+
+def _assert_matches_full_analysis(old_source: str, new_source: str, reanalyzes: bool = True):
+    graph, dangerous_functions, diff = reanalyze_incremental(new_source, _previous_result(old_source))
+    full_graph, full_dangerous = analyze_solidity_code(new_source)
+    assert sorted(graph.edges(data='kind')) == sorted(full_graph.edges(data='kind'))
+    assert sorted(dangerous_functions) == sorted(full_dangerous)
+    assert dict(graph.nodes(data='selectors')) == dict(full_graph.nodes(data='selectors'))
+    assert (diff['reanalyzed_functions'] > 0) == reanalyzes
+    return graph, dangerous_functions, diff
+
+def test_changed_base_contract_reresolves_calls():
+    source = '''
+contract B { function foo() internal { } }
+contract C { function foo() internal { selfdestruct(payable(msg.sender)); } }
+contract A is %s { function bar() public { foo(); } }
+'''
+    graph, dangerous_functions, _ = _assert_matches_full_analysis(source % "B", source % "C")
+    assert graph.has_edge("A.bar", "C.foo")
+    assert not graph.has_edge("A.bar", "B.foo")
+    assert "C.foo" in dangerous_functions
+
+def test_changed_state_variable_type_reresolves_calls():
+    source = '''
+contract X { function f() external { } }
+contract Y { function f() external { } }
+contract A { %s t; function g() public { t.f(); } }
+'''
+    graph, _, _ = _assert_matches_full_analysis(source % "X", source % "Y")
+    assert graph.has_edge("A.g", "Y.f")
+    assert not graph.has_edge("A.g", "X.f")
+
+def test_changed_using_for_reresolves_calls():
+    source = '''
+library L1 { function add(uint a, uint b) internal pure returns (uint) { return a + b; } }
+library L2 { function add(uint a, uint b) internal pure returns (uint) { return a + b; } }
+contract A { using %s for uint; function g(uint x) public { x.add(1); } }
+'''
+    graph, _, _ = _assert_matches_full_analysis(source % "L1", source % "L2")
+    assert graph.has_edge("A.g", "L2.add")
+
+def test_added_function_reresolves_only_callers_that_mention_it():
+    old_source = '''
+contract A {
+    function g() public { foo(); }
+    function h() public { bar(); }
+    function bar() internal { }
+}
+'''
+    new_source = old_source.replace("function bar()", "function foo() internal { selfdestruct(payable(msg.sender)); }\n    function bar()")
+    graph, dangerous_functions, diff = _assert_matches_full_analysis(old_source, new_source)
+    assert graph.has_edge("A.g", "A.foo")
+    assert graph.has_edge("A.h", "A.bar")
+    assert diff['reanalyzed_functions'] == 2  # 추가된 A.foo와 foo를 호출하는 A.g만 다시 해석
+
+def test_removed_override_falls_back_to_base_function():
+    source = '''
+contract B { function foo() internal { selfdestruct(payable(msg.sender)); } }
+contract A is B {
+    %s
+    function bar() public { foo(); }
+}
+'''
+    graph, _, _ = _assert_matches_full_analysis(source % "function foo() internal { }", source % "")
+    assert graph.has_edge("A.bar", "B.foo")
+
+def test_changed_struct_definition_updates_unchanged_selectors():
+    source = '''
+contract A {
+    struct S { %s }
+    function f(S memory s) public { }
+}
+'''
+    graph, _, _ = _assert_matches_full_analysis(source % "uint a;", source % "address a;", reanalyzes=False)
+    assert graph.nodes["A.f"]['signatures'] == ["f((address))"]
@@ -1,91 +1,160 @@
-import os
 import networkx as nx
-import requests
 import re
-from typing import Tuple, List
-from dotenv import load_dotenv
+import time
+import heapq
+import hashlib
+from datetime import datetime
+from typing import Tuple, List, Dict, Optional
+from utils.fetcher import get_fetcher
+from utils.rules import RuleSet, get_ruleset
+from utils.tracing import tracer
+from utils.metrics import registry
+from utils.log import DEBUG, DEBUG_SAMPLE, get_logger
+from utils.guards import AnalysisBudget, ForwardFinder, blank_comments, budget_message, match_braces
+from utils.selector_index import canonical_signature, collect_type_definitions, function_selector
+from utils.reachability import ENTRY_POINTS
 
-# .env 파일에서 환경변수 로드
-load_dotenv()
-ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY")
-ETHERSCAN_API_URL = "https://api.etherscan.io/api"
+# 분석 지표
+ANALYSES = registry.counter("eth_lens_analyses_total", "컨트랙트 분석 수 (방식/결과별)", ["mode", "outcome"])
+ANALYSIS_LATENCY = registry.histogram("eth_lens_analysis_seconds", "컨트랙트 분석 시간 (소스 조회 포함)", ["mode"])
+ANALYSES_IN_PROGRESS = registry.gauge("eth_lens_analyses_in_progress", "진행 중인 컨트랙트 분석 수")
+FUNCTIONS_ANALYZED = registry.counter("eth_lens_functions_analyzed_total", "분석한 함수 수")
 
-DANGEROUS_FUNCTIONS = [
-    "selfdestruct", "delegatecall", "tx.origin", "suicide", "callcode", "assembly", "low-level-call"
-]
+log = get_logger(__name__)
 
 def get_contract_source(address: str) -> str:
     """Etherscan API를 통해 컨트랙트 소스코드를 가져옵니다."""
-    if not ETHERSCAN_API_KEY:
-        raise Exception("ETHERSCAN_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
-    
-    # 주소 형식 검증
-    if not address.startswith('0x') or len(address) != 42:
-        raise Exception("올바른 이더리움 주소 형식이 아닙니다. (0x로 시작하는 42자리 주소)")
-    
     try:
-        params = {
-            "module": "contract",
-            "action": "getsourcecode",
-            "address": address,
-            "apikey": ETHERSCAN_API_KEY
-        }
-        print(f"API 요청 파라미터: {params}")
-        response = requests.get(ETHERSCAN_API_URL, params=params, timeout=10)
-        data = response.json()
-        print(f"Etherscan API 응답: {data}")
-        
-        if data.get('status') == '1' and data.get('result'):
-            contract_data = data['result'][0]
-            if contract_data.get('SourceCode'):
-                return contract_data['SourceCode']
-            else:
-                raise Exception("컨트랙트 소스코드가 공개되지 않았습니다. (Verified 컨트랙트만 분석 가능)")
-        elif data.get('status') == '0':
-            error_msg = data.get('message', 'Unknown error')
-            if 'NOTOK' in error_msg:
-                raise Exception("API 키가 유효하지 않거나 사용량 제한에 도달했습니다.")
-            elif 'No records found' in error_msg:
-                raise Exception("해당 주소의 컨트랙트를 찾을 수 없습니다.")
-            else:
-                raise Exception(f"API 오류: {error_msg}")
-        else:
-            raise Exception(f"API 응답 오류: {data}")
-    except requests.exceptions.Timeout:
-        raise Exception("API 요청 시간 초과. 잠시 후 다시 시도해주세요.")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"네트워크 오류: {e}")
+        contract_data = get_fetcher().fetch_contract(address)
     except Exception as e:
         raise Exception(f"Etherscan API 오류: {e}")
+    
+    if not contract_data['verified']:
+        raise Exception("컨트랙트 소스코드가 공개되지 않았습니다. (Verified 컨트랙트만 분석 가능)")
+    return contract_data['source_code']
 
-def analyze_solidity_code(source_code: str) -> Tuple[nx.DiGraph, List[str]]:
-    """Solidity 소스코드를 분석하여 함수 호출 그래프를 생성합니다."""
-    G = nx.DiGraph()
-    dangerous_functions = []
+# 컨트랙트/라이브러리/인터페이스 선언 키워드와 이름 (상속 목록과 본문은 선형 탐색으로 찾음)
+_CONTRACT_PATTERN = re.compile(r'\b(abstract\s+contract|contract|library|interface)\s+(\w+)\s*')
+# 함수 시그니처의 시작 (이름 없는 fallback/receive 포함)
+_FUNCTION_PATTERN = re.compile(r'(?:function\s+\w+|constructor|fallback|receive)\s*\(', re.IGNORECASE)
+_USING_PATTERN = re.compile(r'\busing\s+([\w.]+)\s+for\b')
+_MEMBER_CALL_PATTERN = re.compile(r'\b(\w+)\s*\.\s*(\w+)\s*(?:{[^{}]*}\s*)?\(')
+_CAST_CALL_PATTERN = re.compile(r'\b(\w+)\s*\([^()]*\)\s*\.\s*(\w+)\s*(?:{[^{}]*}\s*)?\(')
+_PLAIN_CALL_PATTERN = re.compile(r'(?<![.\w])(\w+)\s*\(')
+_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+# 호출 해석에 쓰일 수 있는 이름 (뒤에 "(", ".", "{"가 오는 식별자: 함수, 멤버, 컨트랙트/라이브러리/변수)
+_MENTION_PATTERN = re.compile(r'\b(\w+)\s*[({.]')
+_DECLARATION_MODIFIERS = frozenset(['public', 'private', 'internal', 'external', 'immutable', 'constant',
+                                    'memory', 'storage', 'calldata', 'payable'])
 
-    # 함수 시그니처 패턴 (이름 없는 fallback/receive 포함)
-    function_sig_pattern = r"((?:function\s+\w+|constructor|fallback|receive)\s*\([^)]*\)[^{]*{)"
-    matches = list(re.finditer(function_sig_pattern, source_code, re.IGNORECASE))
+def _split_top_level(text: str) -> List[str]:
+    """괄호 밖의 쉼표로 문자열을 나눕니다 (예: "A, B(1, 2)" → ["A", " B(1, 2)"])."""
+    parts, depth, current = [], 0, ''
+    for char in text:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    return [part for part in parts if part.strip()]
+
+def extract_contracts(source_code: str) -> List[Dict]:
+    """소스코드의 컨트랙트/라이브러리/인터페이스 선언, 상속 목록, 본문 범위를 추출합니다."""
+    code = blank_comments(source_code)
+    block_ends = match_braces(code)
+    open_brace = ForwardFinder(code, '{')
+    semicolon = ForwardFinder(code, ';')
+    contracts = []
+    resume = 0
+    for match in _CONTRACT_PATTERN.finditer(code):
+        if match.start() < resume:
+            continue  # 앞 선언의 상속 목록 안에 있는 키워드
+        brace_start = open_brace.find(match.end())
+        if brace_start == -1:
+            break
+        stop = semicolon.find(match.end())
+        if stop != -1 and stop < brace_start:
+            continue
+        # 이름 뒤에는 본문("{") 또는 "is 상속 목록 {"만 올 수 있음
+        header = code[match.end():brace_start]
+        if header and not (header.startswith('is') and header[2:3].isspace()):
+            continue
+        resume = brace_start + 1
+        bases = []
+        for base in _split_top_level(header[2:]):
+            base_match = re.match(r'\s*([\w.]+)', base)
+            if base_match:
+                bases.append(base_match.group(1).split('.')[-1])
+        keyword = match.group(1)
+        contracts.append({
+            'name': match.group(2),
+            'kind': 'contract' if keyword.endswith('contract') else keyword,
+            'abstract': keyword.startswith('abstract'),
+            'bases': bases,
+            'start': brace_start,
+            'end': block_ends[brace_start]
+        })
+    return contracts
+
+def qualified_name(contract: Optional[str], func_name: str) -> str:
+    """컨트랙트 이름으로 한정한 노드 이름을 반환합니다 (예: Vault.withdraw)."""
+    return f"{contract}.{func_name}" if contract else func_name
+
+def bare_name(node: str) -> str:
+    """한정된 노드 이름에서 함수 이름만 반환합니다."""
+    return node.rsplit('.', 1)[-1]
+
+def contract_of(node: str) -> Optional[str]:
+    """한정된 노드 이름에서 컨트랙트 이름을 반환합니다. 컨트랙트 밖의 함수는 None입니다."""
+    return node.rsplit('.', 1)[0] if '.' in node else None
+
+def extract_functions(source_code: str, budget: Optional[AnalysisBudget] = None,
+                      contracts: Optional[List[Dict]] = None) -> List[Tuple[str, str, str]]:
+    """소스코드에서 (함수명, 시그니처, 본문) 목록을 추출합니다.
+
+    컨트랙트 안에 정의된 함수의 이름은 "컨트랙트.함수" 형식으로 한정되므로,
+    평탄화된(flattened) 소스에서 여러 컨트랙트의 같은 이름 함수가 하나로 합쳐지지 않습니다.
+    시그니처와 본문 범위는 소스 길이에 선형인 탐색으로 찾으며, budget을 넘으면 그때까지 추출한 함수만 반환합니다.
+    이미 extract_contracts로 찾은 컨트랙트 목록이 있으면 contracts로 넘겨 다시 찾지 않습니다.
+    """
+    budget = budget or AnalysisBudget.unlimited()
+    contracts = sorted(extract_contracts(source_code) if contracts is None else contracts, key=lambda c: c['start'])
+    block_ends = match_braces(source_code)
+    close_paren = ForwardFinder(source_code, ')')
+    open_brace = ForwardFinder(source_code, '{')
+    semicolon = ForwardFinder(source_code, ';')
+    # 함수 위치를 지나며 아직 끝나지 않은 컨트랙트를 시작 위치 순으로 보관
+    open_contracts = []
+    next_contract = 0
 
     func_infos = []
-    for i, match in enumerate(matches):
+    resume = 0
+    for match in _FUNCTION_PATTERN.finditer(source_code):
         sig_start = match.start()
-        brace_start = source_code.find('{', sig_start)
+        if sig_start < resume:
+            continue  # 앞 함수의 시그니처 안에 있는 키워드
+        # 시그니처: 첫 ")" 다음에 ";"보다 "{"가 먼저 나와야 함 (본문 없는 선언 제외)
+        paren = close_paren.find(match.end())
+        if paren == -1:
+            break
+        brace_start = open_brace.find(paren)
         if brace_start == -1:
+            break
+        stop = semicolon.find(paren)
+        if stop != -1 and stop < brace_start:
             continue
-        # 중괄호 개수 세며 함수 본문 추출
-        brace_count = 1
-        func_body = '{'
-        for j in range(brace_start + 1, len(source_code)):
-            func_body += source_code[j]
-            if source_code[j] == '{':
-                brace_count += 1
-            elif source_code[j] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    break
+        resume = brace_start + 1
+        body_end = block_ends[brace_start]
+        if not budget.charge(body_end - brace_start, "extract_functions"):
+            break
+        func_body = source_code[brace_start:body_end]
         # 함수명 추출
-        sig = match.group(1)
+        sig = source_code[sig_start:brace_start + 1]
         name_match = re.search(r'function\s+(\w+)', sig)
         if name_match:
             func_name = name_match.group(1)
@@ -96,52 +165,634 @@ def analyze_solidity_code(source_code: str) -> Tuple[nx.DiGraph, List[str]]:
         elif sig.strip().startswith('receive'):
             func_name = 'receive'
         else:
-            func_name = f'unknown_{i}'
-        func_infos.append((func_name, func_body))
-
-    all_functions = [name for name, _ in func_infos]
-
-    # 위험 함수 패턴
-    dangerous_patterns = {
-        "selfdestruct": r"selfdestruct",
-        "delegatecall": r"delegatecall",
-        "tx.origin": r"tx\.origin",
-        "suicide": r"suicide",
-        "callcode": r"callcode",
-        "assembly": r"assembly",
-        "low-level-call": r"\.call\s*\(",
-        "staticcall": r"staticcall",
-        "block.timestamp": r"block\.timestamp",
-        "block.number": r"block\.number"
-    }
+            func_name = f'unknown_{len(func_infos)}'
+        while next_contract < len(contracts) and contracts[next_contract]['start'] < sig_start:
+            heapq.heappush(open_contracts, (contracts[next_contract]['start'], next_contract))
+            next_contract += 1
+        while open_contracts and contracts[open_contracts[0][1]]['end'] <= sig_start:
+            heapq.heappop(open_contracts)
+        contract = contracts[open_contracts[0][1]]['name'] if open_contracts else None
+        func_infos.append((qualified_name(contract, func_name), sig, func_body))
+    return func_infos
+
+def scan_dangers(func_name: str, func_code: str, ruleset: Optional[RuleSet] = None) -> List[str]:
+    """함수 본문에서 발견된 모든 위험 유형을 반환합니다 (규칙 파일 data/danger_rules.json 기준)."""
+    ruleset = ruleset or get_ruleset()
+    dangers = ruleset.scan(func_code)
+    if dangers and log.isEnabledFor(DEBUG):
+        for danger_type in dangers:
+            log.debug("위험 함수 발견: %s에서 %s", func_name, danger_type)
+    return dangers
+
+def _contract_type_variables(body: str, contract_names) -> Dict[str, str]:
+    """IERC20 public token; / Vault vault = Vault(addr); 같은 컨트랙트 타입 변수 선언을 찾습니다.
+
+    컨트랙트 이름을 정규식 대안으로 나열하지 않고 토큰을 이름 집합에서 조회하므로 컨트랙트 수와 무관하게 선형입니다.
+    """
+    variables = {}
+    tokens = _TOKEN_PATTERN.findall(body)
+    for i, token in enumerate(tokens):
+        if token not in contract_names:
+            continue
+        j = i + 1
+        while j < len(tokens) and tokens[j] in _DECLARATION_MODIFIERS:
+            j += 1
+        if j + 1 < len(tokens) and (tokens[j][0].isalnum() or tokens[j][0] == '_') and tokens[j + 1] in ';=,)':
+            variables[tokens[j]] = token
+    return variables
+
+class CallResolver:
+    """상속, using-for, 컨트랙트 타입 변수를 이용해 함수 본문의 호출 대상을 찾습니다.
+
+    호출 종류는 internal(같은 컨트랙트 또는 상속), library(내부 라이브러리 함수, 인라인됨),
+    delegatecall(public/external 라이브러리 함수), external(다른 컨트랙트 호출)입니다.
+    """
+
+    def __init__(self, source_code: str, contracts: List[Dict], functions: Dict[str, Dict]):
+        self.contracts = {c['name']: c for c in contracts}
+        self.visibility = {name: info['visibility'] for name, info in functions.items()}
+        self.members = {}
+        for name in functions:
+            self.members.setdefault(contract_of(name), {})[bare_name(name)] = name
+
+        code = blank_comments(source_code)
+        self.using = {}
+        self.variables = {}
+        for contract in contracts:
+            body = code[contract['start']:contract['end']]
+            self.using[contract['name']] = [m.group(1).split('.')[-1] for m in _USING_PATTERN.finditer(body)]
+            self.variables[contract['name']] = _contract_type_variables(body, self.contracts)
+
+    def linearization(self, contract: Optional[str]) -> List[Optional[str]]:
+        """함수 이름을 찾을 컨트랙트 순서를 반환합니다 (자신, 기반 컨트랙트(오른쪽 우선), 컨트랙트 밖 함수)."""
+        order = []
+
+        def visit(name):
+            if name in order or name not in self.contracts:
+                return
+            order.append(name)
+            for base in reversed(self.contracts[name]['bases']):
+                visit(base)
+
+        visit(contract)
+        return order + [None]
+
+    def context_digest(self, contract: Optional[str]) -> str:
+        """호출 해석에 쓰이는 컨트랙트 문맥(선형화된 기반 컨트랙트, using-for, 컨트랙트 타입 변수)의 해시를 반환합니다.
+
+        함수 본문이 같아도 이 값이 바뀌면 호출 대상이 달라질 수 있으므로 증분 분석의 무효화 키로 사용합니다.
+        """
+        lineage = self.linearization(contract)
+        context = (lineage, [self.using.get(base, []) for base in lineage],
+                   sorted(self.variables.get(contract, {}).items()))
+        return hashlib.sha256(repr(context).encode('utf-8')).hexdigest()[:16]
+
+    def _lookup(self, contracts: List[Optional[str]], func_name: str) -> Optional[str]:
+        for contract in contracts:
+            node = self.members.get(contract, {}).get(func_name)
+            if node:
+                return node
+        return None
+
+    def _library_kind(self, node: Optional[str]) -> str:
+        # public/external 라이브러리 함수는 DELEGATECALL로 호출되고, internal 함수는 호출자 코드에 인라인됨
+        return 'delegatecall' if node and self.visibility.get(node) in ('public', 'external') else 'library'
+
+    def resolve(self, func_name: str, func_code: str) -> List[Dict]:
+        """함수 본문의 호출을 {target(노드 또는 None), contract, function, kind} 목록으로 반환합니다."""
+        contract = contract_of(func_name)
+        lineage = self.linearization(contract)
+        calls = []
+        seen = set()
+
+        def add(target, target_contract, target_function, kind):
+            key = (target, target_contract, target_function, kind)
+            if target != func_name and key not in seen:
+                seen.add(key)
+                calls.append({'target': target, 'contract': target_contract, 'function': target_function, 'kind': kind})
+
+        for match in _MEMBER_CALL_PATTERN.finditer(func_code):
+            owner, member = match.group(1), match.group(2)
+            if owner == 'this':
+                target = self._lookup(lineage, member)
+                if target:
+                    add(target, contract_of(target), member, 'internal')
+            elif owner == 'super':
+                target = self._lookup(lineage[1:], member)
+                if target:
+                    add(target, contract_of(target), member, 'internal')
+            elif owner in self.contracts:
+                target = self.members.get(owner, {}).get(member)
+                if self.contracts[owner]['kind'] == 'library':
+                    add(target, owner, member, self._library_kind(target))
+                elif owner in lineage:
+                    if target:
+                        add(target, owner, member, 'internal')
+                else:
+                    add(target, owner, member, 'external')
+            elif owner in self.variables.get(contract, {}):
+                owner_type = self.variables[contract][owner]
+                add(self.members.get(owner_type, {}).get(member), owner_type, member, 'external')
+            else:
+                # using L for T; 로 연결된 라이브러리 함수 (x.add(y) → L.add(x, y))
+                for base in lineage:
+                    library = next((lib for lib in self.using.get(base, []) if member in self.members.get(lib, {})), None)
+                    if library:
+                        target = self.members[library][member]
+                        add(target, library, member, self._library_kind(target))
+                        break
+
+        for match in _CAST_CALL_PATTERN.finditer(func_code):
+            owner, member = match.group(1), match.group(2)
+            if owner in self.contracts and self.contracts[owner]['kind'] != 'library':
+                add(self.members.get(owner, {}).get(member), owner, member, 'external')
+
+        for match in _PLAIN_CALL_PATTERN.finditer(func_code):
+            target = self._lookup(lineage, match.group(1))
+            if target:
+                add(target, contract_of(target), match.group(1), 'internal')
+
+        if log.isEnabledFor(DEBUG):
+            # 호출 엣지마다 발생하므로 표본만 기록
+            for call in calls:
+                if call['target']:
+                    log.debug("함수 호출 발견: %s → %s", func_name, call['target'],
+                              sample=DEBUG_SAMPLE, kind=call['kind'])
+        return calls
+
+def contract_dependencies(contracts: List[Dict], resolver: CallResolver,
+                          calls_by_function: Dict[str, List[Dict]]) -> List[Dict]:
+    """컨트랙트 사이의 의존 관계(상속, using-for, 라이브러리/외부 호출)를 반환합니다."""
+    dependencies = []
+    for contract in contracts:
+        for base in contract['bases']:
+            dependencies.append({'source': contract['name'], 'target': base, 'kind': 'inherits',
+                                 'function': None, 'target_function': None})
+        for library in dict.fromkeys(resolver.using.get(contract['name'], [])):
+            dependencies.append({'source': contract['name'], 'target': library, 'kind': 'uses',
+                                 'function': None, 'target_function': None})
+    for func_name, calls in calls_by_function.items():
+        dependencies.extend(_call_dependencies(func_name, calls))
+    return dependencies
+
+def _call_dependencies(func_name: str, calls: List[Dict]) -> List[Dict]:
+    """함수의 호출 중 다른 컨트랙트로 향하는 호출을 의존 관계로 변환합니다."""
+    source = contract_of(func_name)
+    return [{'source': source, 'target': call['contract'], 'kind': call['kind'],
+             'function': func_name, 'target_function': call['function']}
+            for call in calls
+            if call['kind'] != 'internal' and call['contract'] and call['contract'] != source]
+
+def function_hash(signature: str, func_code: str) -> str:
+    """공백 차이를 무시한 함수 시그니처+본문의 콘텐츠 해시를 반환합니다."""
+    normalized = ' '.join(f"{signature} {func_code}".split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:16]
+
+def call_mentions(func_code: str) -> List[str]:
+    """함수 본문에서 호출 해석에 쓰일 수 있는 이름을 정렬해 반환합니다.
+
+    증분 분석은 이 목록으로 함수/컨트랙트의 추가·삭제에 영향을 받는 (본문이 같은) 함수만 다시 해석합니다.
+    """
+    return sorted(set(_MENTION_PATTERN.findall(func_code)))
+
+def type_digest(type_definitions: Dict[str, object]) -> str:
+    """사용자 정의 타입 정의(정식 시그니처 계산에 쓰임)의 해시를 반환합니다."""
+    return hashlib.sha256(repr(sorted(type_definitions.items())).encode('utf-8')).hexdigest()[:16]
+
+def _merge_overloads(func_infos: List[Tuple[str, str, str]], type_definitions: Dict[str, object],
+                     previous: Optional[Dict[str, Dict]] = None, reuse_signatures: bool = False) -> Dict[str, Dict]:
+    """같은 이름의 함수(오버로드)를 하나의 노드 정보로 합칩니다.
+
+    외부에서 호출 가능한(public/external) 오버로드마다 정식 ABI 시그니처와 4바이트 선택자를 계산합니다.
+    previous(이전 그래프의 노드 속성)에서 콘텐츠 해시가 같은 함수는 호출 이름 목록을, reuse_signatures이면
+    (타입 정의가 같으면) 시그니처와 선택자도 다시 계산하지 않고 가져옵니다.
+    """
+    merged = {}
+    # 오버로드가 많아도 선형 시간이 되도록 조각을 모았다가 한 번에 합침
+    parts = {}
+    for func_name, sig, func_code in func_infos:
+        if func_name not in merged:
+            merged[func_name] = {'visibility': _get_visibility(func_name, sig), 'contract': contract_of(func_name),
+                                 'name': bare_name(func_name)}
+        signatures, bodies = parts.setdefault(func_name, ([], []))
+        signatures.append(sig)
+        bodies.append(func_code)
+    previous = previous or {}
+    for func_name, info in merged.items():
+        info['signature'] = ''.join(parts[func_name][0])
+        info['body'] = ''.join(parts[func_name][1])
+        info['hash'] = function_hash(info['signature'], info['body'])
+        old = previous.get(func_name)
+        unchanged = old is not None and old.get('hash') == info['hash']
+        info['mentions'] = old['mentions'] if unchanged and old.get('mentions') is not None \
+            else call_mentions(info['body'])
+        if unchanged and reuse_signatures:
+            info['signatures'] = list(old.get('signatures', []))
+            info['selectors'] = list(old.get('selectors', []))
+            continue
+        info['signatures'], info['selectors'] = [], []
+        for sig in parts[func_name][0]:
+            if _get_visibility(func_name, sig) not in ('public', 'external'):
+                continue
+            try:
+                canonical = canonical_signature(info['name'], sig, type_definitions)
+            except Exception as e:
+                log.debug("시그니처 변환 실패: %s (%s)", func_name, e)
+                canonical = None
+            if canonical and canonical not in info['signatures']:
+                info['signatures'].append(canonical)
+                info['selectors'].append(function_selector(canonical))
+    return merged
+
+def _add_function_node(G: nx.DiGraph, func_name: str, info: Dict, dangers: Optional[List[str]] = None):
+    """함수 정보를 그래프 노드로 추가합니다."""
+    G.add_node(func_name, visibility=info['visibility'], hash=info['hash'], dangers=dangers if dangers is not None else [],
+               contract=info['contract'], name=info['name'],
+               signatures=info['signatures'], selectors=info['selectors'], mentions=info['mentions'])
 
-    print(f"발견된 함수들: {all_functions}")
+def _contract_summary(contracts: List[Dict], resolver: CallResolver) -> Dict[str, Dict]:
+    """그래프/결과에 저장할 컨트랙트 선언 요약(호출 해석 문맥 해시 포함)을 반환합니다."""
+    return {c['name']: {'kind': c['kind'], 'abstract': c['abstract'], 'bases': c['bases'],
+                        'context': resolver.context_digest(c['name'])} for c in contracts}
 
-    for func_name, func_code in func_infos:
-        G.add_node(func_name)
-        # 위험 함수 탐지
-        for danger_type, pattern in dangerous_patterns.items():
-            if re.search(pattern, func_code, re.IGNORECASE):
-                print(f"위험 함수 발견: {func_name}에서 {danger_type}")
+def analyze_solidity_code(source_code: str, budget: Optional[AnalysisBudget] = None) -> Tuple[nx.DiGraph, List[str]]:
+    """Solidity 소스코드를 분석하여 함수 호출 그래프를 생성합니다.
+
+    노드는 컨트랙트로 한정된 함수 이름이고, 엣지의 kind 속성은 호출 종류입니다.
+    graph.graph['dependencies']에는 컨트랙트 사이의 의존 관계가 기록됩니다.
+    시간/메모리 예산(budget, 기본값은 환경 변수)을 넘으면 그때까지의 결과를 반환하고
+    graph.graph['budget_exceeded']에 초과 내용을 기록합니다.
+    """
+    G = nx.DiGraph()
+    dangerous_functions = []
+    # 분석 도중 규칙이 다시 로드되어도 한 분석에는 같은 규칙 세트를 사용
+    ruleset = get_ruleset()
+    G.graph['ruleset_version'] = ruleset.version
+    budget = budget or AnalysisBudget()
+    if not budget.charge(len(source_code), "source"):
+        raise Exception(budget_message(budget.exceeded))
+
+    with tracer.span("extract_functions"):
+        contracts = extract_contracts(source_code)
+        func_infos = extract_functions(source_code, budget, contracts)
+        type_definitions = collect_type_definitions(source_code)
+        functions = _merge_overloads(func_infos, type_definitions)
+        resolver = CallResolver(source_code, contracts, functions)
+    G.graph['type_digest'] = type_digest(type_definitions)
+
+    log.debug("발견된 함수들: %s", list(functions), count=len(functions))
+
+    # 뒤에 정의된 함수를 먼저 호출하는 경우에도 노드 속성이 유지되도록 노드를 먼저 모두 추가
+    for func_name, info in functions.items():
+        _add_function_node(G, func_name, info)
+
+    # 위험 함수 탐지 (발견된 모든 유형을 노드 속성으로 기록)
+    with tracer.span("scan_dangers", functions=len(func_infos)):
+        for func_name, _, func_code in func_infos:
+            if not budget.ok("scan_dangers"):
+                break
+            dangers = G.nodes[func_name]['dangers']
+            for danger_type in scan_dangers(func_name, func_code, ruleset):
+                if danger_type not in dangers:
+                    dangers.append(danger_type)
                 if func_name not in dangerous_functions:
                     dangerous_functions.append(func_name)
+
+    # 함수 호출 관계
+    calls_by_function = {}
+    with tracer.span("detect_edges"):
+        for func_name, _, func_code in func_infos:
+            if not budget.ok("detect_edges"):
                 break
-        # 함수 호출 관계
-        for other_func, _ in func_infos:
-            if other_func != func_name:
-                call_patterns = [
-                    rf"\b{re.escape(other_func)}\s*\(",
-                    rf"this\.{re.escape(other_func)}\s*\(",
-                    rf"super\.{re.escape(other_func)}\s*\("
-                ]
-                for call_pattern in call_patterns:
-                    if re.search(call_pattern, func_code, re.IGNORECASE):
-                        G.add_edge(func_name, other_func)
-                        print(f"함수 호출 발견: {func_name} → {other_func}")
-                        break
-    print(f"위험 함수 목록: {dangerous_functions}")
+            calls = resolver.resolve(func_name, func_code)
+            calls_by_function.setdefault(func_name, []).extend(calls)
+            for call in calls:
+                if call['target']:
+                    G.add_edge(func_name, call['target'], kind=call['kind'])
+
+    with tracer.span("dependencies"):
+        G.graph['contracts'] = _contract_summary(contracts, resolver)
+        G.graph['dependencies'] = _unique_dependencies(contract_dependencies(contracts, resolver, calls_by_function))
+    G.graph['budget_exceeded'] = budget.exceeded
+    log.debug("위험 함수 목록: %s", dangerous_functions, count=len(dangerous_functions))
     return G, dangerous_functions
 
+def _unique_dependencies(dependencies: List[Dict]) -> List[Dict]:
+    """중복된 의존 관계를 제거합니다 (처음 등장한 순서 유지)."""
+    unique = {}
+    for dependency in dependencies:
+        key = (dependency['source'], dependency['target'], dependency['kind'],
+               dependency['function'], dependency['target_function'])
+        unique.setdefault(key, dependency)
+    return list(unique.values())
+
+def reanalyze_incremental(source_code: str, previous_result: Dict,
+                          budget: Optional[AnalysisBudget] = None) -> Tuple[nx.DiGraph, List[str], Dict]:
+    """이전 분석 결과를 바탕으로 변경되거나 추가된 함수만 다시 분석합니다.
+
+    변경되지 않은 함수(콘텐츠 해시 동일)는 이전 그래프의 노드와 호출 엣지를 그대로 사용하고,
+    상속·using-for·컨트랙트 타입 변수(호출 해석 문맥)가 바뀐 컨트랙트의 함수는 모두 다시 분석합니다.
+    함수가 추가/삭제되거나 가시성, 컨트랙트 선언이 바뀌면 그 이름을 본문에서 언급하는 함수(이전 결과의
+    호출 이름 목록 기준)만 호출을 다시 해석하므로, 비용이 전체 함수 수가 아니라 변경 범위에 비례합니다.
+    반환값의 세 번째 항목은 구조적 변경 사항입니다.
+    예산을 넘으면 남은 함수는 노드만 추가하고 위험 탐지와 호출 확인을 건너뜁니다.
+    """
+    previous_graph = graph_from_result(previous_result)
+    ruleset = get_ruleset()
+    budget = budget or AnalysisBudget()
+    if not budget.charge(len(source_code), "source"):
+        raise Exception(budget_message(budget.exceeded))
+    # 규칙 세트가 바뀌었으면 모든 함수의 위험 탐지를 다시 수행 (호출 엣지는 재사용)
+    rules_changed = previous_result.get('ruleset_version') != ruleset.version
+    previous_nodes = previous_graph.nodes
+    with tracer.span("extract_functions"):
+        contracts = extract_contracts(source_code)
+        func_infos = extract_functions(source_code, budget, contracts)
+        type_definitions = collect_type_definitions(source_code)
+        current_type_digest = type_digest(type_definitions)
+        # 타입 정의가 같으면 본문이 같은 함수의 시그니처와 선택자(Keccak 계산)를 재사용
+        functions = _merge_overloads(func_infos, type_definitions, previous_nodes,
+                                     reuse_signatures=previous_result.get('type_digest') == current_type_digest)
+        resolver = CallResolver(source_code, contracts, functions)
+
+    removed = [name for name in previous_graph.nodes() if name not in functions]
+    added = [name for name in functions if name not in previous_nodes]
+    # 해시가 없는 이전 결과의 함수는 변경된 것으로 간주
+    changed = [name for name in functions
+               if name in previous_nodes and previous_nodes[name].get('hash') != functions[name]['hash']]
+    # 호출 해석 문맥이 바뀐 컨트랙트 (문맥 해시가 없는 이전 결과는 바뀐 것으로 간주)
+    previous_contracts = previous_result.get('contracts', {})
+    context_changed = {c['name'] for c in contracts
+                       if previous_contracts.get(c['name'], {}).get('context') != resolver.context_digest(c['name'])}
+    rescan = set(added) | set(changed) | {name for name in functions if contract_of(name) in context_changed}
+
+    # 이름으로 찾는 호출 대상(함수, 라이브러리 호출 종류를 정하는 가시성, 컨트랙트)이 바뀐 이름
+    affected_names = {bare_name(name) for name in added + removed}
+    affected_names.update(bare_name(name) for name in changed
+                          if previous_nodes[name].get('visibility') != functions[name]['visibility'])
+    contract_kinds = {c['name']: c['kind'] for c in contracts}
+    affected_names.update(name for name in set(contract_kinds) | set(previous_contracts)
+                          if contract_kinds.get(name) != previous_contracts.get(name, {}).get('kind'))
+    reresolve = set(rescan)
+    if affected_names:
+        reresolve.update(name for name, info in functions.items()
+                         if name not in rescan and not affected_names.isdisjoint(info['mentions']))
+
+    bodies = {}
+    for func_name, _, func_code in func_infos:
+        bodies.setdefault(func_name, []).append(func_code)
+
+    # 다시 해석하지 않는 함수의 컨트랙트 간 의존 관계는 이전 결과에서 가져옴
+    call_dependencies = [d for d in previous_result.get('dependencies', [])
+                         if d.get('function') and d['function'] in functions and d['function'] not in reresolve]
+
+    log.info("증분 분석", added=len(added), changed=len(changed), removed=len(removed),
+             context_changed=len(context_changed), reresolved=len(reresolve) - len(rescan),
+             reused=len(functions) - len(reresolve), rules_changed=rules_changed)
+
+    # 노드는 소스코드 순서로 먼저 모두 추가 (재사용하는 함수는 이전 위험 탐지 결과와 심각도 유지)
+    G = nx.DiGraph(ruleset_version=ruleset.version, type_digest=current_type_digest)
+    for func_name, info in functions.items():
+        if func_name in rescan or rules_changed:
+            _add_function_node(G, func_name, info)
+        else:
+            previous_data = previous_nodes[func_name]
+            _add_function_node(G, func_name, info, list(previous_data.get('dangers', [])))
+            if previous_data.get('severities'):
+                G.nodes[func_name]['severities'] = previous_data['severities']
+
+    reused_edges = []
+    with tracer.span("rescan_functions", functions=len(reresolve), rules_changed=rules_changed):
+        for func_name in functions:
+            within_budget = budget.ok("rescan_functions")
+            if within_budget and (func_name in rescan or rules_changed):
+                dangers = G.nodes[func_name]['dangers']
+                for func_code in bodies[func_name]:
+                    for danger_type in scan_dangers(func_name, func_code, ruleset):
+                        if danger_type not in dangers:
+                            dangers.append(danger_type)
+            if func_name in reresolve and within_budget:
+                for func_code in bodies[func_name]:
+                    calls = resolver.resolve(func_name, func_code)
+                    call_dependencies.extend(_call_dependencies(func_name, calls))
+                    for call in calls:
+                        if call['target']:
+                            G.add_edge(func_name, call['target'], kind=call['kind'])
+            elif func_name not in rescan:
+                # 본문과 호출 해석 결과가 같은 함수는 이전 호출 엣지를 그대로 사용
+                reused_edges.extend((func_name, target, data) for target, data in previous_graph.adj[func_name].items()
+                                    if target in functions)
+    G.add_edges_from(reused_edges)
+
+    G.graph['contracts'] = _contract_summary(contracts, resolver)
+    G.graph['dependencies'] = _unique_dependencies(contract_dependencies(contracts, resolver, {}) + call_dependencies)
+    G.graph['budget_exceeded'] = budget.exceeded
+    dangerous_functions = [name for name in functions if G.nodes[name]['dangers']]
+
+    with tracer.span("diff_graphs"):
+        diff = diff_graphs(previous_graph, G)
+    diff['changed_functions'] = changed
+    diff['reanalyzed_functions'] = len(reresolve)
+    return G, dangerous_functions, diff
+
+def graph_from_result(analysis_result: Dict) -> nx.DiGraph:
+    """저장된 분석 결과에서 함수 호출 그래프를 복원합니다."""
+    G = nx.DiGraph(ruleset_version=analysis_result.get('ruleset_version'))
+    functions = analysis_result.get('functions', {})
+    dangers = {}
+    for finding in analysis_result.get('findings', []):
+        dangers.setdefault(finding['function'], []).append(finding['category'])
+    graph_data = analysis_result.get('graph_data', {})
+    for node in graph_data.get('nodes', []):
+        info = functions.get(node, {})
+        G.add_node(node,
+                   visibility=info.get('visibility', 'public'),
+                   hash=info.get('hash'),
+                   dangers=info.get('dangers', dangers.get(node, [])),
+                   severities=info.get('severities', {}),
+                   contract=info.get('contract', contract_of(node)),
+                   name=info.get('name', bare_name(node)),
+                   signatures=info.get('signatures', []),
+                   selectors=info.get('selectors', []),
+                   mentions=info.get('mentions'))
+    edge_kinds = graph_data.get('edge_kinds') or ['internal'] * len(graph_data.get('edges', []))
+    G.add_edges_from((edge[0], edge[1], {'kind': kind}) for edge, kind in zip(graph_data.get('edges', []), edge_kinds))
+    G.graph['contracts'] = analysis_result.get('contracts', {})
+    G.graph['dependencies'] = analysis_result.get('dependencies', [])
+    G.graph['type_digest'] = analysis_result.get('type_digest')
+    if analysis_result.get('proxy'):
+        G.graph['proxy'] = analysis_result['proxy']
+    return G
+
+def diff_graphs(old_graph: nx.DiGraph, new_graph: nx.DiGraph) -> Dict:
+    """두 함수 호출 그래프의 함수, 호출 엣지, 위험 발견 사항 차이를 계산합니다."""
+    old_nodes, new_nodes = set(old_graph.nodes()), set(new_graph.nodes())
+    old_edges, new_edges = set(old_graph.edges()), set(new_graph.edges())
+    old_findings = {(n, c) for n, d in old_graph.nodes(data=True) for c in d.get('dangers', [])}
+    new_findings = {(n, c) for n, d in new_graph.nodes(data=True) for c in d.get('dangers', [])}
+    return {
+        'added_functions': sorted(new_nodes - old_nodes),
+        'removed_functions': sorted(old_nodes - new_nodes),
+        'added_edges': sorted(new_edges - old_edges),
+        'removed_edges': sorted(old_edges - new_edges),
+        'added_findings': sorted(new_findings - old_findings),
+        'removed_findings': sorted(old_findings - new_findings)
+    }
+
+def _adjacency_digests(graph: nx.DiGraph) -> Dict[str, int]:
+    """함수별 (본문 해시, 호출 대상 집합)의 해시를 반환합니다. 값이 같으면 그 함수의 호출 엣지도 같습니다."""
+    return {node: hash((data.get('hash'), frozenset(graph.successors(node))))
+            for node, data in graph.nodes(data=True)}
+
+def get_danger_paths(graph: nx.DiGraph) -> set:
+    """진입 지점 함수(fallback, receive, constructor, public/external)에서 위험 함수까지 닿는 (진입 함수, 위험 함수) 쌍을 반환합니다."""
+    entries = {node for node, data in graph.nodes(data=True)
+               if bare_name(node) in ('fallback', 'receive', 'constructor')
+               or data.get('visibility') in ('public', 'external')}
+    paths = set()
+    for node, data in graph.nodes(data=True):
+        if data.get('dangers'):
+            for entry in (nx.ancestors(graph, node) | {node}) & entries:
+                paths.add((entry, node))
+    return paths
+
+def compare_graphs(old_graph: nx.DiGraph, new_graph: nx.DiGraph, path_limit: int = 50) -> Dict:
+    """두 분석 그래프의 함수, 호출 엣지, 발견 사항, 위험 경로 차이를 계산합니다.
+
+    diff_graphs와 같은 키에 changed_functions(본문이 바뀐 함수)와 added/removed_danger_paths를 더해 반환합니다.
+    함수별 인접 집합 해시가 같은 함수는 엣지 비교를 건너뛰므로 비슷한 두 버전은 바뀐 부분만 비교합니다.
+    위험 경로는 (진입 함수, 위험 함수) 쌍으로 비교하고, 앞쪽 path_limit개에는 실제 호출 경로(path)를 붙입니다.
+    """
+    old_digests, new_digests = _adjacency_digests(old_graph), _adjacency_digests(new_graph)
+    common = old_digests.keys() & new_digests.keys()
+    added_edges, removed_edges = [], []
+    for node in new_digests.keys() | old_digests.keys():
+        if node in common and old_digests[node] == new_digests[node]:
+            continue
+        old_callees = set(old_graph.successors(node)) if node in old_digests else set()
+        new_callees = set(new_graph.successors(node)) if node in new_digests else set()
+        added_edges.extend((node, callee) for callee in new_callees - old_callees)
+        removed_edges.extend((node, callee) for callee in old_callees - new_callees)
+
+    added_findings, removed_findings = [], []
+    for node in new_digests.keys() | old_digests.keys():
+        old_dangers = set(old_graph.nodes[node].get('dangers', [])) if node in old_digests else set()
+        new_dangers = set(new_graph.nodes[node].get('dangers', [])) if node in new_digests else set()
+        added_findings.extend((node, category) for category in new_dangers - old_dangers)
+        removed_findings.extend((node, category) for category in old_dangers - new_dangers)
+
+    old_paths, new_paths = get_danger_paths(old_graph), get_danger_paths(new_graph)
+
+    def describe(pairs, graph):
+        described = []
+        for i, (entry, target) in enumerate(sorted(pairs)):
+            path = nx.shortest_path(graph, entry, target) if i < path_limit else None
+            described.append({'entry': entry, 'function': target, 'path': path,
+                              'dangers': graph.nodes[target].get('dangers', [])})
+        return described
+
+    return {
+        'added_functions': sorted(new_digests.keys() - old_digests.keys()),
+        'removed_functions': sorted(old_digests.keys() - new_digests.keys()),
+        'changed_functions': sorted(node for node in common
+                                    if old_graph.nodes[node].get('hash') != new_graph.nodes[node].get('hash')),
+        'added_edges': sorted(added_edges),
+        'removed_edges': sorted(removed_edges),
+        'added_findings': sorted(added_findings),
+        'removed_findings': sorted(removed_findings),
+        'added_danger_paths': describe(new_paths - old_paths, new_graph),
+        'removed_danger_paths': describe(old_paths - new_paths, old_graph),
+        'unchanged_danger_paths': len(old_paths & new_paths)
+    }
+
+def _get_visibility(func_name: str, signature: str) -> str:
+    """함수 시그니처에서 가시성(visibility)을 추출합니다."""
+    func_name = bare_name(func_name)
+    if func_name in ('fallback', 'receive'):
+        return 'external'
+    if func_name == 'constructor':
+        return 'constructor'
+    match = re.search(r'\b(public|external|internal|private)\b', signature)
+    # Solidity 0.5 이전에는 가시성 생략 시 public
+    return match.group(1) if match else 'public'
+
+def get_entry_reachability(graph: nx.DiGraph) -> Dict[str, List[str]]:
+    """각 함수가 어떤 진입 지점(fallback, receive, constructor, external)에서 도달 가능한지 계산합니다."""
+    entry_nodes = {entry: [] for entry in ENTRY_POINTS}
+    for node, data in graph.nodes(data=True):
+        name = bare_name(node)
+        if name in ('fallback', 'receive', 'constructor'):
+            entry_nodes[name].append(node)
+        if data.get('visibility') in ('public', 'external'):
+            entry_nodes['external'].append(node)
+
+    reachability = {node: [] for node in graph.nodes()}
+    for entry, sources in entry_nodes.items():
+        reached = set(sources)
+        for source in sources:
+            reached.update(nx.descendants(graph, source))
+        for node in reached:
+            reachability[node].append(entry)
+    return reachability
+
+def build_analysis_result(contract_address: str,
+                          graph: nx.DiGraph,
+                          dangerous_functions: List[str],
+                          analysis_date: Optional[str] = None) -> Dict:
+    """분석 결과를 저장용 딕셔너리로 변환합니다."""
+    if analysis_date is None:
+        analysis_date = datetime.now().isoformat()
+
+    reachability = get_entry_reachability(graph)
+    ruleset = get_ruleset()
+    findings = []
+    for node, data in graph.nodes(data=True):
+        for category in data.get('dangers', []):
+            findings.append({
+                'function': node,
+                'category': category,
+                # 정밀 분석(Slither) 등 외부 탐지 결과는 노드에 기록된 심각도를 우선 사용
+                'severity': data.get('severities', {}).get(category) or ruleset.severity(category),
+                'reachable_from': reachability.get(node, [])
+            })
+
+    functions = {
+        node: {
+            'hash': data.get('hash'),
+            'visibility': data.get('visibility'),
+            'dangers': data.get('dangers', []),
+            'severities': data.get('severities', {}),
+            'contract': data.get('contract', contract_of(node)),
+            'name': data.get('name', bare_name(node)),
+            'signatures': data.get('signatures', []),
+            'selectors': data.get('selectors', []),
+            'mentions': data.get('mentions')
+        }
+        for node, data in graph.nodes(data=True)
+    }
+
+    return {
+        'contract_address': contract_address,
+        'analysis_date': analysis_date,
+        'ruleset_version': graph.graph.get('ruleset_version'),
+        'type_digest': graph.graph.get('type_digest'),
+        'total_functions': len(graph.nodes()),
+        'dangerous_functions': dangerous_functions,
+        'function_calls': [list(edge) for edge in graph.edges()],
+        'findings': findings,
+        'functions': functions,
+        'contracts': graph.graph.get('contracts', {}),
+        'dependencies': graph.graph.get('dependencies', []),
+        'timings': graph.graph.get('trace'),
+        'budget_exceeded': graph.graph.get('budget_exceeded'),
+        'proxy': graph.graph.get('proxy'),
+        'graph_data': {
+            'nodes': list(graph.nodes()),
+            'edges': [list(edge) for edge in graph.edges()],
+            'edge_kinds': [kind for _, _, kind in graph.edges(data='kind', default='internal')]
+        }
+    }
+
 def create_test_contract() -> str:
     """테스트용 위험 함수가 포함된 Solidity 코드를 생성합니다."""
     return '''
@@ -211,24 +862,82 @@ contract DangerousTestContract {
 }
 '''
 
-def analyze_contract(address: str) -> Tuple[nx.DiGraph, List[str]]:
-    """컨트랙트를 분석하고 공격 흐름 다이어그램을 반환합니다."""
+def load_source_code(address: str) -> str:
+    """주소의 소스코드를 가져옵니다. 테스트용 주소(0x000...0)면 더미 컨트랙트를 반환합니다."""
+    if address.lower() == "0x0000000000000000000000000000000000000000":
+        log.info("테스트용 더미 컨트랙트 사용")
+        return create_test_contract()
+    # Etherscan에서 소스코드 가져오기
+    return get_contract_source(address)
+
+def _full_diff(previous_result: Dict, graph: nx.DiGraph) -> Dict:
+    """전체를 다시 분석한 그래프와 이전 분석 결과의 차이를 증분 분석과 같은 형식으로 반환합니다."""
+    old_graph = graph_from_result(previous_result)
+    diff = diff_graphs(old_graph, graph)
+    diff['changed_functions'] = sorted(node for node in set(old_graph) & set(graph)
+                                       if old_graph.nodes[node].get('hash') != graph.nodes[node].get('hash'))
+    diff['reanalyzed_functions'] = graph.number_of_nodes()
+    return diff
+
+def analyze_contract(address: str, previous_result: Optional[Dict] = None) -> Tuple[nx.DiGraph, List[str]]:
+    """컨트랙트를 분석하고 공격 흐름 다이어그램을 반환합니다.
+
+    같은 주소의 이전 분석 결과(previous_result)가 주어지면 변경된 함수만 다시 분석하고,
+    구조적 변경 사항을 graph.graph['diff']에 기록합니다.
+    프록시(EIP-1967 슬롯 또는 Etherscan Implementation 필드)이면 구현 컨트랙트를 함께 분석해
+    delegatecall 엣지로 연결한 하나의 그래프를 반환합니다 (매핑은 graph.graph['proxy']).
+    """
+    from utils.proxy import fetch_contract_sources, merge_implementation
+    mode = "full"
+    started = time.perf_counter()
+    ANALYSES_IN_PROGRESS.inc()
     try:
-        # 테스트용 주소인 경우 더미 데이터 사용
-        if address.lower() == "0x0000000000000000000000000000000000000000":
-            source_code = create_test_contract()
-            print("테스트용 더미 컨트랙트 사용")
-        else:
-            # Etherscan에서 소스코드 가져오기
-            source_code = get_contract_source(address)
-        
-        # Solidity 코드 분석
-        graph, dangerous_functions = analyze_solidity_code(source_code)
+        with tracer.span("analyze_contract") as root:
+            with tracer.span("fetch_source"):
+                # 프록시이면 구현 컨트랙트 소스도 함께 (동시에) 가져옴
+                source_code, proxy_mapping, implementations = fetch_contract_sources(address)
+            
+            # 예산 초과로 일부만 분석된 이전 결과와 프록시(구현 컨트랙트와 합쳐진 그래프)는 증분 분석하지 않음
+            if proxy_mapping is not None:
+                mode = "proxy"
+            elif (previous_result and previous_result.get('functions')
+                  and not previous_result.get('budget_exceeded') and not previous_result.get('proxy')):
+                mode = "incremental"
+            
+            # Solidity 코드 분석 (이전 결과에 함수 해시가 있으면 증분 분석)
+            if mode == "incremental":
+                with tracer.span("reanalyze_incremental"):
+                    graph, dangerous_functions, diff = reanalyze_incremental(source_code, previous_result)
+                graph.graph['diff'] = diff
+                graph.graph['previous_analysis_date'] = previous_result.get('analysis_date')
+                FUNCTIONS_ANALYZED.inc(diff['reanalyzed_functions'])
+            else:
+                with tracer.span("analyze_solidity_code"):
+                    graph, dangerous_functions = analyze_solidity_code(source_code)
+                if proxy_mapping is not None:
+                    with tracer.span("merge_implementation"):
+                        graph, dangerous_functions = merge_implementation(
+                            graph, dangerous_functions, proxy_mapping, implementations[proxy_mapping['implementation']])
+                    if previous_result and previous_result.get('functions'):
+                        graph.graph['diff'] = _full_diff(previous_result, graph)
+                        graph.graph['previous_analysis_date'] = previous_result.get('analysis_date')
+                FUNCTIONS_ANALYZED.inc(graph.number_of_nodes())
         
         if not graph.nodes():
             raise Exception("분석할 함수를 찾을 수 없습니다.")
         
+        if root is not None:
+            # 단계별 소요 시간 (저장되는 JSON의 timings 항목)
+            graph.graph['trace'] = root.to_dict()
+        ANALYSES.inc(mode=mode, outcome="partial" if graph.graph.get('budget_exceeded') else "ok")
+        log.info("분석 완료: %s", address, mode=mode, functions=graph.number_of_nodes(),
+                 dangerous=len(dangerous_functions), partial=bool(graph.graph.get('budget_exceeded')))
         return graph, dangerous_functions
         
     except Exception as e:
-        raise Exception(f"컨트랙트 분석 실패: {str(e)}") 
\ No newline at end of file
+        ANALYSES.inc(mode=mode, outcome="error")
+        log.warning("분석 실패: %s (%s)", address, e, mode=mode)
+        raise Exception(f"컨트랙트 분석 실패: {str(e)}")
+    finally:
+        ANALYSIS_LATENCY.observe(time.perf_counter() - started, mode=mode)
+        ANALYSES_IN_PROGRESS.dec() 
\ No newline at end of file
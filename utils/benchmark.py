@@ -0,0 +1,343 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "benchmark_fixtures")
+
+# 합성 컨트랙트 크기 (함수 수)
+ANALYZE_SIZES = [10, 100, 1000, 10000]
+# 그래프 이미지/PDF는 노드 수에 비해 매우 느리므로 작은 크기만 측정
+RENDER_SIZES = [10, 100, 500]
+FILE_SIZES = [100, 1000]
+QUICK_SIZES = [10, 100]
+# 함수 수를 고정하고 소스 형태를 한 축씩 바꿔 분석 시간을 측정 (나머지 축은 generate_contract 기본값)
+SHAPE_FUNCTIONS = 500
+QUICK_SHAPE_FUNCTIONS = 100
+BODY_SIZES = [5, 20, 50]           # 함수당 문장 수
+NESTING_DEPTHS = [1, 4, 8]         # if/for 블록 중첩 깊이
+CALL_DENSITIES = [0.0, 0.2, 0.6]   # 문장이 다른 함수 호출일 확률
+
+# 결과 JSON 기본 저장 위치 (saved_reports/에 두면 분석 결과 파일로 취급되므로 분리)
+BENCHMARK_DIR = "benchmarks"
+
+BENCHMARK_GROUPS = ["analyze", "render", "report", "files"]
+DEFAULT_THRESHOLD = 0.2  # 기준 대비 20% 이상 느려지면 회귀
+
+# 합성 함수 본문에 섞는 위험 문장 (규칙 파일의 패턴과 맞춤)
+_DANGEROUS_STATEMENTS = [
+    "(bool ok, ) = target.delegatecall(data); require(ok);",
+    "require(tx.origin == owner);",
+    "(bool sent, ) = msg.sender.call{value: amount}(\"\"); require(sent);",
+    "if (block.timestamp > deadline) { counter += 1; }",
+    "assembly { let x := sload(0) }"
+]
+
+def generate_contract(functions: int,
+                      body_size: int = 5,
+                      nesting_depth: int = 1,
+                      call_density: float = 0.2,
+                      danger_ratio: float = 0.1,
+                      contracts: int = 1,
+                      seed: int = 0) -> str:
+    """벤치마크용 합성 Solidity 소스를 생성합니다 (같은 인자와 seed면 항상 같은 소스).
+
+    functions: 전체 함수 수, body_size: 함수당 문장 수, nesting_depth: if/for 블록 중첩 깊이,
+    call_density: 문장이 다른 함수 호출일 확률, danger_ratio: 위험 문장을 포함하는 함수 비율,
+    contracts: 함수를 나눠 담을 컨트랙트 수 (앞 컨트랙트를 상속하는 사슬 구조)
+    """
+    rng = random.Random(seed)
+    contracts = max(1, min(contracts, functions))
+    per_contract = -(-functions // contracts)
+    lines = ["// SPDX-License-Identifier: MIT", "pragma solidity ^0.8.0;", ""]
+    for c in range(contracts):
+        first, last = c * per_contract, min(functions, (c + 1) * per_contract)
+        if first >= last:
+            break
+        base = f" is Synthetic{c - 1}" if c > 0 else ""
+        lines.append(f"contract Synthetic{c}{base} {{")
+        if c == 0:
+            lines += ["    address public owner;", "    address public target;", "    uint256 public counter;",
+                      "    uint256 public deadline;", "    mapping(address => uint256) public balances;", ""]
+        for i in range(first, last):
+            visibility = rng.choice(["public", "external", "internal", "private"])
+            lines.append(f"    function f{i}(uint256 amount, bytes memory data) {visibility} returns (uint256) {{")
+            statements = []
+            for _ in range(body_size):
+                if i > 0 and rng.random() < call_density:
+                    # 자기 자신 또는 상속받은 컨트랙트의 함수만 호출 (이름 해석이 가능하도록)
+                    statements.append(f"counter += f{rng.randrange(0, last)}(amount + 1, data);")
+                else:
+                    statements.append(f"balances[msg.sender] += amount * {rng.randrange(1, 100)};")
+            if rng.random() < danger_ratio:
+                statements.insert(rng.randrange(0, len(statements) + 1), rng.choice(_DANGEROUS_STATEMENTS))
+            lines += _nest(statements, nesting_depth, rng, indent=2)
+            lines += ["        return counter;", "    }", ""]
+        lines.append("}")
+        lines.append("")
+    return "\n".join(lines)
+
+def _nest(statements: List[str], depth: int, rng: random.Random, indent: int) -> List[str]:
+    """문장 목록을 지정한 깊이만큼 if/for 블록으로 감쌉니다."""
+    pad = "    " * indent
+    if depth <= 0 or not statements:
+        return [pad + statement for statement in statements]
+    split = rng.randrange(0, len(statements))
+    header = rng.choice([f"if (amount > {rng.randrange(1, 1000)}) {{", "for (uint256 i = 0; i < 3; i++) {"])
+    return ([pad + statement for statement in statements[:split]]
+            + [pad + header] + _nest(statements[split:], depth - 1, rng, indent + 1) + [pad + "}"])
+
+def load_fixtures(fixtures_dir: str = FIXTURES_DIR) -> Dict[str, str]:
+    """실제 컨트랙트 형태의 고정 소스 목록 {이름: 소스}를 반환합니다."""
+    fixtures = {}
+    if os.path.isdir(fixtures_dir):
+        for name in sorted(os.listdir(fixtures_dir)):
+            if name.endswith(".sol"):
+                with open(os.path.join(fixtures_dir, name), 'r', encoding='utf-8') as f:
+                    fixtures[os.path.splitext(name)[0]] = f.read()
+    return fixtures
+
+def time_call(func: Callable, repeat: int = 3, warmup: int = 1, setup: Optional[Callable] = None) -> Dict:
+    """함수를 여러 번 실행하여 최소/중앙값/평균 시간을 측정합니다.
+
+    setup은 매 실행 전에 호출되며 측정 시간에 포함되지 않습니다.
+    """
+    runs = []
+    for i in range(warmup + repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        if setup:
+            func(argument)
+        else:
+            func()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            runs.append(elapsed)
+    return {
+        'min': round(min(runs), 6),
+        'median': round(statistics.median(runs), 6),
+        'mean': round(statistics.fmean(runs), 6),
+        'runs': [round(run, 6) for run in runs]
+    }
+
+def _benchmark_sources(sizes: List[int], fixtures: Dict[str, str]) -> Dict[str, str]:
+    """크기별 합성 소스와 고정 소스를 {이름: 소스}로 반환합니다."""
+    sources = {f"synthetic-{size}": generate_contract(size, contracts=max(1, size // 100), seed=size)
+               for size in sizes}
+    sources.update({f"fixture-{name}": source for name, source in fixtures.items()})
+    return sources
+
+def _shape_sources(functions: int, axes: Dict[str, List]) -> Dict[str, tuple]:
+    """함수 수를 고정하고 한 축씩 바꾼 합성 소스를 {이름: (소스, 매개변수)}로 반환합니다."""
+    sources = {}
+    for axis, values in axes.items():
+        for value in values:
+            params = {'functions': functions, axis: value}
+            source = generate_contract(functions, contracts=max(1, functions // 100), seed=functions, **{axis: value})
+            sources[f"synthetic-{functions}[{axis}={value}]"] = (source, params)
+    return sources
+
+def run_benchmarks(groups: Optional[List[str]] = None,
+                   analyze_sizes: Optional[List[int]] = None,
+                   render_sizes: Optional[List[int]] = None,
+                   file_sizes: Optional[List[int]] = None,
+                   repeat: int = 3,
+                   fixtures_dir: str = FIXTURES_DIR,
+                   shape_functions: int = SHAPE_FUNCTIONS,
+                   body_sizes: Optional[List[int]] = None,
+                   nesting_depths: Optional[List[int]] = None,
+                   call_densities: Optional[List[float]] = None) -> Dict:
+    """벤치마크를 실행하고 기계가 읽을 수 있는 결과 딕셔너리를 반환합니다.
+
+    분석 그룹은 함수 수별 측정에 더해 shape_functions개 함수에서 본문 크기, 중첩 깊이, 호출 밀도를
+    한 축씩 바꿔 측정합니다 (빈 목록을 주면 해당 축은 건너뜀).
+    """
+    from utils.analyzer import analyze_solidity_code, build_analysis_result
+
+    groups = groups or BENCHMARK_GROUPS
+    analyze_sizes = ANALYZE_SIZES if analyze_sizes is None else analyze_sizes
+    render_sizes = RENDER_SIZES if render_sizes is None else render_sizes
+    file_sizes = FILE_SIZES if file_sizes is None else file_sizes
+    shape_axes = {
+        'body_size': BODY_SIZES if body_sizes is None else body_sizes,
+        'nesting_depth': NESTING_DEPTHS if nesting_depths is None else nesting_depths,
+        'call_density': CALL_DENSITIES if call_densities is None else call_densities,
+    }
+    fixtures = load_fixtures(fixtures_dir)
+    results = []
+
+    def record(group: str, name: str, params: Dict, timing: Dict):
+        results.append({'name': f"{group}:{name}", 'group': group, 'params': params, **timing})
+        print(f"{group}:{name:<32} median {timing['median'] * 1000:10.2f} ms  (min {timing['min'] * 1000:.2f} ms)")
+
+    graphs = {}
+    def analyzed(name: str, source: str):
+        """렌더링/보고서/파일 벤치마크에서 같은 소스의 분석 결과를 재사용합니다."""
+        if name not in graphs:
+            graphs[name] = analyze_solidity_code(source)
+        return graphs[name]
+
+    if "analyze" in groups:
+        for name, source in _benchmark_sources(analyze_sizes, fixtures).items():
+            timing = time_call(lambda: analyze_solidity_code(source), repeat=repeat)
+            record("analyze", name, {'source_bytes': len(source)}, timing)
+        for name, (source, params) in _shape_sources(shape_functions, shape_axes).items():
+            timing = time_call(lambda: analyze_solidity_code(source), repeat=repeat)
+            record("analyze", name, {**params, 'source_bytes': len(source)}, timing)
+
+    if "render" in groups:
+        from utils.report_generator import create_graph_image
+        for name, source in _benchmark_sources(render_sizes, fixtures).items():
+            graph, dangerous = analyzed(name, source)
+            timing = time_call(lambda: create_graph_image(graph, dangerous), repeat=repeat)
+            record("render", name, {'nodes': graph.number_of_nodes(), 'edges': graph.number_of_edges()}, timing)
+
+    if "report" in groups:
+        from utils.report_generator import SecurityReportGenerator
+        for name, source in _benchmark_sources(render_sizes, fixtures).items():
+            graph, dangerous = analyzed(name, source)
+            timing = time_call(lambda generator: generator.generate_report("0xbench", graph, dangerous),
+                               repeat=repeat, setup=SecurityReportGenerator)
+            record("report", name, {'nodes': graph.number_of_nodes()}, timing)
+
+    if "files" in groups:
+        from utils.file_manager import FileManager
+        save_dir = tempfile.mkdtemp(prefix="eth-lens-bench-")
+        try:
+            file_manager = FileManager(save_dir)
+            for size in file_sizes:
+                name = f"synthetic-{size}"
+                graph, dangerous = analyzed(name, generate_contract(size, contracts=max(1, size // 100), seed=size))
+                result = build_analysis_result("0xbench", graph, dangerous)
+                addresses = (f"0x{size:08x}{i:032x}" for i in range(10 ** 9))
+                # 주소가 다르면 파일 이름이 겹치지 않으므로 매 실행이 새 파일 저장 + 색인 추가가 됨
+                timing = time_call(lambda address: file_manager.save_json_report(
+                    address, {**result, 'contract_address': address}),
+                    repeat=repeat, setup=lambda: next(addresses))
+                record("files", f"save_json_report[{name}]", {'functions': size}, timing)
+            timing = time_call(lambda: file_manager.get_latest_analysis(f"0x{file_sizes[0]:08x}{0:032x}"), repeat=repeat)
+            record("files", "get_latest_analysis", {'files': len(file_manager.get_saved_files())}, timing)
+            timing = time_call(file_manager.get_saved_files, repeat=repeat)
+            record("files", "get_saved_files", {'files': len(file_manager.get_saved_files())}, timing)
+            timing = time_call(file_manager.rebuild_findings_index, repeat=repeat)
+            record("files", "rebuild_findings_index", {'files': len(file_manager.get_saved_files())}, timing)
+        finally:
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+    return {
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'benchmarks': results
+    }
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """현재 결과와 기준 결과의 중앙값을 비교합니다.
+
+    상태는 regression(기준 대비 threshold 이상 느림), improved(threshold 이상 빠름),
+    ok, new(기준에 없음), missing(현재 결과에 없음) 중 하나입니다.
+    """
+    baseline_by_name = {b['name']: b for b in baseline.get('benchmarks', [])}
+    current_names = set()
+    comparison = []
+    for bench in current.get('benchmarks', []):
+        current_names.add(bench['name'])
+        base = baseline_by_name.get(bench['name'])
+        if base is None:
+            comparison.append({'name': bench['name'], 'baseline': None, 'current': bench['median'],
+                               'ratio': None, 'status': 'new'})
+            continue
+        ratio = bench['median'] / base['median'] if base['median'] else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        comparison.append({'name': bench['name'], 'baseline': base['median'], 'current': bench['median'],
+                           'ratio': round(ratio, 3), 'status': status})
+    for name, base in baseline_by_name.items():
+        if name not in current_names:
+            comparison.append({'name': name, 'baseline': base['median'], 'current': None,
+                               'ratio': None, 'status': 'missing'})
+    return comparison
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(",") if size.strip()]
+
+def _parse_ratios(value: str) -> List[float]:
+    return [float(ratio) for ratio in value.split(",") if ratio.strip()]
+
+def main(argv: List[str] = None) -> int:
+    """벤치마크를 실행하고 결과 저장 및 기준 비교를 수행합니다."""
+    parser = argparse.ArgumentParser(description="ETH Anomaly Lens 성능 벤치마크")
+    parser.add_argument("--out", default=None,
+                        help=f"결과 JSON 경로 (기본값: {BENCHMARK_DIR}/benchmark_<시각>.json)")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"회귀로 판단할 중앙값 증가 비율 (기본값: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--repeat", type=int, default=3, help="벤치마크당 측정 횟수 (기본값: 3)")
+    parser.add_argument("--groups", default=",".join(BENCHMARK_GROUPS),
+                        help=f"실행할 그룹 (쉼표 구분: {', '.join(BENCHMARK_GROUPS)})")
+    parser.add_argument("--sizes", type=_parse_sizes, default=None,
+                        help="분석 벤치마크의 합성 함수 수 (쉼표 구분, 기본값: 10,100,1000,10000)")
+    parser.add_argument("--shape-functions", type=int, default=None,
+                        help=f"형태별 분석 벤치마크의 함수 수 (기본값: {SHAPE_FUNCTIONS})")
+    parser.add_argument("--body-sizes", type=_parse_sizes, default=None,
+                        help=f"함수당 문장 수 (쉼표 구분, 빈 값이면 건너뜀, 기본값: {','.join(map(str, BODY_SIZES))})")
+    parser.add_argument("--nesting-depths", type=_parse_sizes, default=None,
+                        help=f"블록 중첩 깊이 (쉼표 구분, 기본값: {','.join(map(str, NESTING_DEPTHS))})")
+    parser.add_argument("--call-densities", type=_parse_ratios, default=None,
+                        help=f"함수 호출 문장 비율 (쉼표 구분, 기본값: {','.join(map(str, CALL_DENSITIES))})")
+    parser.add_argument("--quick", action="store_true", help="작은 크기만 측정 (개발 중 빠른 확인용)")
+    args = parser.parse_args(argv)
+
+    groups = [group.strip() for group in args.groups.split(",") if group.strip()]
+    unknown = [group for group in groups if group not in BENCHMARK_GROUPS]
+    if unknown:
+        parser.error(f"알 수 없는 그룹: {', '.join(unknown)}")
+
+    results = run_benchmarks(
+        groups=groups,
+        analyze_sizes=args.sizes or (QUICK_SIZES if args.quick else None),
+        render_sizes=QUICK_SIZES if args.quick else None,
+        file_sizes=QUICK_SIZES if args.quick else None,
+        repeat=args.repeat,
+        shape_functions=args.shape_functions or (QUICK_SHAPE_FUNCTIONS if args.quick else SHAPE_FUNCTIONS),
+        body_sizes=args.body_sizes,
+        nesting_depths=args.nesting_depths,
+        call_densities=args.call_densities
+    )
+
+    out_path = args.out or os.path.join(BENCHMARK_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    out_dir = os.path.dirname(out_path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"결과 저장: {out_path}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    comparison = compare_results(results, baseline, args.threshold)
+    for row in comparison:
+        ratio = f"x{row['ratio']:.2f}" if row['ratio'] is not None else "-"
+        print(f"{row['status']:<10} {row['name']:<48} {ratio}")
+    regressions = [row for row in comparison if row['status'] == 'regression']
+    print(f"회귀 {len(regressions)}개 (기준 대비 {args.threshold:.0%} 초과)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import threading
+from typing import Dict, List
+
+class CacheStats:
+    """캐시별 호출 수와 미스(실제 계산) 수를 프로세스 전체에서 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def record_call(self, name: str):
+        """캐시된 함수가 호출되었음을 기록합니다."""
+        with self._lock:
+            self._calls[name] = self._calls.get(name, 0) + 1
+
+    def record_miss(self, name: str):
+        """캐시에 값이 없어 실제로 계산했음을 기록합니다."""
+        with self._lock:
+            self._misses[name] = self._misses.get(name, 0) + 1
+
+    def snapshot(self) -> List[Dict]:
+        """캐시별 호출/적중/미스 통계를 반환합니다."""
+        with self._lock:
+            stats = []
+            for name in sorted(self._calls):
+                calls = self._calls[name]
+                misses = min(self._misses.get(name, 0), calls)
+                stats.append({
+                    'cache': name,
+                    'calls': calls,
+                    'hits': calls - misses,
+                    'misses': misses,
+                    'hit_ratio': round((calls - misses) / calls, 3) if calls else 0.0
+                })
+            return stats
+
+    def reset(self):
+        """집계된 통계를 초기화합니다."""
+        with self._lock:
+            self._calls.clear()
+            self._misses.clear()
+
+# Streamlit은 app.py를 매 rerun마다 다시 실행하므로, 통계는 임포트된 모듈에 보관합니다
+cache_stats = CacheStats()
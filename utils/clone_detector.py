@@ -0,0 +1,257 @@
+import os
+import re
+import json
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from utils.log import get_logger
+from utils.guards import blank_comments
+
+log = get_logger(__name__)
+
+DEFAULT_EXPLOITS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "known_exploits.json")
+
+# MinHash/LSH 설정: 16개 밴드 × 8행이면 자카드 유사도 약 0.7 부근에서 후보 확률이 급격히 올라감
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 5           # 토큰 n-gram 크기
+MIN_SHINGLES = 8           # 이보다 짧은 함수는 유사도가 의미 없으므로 색인/조회하지 않음
+DEFAULT_THRESHOLD = 0.7    # 보고할 최소 추정 유사도
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# 모든 프로세스에서 같은 서명이 나오도록 고정 시드 사용
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+# 문자열 리터럴 (닫히지 않은 문자열은 줄 끝까지로 보아 어떤 위치에서도 실패하지 않으므로 선형 시간)
+_STRING_PATTERN = re.compile(r'"(?:\\[\s\S]?|[^"\\\n])*(?:"|$)|\'(?:\\[\s\S]?|[^\'\\\n])*(?:\'|$)', re.MULTILINE)
+_TOKEN_PATTERN = re.compile(r'[A-Za-z_$][\w$]*|\d[\w.]*|==|!=|<=|>=|&&|\|\||\+\+|--|[^\s\w]')
+
+# 정규화 시 그대로 남기는 단어 (키워드, 전역 변수, 위험 동작과 관련된 멤버)
+KEPT_WORDS = {
+    "function", "constructor", "fallback", "receive", "modifier", "returns", "return", "if", "else",
+    "for", "while", "do", "break", "continue", "throw", "revert", "require", "assert", "emit",
+    "public", "external", "internal", "private", "view", "pure", "payable", "memory", "storage",
+    "calldata", "unchecked", "assembly", "new", "delete", "true", "false",
+    "msg", "tx", "block", "this", "super", "abi", "type",
+    "sender", "value", "data", "origin", "gas", "timestamp", "number", "balance", "length",
+    "call", "delegatecall", "staticcall", "callcode", "send", "transfer", "selfdestruct", "suicide",
+    "encode", "encodePacked", "encodeWithSelector", "encodeWithSignature", "keccak256", "sha3", "ecrecover",
+    "address", "bool", "string", "bytes", "bytes4", "bytes32", "uint", "uint256", "int", "int256", "mapping"
+}
+
+def normalize_tokens(body: str) -> List[str]:
+    """함수 본문을 주석, 문자열, 식별자 이름, 숫자 값에 무관한 토큰 목록으로 정규화합니다."""
+    body = _STRING_PATTERN.sub(' "s" ', blank_comments(body, keep_layout=False))
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(body):
+        if token in KEPT_WORDS:
+            tokens.append(token)
+        elif token[0].isdigit():
+            tokens.append("0")
+        elif token[0].isalpha() or token[0] in "_$":
+            tokens.append("v")
+        else:
+            tokens.append(token)
+    return tokens
+
+def shingle_hashes(body: str) -> np.ndarray:
+    """정규화된 토큰 n-gram의 32비트 해시 배열을 반환합니다 (중복 제거)."""
+    tokens = normalize_tokens(body)
+    shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(max(len(tokens) - SHINGLE_SIZE + 1, 0))}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+def minhash_signature(body: str) -> Optional[np.ndarray]:
+    """함수 본문의 MinHash 서명(uint32 배열)을 계산합니다. 너무 짧은 본문은 None을 반환합니다."""
+    hashes = shingle_hashes(body)
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    # (a·x + b) mod p 를 순열 수만큼 한 번에 계산 (a, b, x < 2^32 이므로 uint64 범위 안)
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % np.uint64(_MERSENNE_PRIME)
+    return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+def estimate_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """두 MinHash 서명의 추정 자카드 유사도를 반환합니다."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+def band_buckets(signature: np.ndarray) -> List[Tuple[int, int]]:
+    """서명을 밴드로 나누어 (밴드 번호, 버킷 키) 목록을 반환합니다."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        chunk = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        bucket = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'little', signed=True)
+        buckets.append((band, bucket))
+    return buckets
+
+class CloneDetector:
+    """함수 본문의 MinHash 서명을 디스크(SQLite)의 LSH 색인에 저장하고 유사 함수를 찾습니다.
+
+    조회는 서명의 밴드별 버킷으로 후보만 가져온 뒤 서명을 비교하므로, 색인된 함수 수와 무관하게
+    같은 버킷에 들어간 함수만 확인합니다. 알려진 취약 코드(data/known_exploits.json)는
+    kind='exploit'으로, 분석한 컨트랙트의 함수는 kind='indexed'로 저장됩니다.
+    """
+
+    def __init__(self, db_path: str, exploits_path: str = DEFAULT_EXPLOITS_PATH):
+        self.db_path = db_path
+        self.exploits_path = exploits_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+        self.sync_known_exploits()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS functions ("
+                "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, contract TEXT, function TEXT, "
+                "label TEXT, signature BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "band INTEGER NOT NULL, bucket INTEGER NOT NULL, function_id INTEGER NOT NULL, "
+                "PRIMARY KEY (band, bucket, function_id)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS functions_contract ON functions (kind, contract)")
+
+    def sync_known_exploits(self) -> int:
+        """알려진 취약 코드 파일이 바뀌었으면 색인의 취약 코드 항목을 다시 만들고 등록 수를 반환합니다."""
+        if not os.path.exists(self.exploits_path):
+            return 0
+        with open(self.exploits_path, 'rb') as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'exploits_version'").fetchone()
+        if row and row[0] == version:
+            return 0
+
+        exploits = json.loads(raw.decode('utf-8'))['exploits']
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM buckets WHERE function_id IN (SELECT id FROM functions WHERE kind = 'exploit')")
+            self._conn.execute("DELETE FROM functions WHERE kind = 'exploit'")
+            for exploit in exploits:
+                signature = minhash_signature(exploit['code'])
+                if signature is None:
+                    log.warning("알려진 취약 코드가 너무 짧아 건너뜀: %s", exploit['id'])
+                    continue
+                label = json.dumps({k: exploit.get(k) for k in ('id', 'incident', 'category', 'description')},
+                                   ensure_ascii=False)
+                self._insert('exploit', None, exploit['id'], label, signature)
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('exploits_version', ?)", (version,))
+        log.info("알려진 취약 코드 색인 갱신: %d개 (%s)", len(exploits), version)
+        return len(exploits)
+
+    def _insert(self, kind: str, contract: Optional[str], function: str, label: Optional[str],
+                signature: np.ndarray):
+        cursor = self._conn.execute(
+            "INSERT INTO functions (kind, contract, function, label, signature) VALUES (?, ?, ?, ?, ?)",
+            (kind, contract, function, label, signature.tobytes())
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+            [(band, bucket, cursor.lastrowid) for band, bucket in band_buckets(signature)]
+        )
+
+    def index_signatures(self, contract: str, signatures: Iterable[Tuple[str, np.ndarray]]) -> int:
+        """컨트랙트 함수들의 (함수명, 서명)으로 색인의 해당 컨트랙트 항목을 교체하고 추가된 수를 반환합니다.
+
+        같은 컨트랙트를 다시 색인해도 (재분석, 코퍼스 재실행 등) 이전 항목이 중복으로 남지 않습니다.
+        """
+        count = 0
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM buckets WHERE function_id IN "
+                "(SELECT id FROM functions WHERE kind = 'indexed' AND contract = ?)", (contract,))
+            self._conn.execute("DELETE FROM functions WHERE kind = 'indexed' AND contract = ?", (contract,))
+            for function, signature in signatures:
+                self._insert('indexed', contract, function, None, signature)
+                count += 1
+        return count
+
+    def index_source(self, contract: str, source_code: str) -> int:
+        """소스코드의 모든 함수를 색인에 추가합니다."""
+        return self.index_signatures(contract, function_signatures(source_code))
+
+    def find_similar(self, signature: np.ndarray,
+                     threshold: float = DEFAULT_THRESHOLD,
+                     kinds: Iterable[str] = ('exploit',),
+                     limit: Optional[int] = 20) -> List[Dict]:
+        """서명과 비슷한 색인 함수를 추정 유사도순으로 반환합니다."""
+        buckets = band_buckets(signature)
+        kinds = list(kinds)
+        where = " OR ".join(["(b.band = ? AND b.bucket = ?)"] * len(buckets))
+        params = [value for pair in buckets for value in pair] + kinds
+        query = (
+            "SELECT DISTINCT f.id, f.kind, f.contract, f.function, f.label, f.signature "
+            f"FROM buckets b JOIN functions f ON f.id = b.function_id WHERE ({where}) "
+            f"AND f.kind IN ({', '.join('?' * len(kinds))})"
+        )
+        with self._lock:
+            candidates = self._conn.execute(query, params).fetchall()
+
+        matches = []
+        seen = set()
+        for _, kind, contract, function, label, blob in candidates:
+            similarity = estimate_similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            # 같은 함수의 같은 서명은 한 번만 보고 (이전 버전이 중복으로 색인한 항목 포함)
+            key = (kind, contract, function, blob)
+            if similarity >= threshold and key not in seen:
+                seen.add(key)
+                match = {'kind': kind, 'contract': contract, 'function': function,
+                         'similarity': round(similarity, 3)}
+                if label:
+                    match.update(json.loads(label))
+                matches.append(match)
+        matches.sort(key=lambda m: -m['similarity'])
+        return matches[:limit] if limit is not None else matches
+
+    def scan_source(self, source_code: str,
+                    threshold: float = DEFAULT_THRESHOLD,
+                    kinds: Iterable[str] = ('exploit',)) -> Dict[str, List[Dict]]:
+        """소스코드의 각 함수와 비슷한 알려진 취약 코드를 {함수명: [일치 목록]}으로 반환합니다."""
+        results = {}
+        for function, signature in function_signatures(source_code):
+            matches = self.find_similar(signature, threshold=threshold, kinds=kinds)
+            if matches:
+                results.setdefault(function, []).extend(matches)
+        return results
+
+    def find_clones_of(self, exploit_id: str, threshold: float = DEFAULT_THRESHOLD,
+                       limit: Optional[int] = 100) -> List[Dict]:
+        """알려진 취약 코드 하나와 비슷한 색인된 컨트랙트 함수를 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT signature FROM functions WHERE kind = 'exploit' AND function = ?", (exploit_id,)
+            ).fetchone()
+        if row is None:
+            raise Exception(f"알려진 취약 코드를 찾을 수 없습니다: {exploit_id}")
+        return self.find_similar(np.frombuffer(row[0], dtype=np.uint32), threshold=threshold,
+                                 kinds=('indexed',), limit=limit)
+
+    def get_stats(self) -> Dict:
+        """색인 통계를 반환합니다."""
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT kind, COUNT(*) FROM functions GROUP BY kind").fetchall())
+        return {'exploits': rows.get('exploit', 0), 'indexed_functions': rows.get('indexed', 0)}
+
+    def close(self):
+        self._conn.close()
+
+def function_signatures(source_code: str) -> List[Tuple[str, np.ndarray]]:
+    """소스코드에서 추출한 함수별 (함수명, MinHash 서명) 목록을 반환합니다 (짧은 함수 제외)."""
+    from utils.analyzer import extract_functions
+    signatures = []
+    for func_name, func_sig, func_body in extract_functions(source_code):
+        # 알려진 취약 코드와 같이 시그니처(매개변수 형식, 가시성)까지 포함해 비교
+        signature = minhash_signature(func_sig + func_body[1:])
+        if signature is not None:
+            signatures.append((func_name, signature))
+    return signatures
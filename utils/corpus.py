@@ -0,0 +1,260 @@
+import os
+import re
+import sys
+import json
+import mmap
+import codecs
+import time
+import hashlib
+import tarfile
+import argparse
+import multiprocessing
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+ADDRESS_PATTERN = re.compile(r'0x[0-9a-fA-F]{40}')
+SOURCE_EXTENSIONS = ('.sol',)
+
+# 작업 단위: (종류, 파일 경로, 표시 이름, 시작 오프셋, 크기)
+# 종류가 "file"이면 파일 전체, "tar"이면 비압축 tar 안의 구간, "bytes"이면 미리 읽은 내용입니다.
+SourceJob = Tuple[str, str, str, int, int]
+
+def iter_source_jobs(path: str) -> Iterator[SourceJob]:
+    """디렉토리 또는 tar 아카이브에서 Solidity 소스 작업 목록을 생성합니다."""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(SOURCE_EXTENSIONS):
+                    file_path = os.path.join(root, name)
+                    yield ("file", file_path, os.path.relpath(file_path, path), 0, os.path.getsize(file_path))
+    elif tarfile.is_tarfile(path):
+        try:
+            # 비압축 tar는 멤버 데이터가 연속 구간이므로 아카이브 자체를 mmap해서 읽을 수 있음
+            with tarfile.open(path, mode='r:') as archive:
+                for member in archive:
+                    if member.isfile() and member.name.endswith(SOURCE_EXTENSIONS):
+                        yield ("tar", path, member.name, member.offset_data, member.size)
+        except tarfile.ReadError:
+            # 압축된 tar는 매핑할 수 없으므로 멤버 내용을 읽어서 전달
+            with tarfile.open(path, mode='r:*') as archive:
+                for member in archive:
+                    if member.isfile() and member.name.endswith(SOURCE_EXTENSIONS):
+                        data = archive.extractfile(member).read()
+                        yield ("bytes", data, member.name, 0, len(data))
+    else:
+        raise Exception(f"디렉토리나 tar 아카이브가 아닙니다: {path}")
+
+def _read_job(job: SourceJob) -> Tuple[str, Optional[str]]:
+    """작업의 소스 해시와 소스 문자열을 반환합니다. 이미 분석한 해시면 소스 대신 None을 반환합니다."""
+    kind, location, name, offset, size = job
+    if kind == "bytes":
+        source_hash = hashlib.sha256(location).hexdigest()
+        return source_hash, None if source_hash in _known_hashes else codecs.decode(location, 'utf-8', 'replace')
+    if size == 0:
+        return hashlib.sha256(b"").hexdigest(), ""
+    with open(location, 'rb') as f:
+        # 파일 내용을 바이트로 복사하지 않고 페이지 캐시를 그대로 매핑
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            view = memoryview(mapped)[offset:offset + size]
+            try:
+                source_hash = hashlib.sha256(view).hexdigest()
+                if source_hash in _known_hashes:
+                    return source_hash, None
+                # 분석기는 문자열을 다루므로 매핑된 구간에서 바로 디코딩
+                return source_hash, codecs.decode(view, 'utf-8', 'replace')
+            finally:
+                view.release()
+        finally:
+            mapped.close()
+
+# 워커 프로세스별 상태 (initializer에서 설정)
+_known_hashes: Set[str] = set()
+_index_clones = False
+_profile_dir: Optional[str] = None
+
+def _init_worker(known_hashes: Set[str], index_clones: bool = False, memory_mb: Optional[float] = None,
+                 profile_dir: Optional[str] = None):
+    """워커 프로세스를 초기화합니다. memory_mb를 주면 워커의 주소 공간을 제한합니다."""
+    global _known_hashes, _index_clones, _profile_dir
+    _known_hashes = known_hashes
+    _index_clones = index_clones
+    _profile_dir = profile_dir
+    if memory_mb:
+        from utils.guards import limit_process_memory
+        limit_process_memory(memory_mb)
+
+def _analyze_job(job: SourceJob) -> Dict:
+    """워커에서 소스 하나를 분석합니다."""
+    from utils.analyzer import analyze_solidity_code, build_analysis_result
+    from utils.profiling import ProfileCapture, PROFILE_FILE_PREFIX
+    name = job[2]
+    started = time.perf_counter()
+    try:
+        source_hash, source_code = _read_job(job)
+        if source_code is None:
+            return {'status': 'skipped', 'source_path': name, 'source_hash': source_hash}
+        capture = ProfileCapture("analysis", enabled=_profile_dir is not None)
+        with capture:
+            graph, dangerous_functions = analyze_solidity_code(source_code)
+        address_match = ADDRESS_PATTERN.search(name)
+        result = build_analysis_result(
+            contract_address=address_match.group(0).lower() if address_match else name,
+            graph=graph,
+            dangerous_functions=dangerous_functions
+        )
+        result.update({
+            'status': 'analyzed',
+            'source_path': name,
+            'source_hash': source_hash,
+            'elapsed_seconds': round(time.perf_counter() - started, 4)
+        })
+        if capture.enabled:
+            # 소스 해시로 파일명을 만들어 경로 문자나 중복 이름 문제를 피함
+            result['profile_files'] = capture.save(
+                _profile_dir, f"{PROFILE_FILE_PREFIX}{source_hash[:16]}_{capture.stage}")
+        if _index_clones:
+            # MinHash 계산은 워커에서, 색인 쓰기는 메인 프로세스에서 수행 (결과 파일에는 기록하지 않음)
+            from utils.clone_detector import function_signatures
+            result['_clone_signatures'] = function_signatures(source_code)
+        return result
+    except MemoryError:
+        # 워커 메모리 상한(--memory-mb)을 넘은 소스 (분석 예산으로 막지 못한 경우)
+        return {'status': 'error', 'source_path': name, 'error': "워커 메모리 상한 초과"}
+    except Exception as e:
+        return {'status': 'error', 'source_path': name, 'error': str(e)}
+
+def load_analyzed_hashes(results_path: str, ruleset_version: Optional[str] = None) -> Set[str]:
+    """기존 결과 파일(JSONL)에서 이미 분석된 소스 해시를 읽어옵니다.
+
+    ruleset_version을 주면 같은 규칙 세트로 분석된 결과만 건너뛸 대상으로 봅니다.
+    """
+    hashes = set()
+    if os.path.exists(results_path):
+        with open(results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 중단된 실행의 마지막 줄
+                if ruleset_version is not None and record.get('ruleset_version') != ruleset_version:
+                    continue  # 규칙이 바뀌었으므로 다시 분석
+                if record.get('status') == 'analyzed' and record.get('source_hash'):
+                    hashes.add(record['source_hash'])
+    return hashes
+
+def analyze_corpus(path: str,
+                   results_path: str,
+                   workers: Optional[int] = None,
+                   findings_index=None,
+                   index_batch_size: int = 1000,
+                   chunksize: int = 16,
+                   clone_detector=None,
+                   selector_index=None,
+                   dependency_index=None,
+                   memory_mb: Optional[float] = None,
+                   profile_dir: Optional[str] = None) -> Dict:
+    """로컬 소스 코퍼스를 병렬로 분석하고 결과를 JSONL 파일에 한 줄씩 추가합니다.
+
+    이미 결과 파일에 현재 규칙 세트로 분석된 소스 해시는 건너뛰므로 중단된 실행을 이어서 할 수 있습니다.
+    findings_index(FindingsIndex)를 주면 발견 사항을 배치 단위로 색인합니다.
+    selector_index(SelectorIndex)를 주면 함수 시그니처와 선택자를, dependency_index(DependencyIndex)를 주면
+    컨트랙트 간 의존 관계를 배치 단위로 추가합니다.
+    clone_detector(CloneDetector)를 주면 모든 함수의 MinHash 서명을 유사 코드 색인에 추가합니다.
+    분석 예산(ETH_LENS_ANALYSIS_TIMEOUT/ETH_LENS_ANALYSIS_MEMORY_MB)을 넘은 소스는 부분 결과로 기록되어
+    stats['partial']에 집계되며, memory_mb를 주면 워커 프로세스의 메모리도 강제로 제한합니다.
+    profile_dir을 주면 소스마다 분석을 cProfile/tracemalloc으로 측정해 그 디렉토리에 저장합니다 (디버그용).
+    """
+    from utils.rules import get_ruleset
+    known_hashes = load_analyzed_hashes(results_path, get_ruleset().version)
+    stats = {'analyzed': 0, 'skipped': 0, 'duplicate': 0, 'error': 0, 'findings': 0, 'partial': 0}
+    index_batch = []
+    started = time.perf_counter()
+
+    with multiprocessing.Pool(workers or os.cpu_count(), initializer=_init_worker,
+                              initargs=(known_hashes, clone_detector is not None, memory_mb, profile_dir)) as pool, \
+            open(results_path, 'a', encoding='utf-8') as out:
+        for record in pool.imap_unordered(_analyze_job, iter_source_jobs(path), chunksize=chunksize):
+            status = record['status']
+            if status == 'analyzed' and record['source_hash'] in known_hashes:
+                # 같은 실행 안에서 동일 내용이 여러 워커에 동시에 분배된 경우
+                status = 'duplicate'
+            stats[status] += 1
+            if status != 'analyzed':
+                if status == 'error':
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                continue
+
+            known_hashes.add(record['source_hash'])
+            clone_signatures = record.pop('_clone_signatures', None)
+            if clone_detector is not None and clone_signatures:
+                stats['clone_functions'] = stats.get('clone_functions', 0) + clone_detector.index_signatures(
+                    record['contract_address'], clone_signatures)
+            stats['findings'] += len(record['findings'])
+            if record.get('budget_exceeded'):
+                stats['partial'] += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+            if findings_index is not None or selector_index is not None or dependency_index is not None:
+                index_batch.append((record['source_path'], record))
+                if len(index_batch) >= index_batch_size:
+                    _flush_index_batch(index_batch, findings_index, selector_index, dependency_index)
+                    index_batch = []
+
+    if index_batch:
+        _flush_index_batch(index_batch, findings_index, selector_index, dependency_index)
+
+    stats['elapsed_seconds'] = round(time.perf_counter() - started, 2)
+    return stats
+
+def _flush_index_batch(index_batch: List[Tuple[str, Dict]], findings_index, selector_index, dependency_index):
+    """모아 둔 분석 결과를 발견 사항, 선택자, 의존성 색인에 한 번에 추가합니다."""
+    if findings_index is not None:
+        findings_index.add_analyses(index_batch)
+    if dependency_index is not None:
+        dependency_index.add_analyses(record for _, record in index_batch)
+    if selector_index is not None:
+        entries = [(selector, signature)
+                   for _, record in index_batch
+                   for info in record.get('functions', {}).values()
+                   for selector, signature in zip(info.get('selectors', []), info.get('signatures', []))]
+        selector_index.add(entries)
+
+def main(argv: List[str] = None) -> int:
+    """명령행에서 오프라인 코퍼스 분석을 실행합니다."""
+    parser = argparse.ArgumentParser(description="ETH Anomaly Lens 오프라인 코퍼스 분석")
+    parser.add_argument("path", help=".sol 파일이 있는 디렉토리 또는 tar 아카이브")
+    parser.add_argument("--out", default=None, help="결과 JSONL 경로 (기본값: saved_reports/corpus_<이름>.jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--index", action="store_true", help="발견 사항을 saved_reports 색인에 추가")
+    parser.add_argument("--clones", action="store_true", help="함수 MinHash 서명을 유사 코드 색인에 추가")
+    parser.add_argument("--memory-mb", type=float, default=None, help="워커 프로세스당 메모리 상한 (MB, 기본값: 제한 없음)")
+    parser.add_argument("--profile", action="store_true",
+                        help="소스마다 분석을 프로파일링해 saved_reports에 저장 (디버그용, 느려짐)")
+    args = parser.parse_args(argv)
+
+    from utils.file_manager import FileManager
+    file_manager = FileManager()
+    results_path = args.out or os.path.join(
+        file_manager.save_dir, f"corpus_{os.path.basename(os.path.normpath(args.path))}.jsonl")
+
+    log.info("코퍼스 분석 시작: %s → %s", args.path, results_path, workers=args.workers)
+    stats = analyze_corpus(
+        args.path, results_path,
+        workers=args.workers,
+        findings_index=file_manager.findings_index if args.index else None,
+        selector_index=file_manager.selector_index if args.index else None,
+        dependency_index=file_manager.dependency_index if args.index else None,
+        clone_detector=file_manager.clone_detector if args.clones else None,
+        memory_mb=args.memory_mb,
+        profile_dir=file_manager.save_dir if args.profile else None
+    )
+    print(json.dumps(stats, ensure_ascii=False))
+    return 1 if stats['error'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import hashlib
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+from utils.metrics import registry
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 정밀 분석 설정 (환경 변수로 변경 가능)
+DEEP_ANALYSIS_ENABLED = os.getenv("ETH_LENS_DEEP_ANALYSIS", "0") == "1"
+DEEP_ANALYSIS_TIMEOUT = float(os.getenv("ETH_LENS_DEEP_TIMEOUT", "180"))        # 작업당 제한 시간 (초)
+DEEP_ANALYSIS_MEMORY_MB = int(os.getenv("ETH_LENS_DEEP_MEMORY_MB", "2048"))     # 작업당 메모리 상한
+DEEP_ANALYSIS_WORKERS = int(os.getenv("ETH_LENS_DEEP_WORKERS", "2"))            # 동시에 실행할 작업 수
+
+# 영향도 → 심각도 (Optimization은 보안 발견 사항이 아니므로 제외)
+IMPACT_SEVERITY = {
+    "High": "high",
+    "Medium": "medium",
+    "Low": "low",
+    "Informational": "low"
+}
+
+# 정밀 분석 작업 지표
+DEEP_JOBS = registry.gauge("eth_lens_deep_analysis_jobs", "정밀 분석 작업 수 (대기/실행 중)", ["state"])
+DEEP_RESULTS = registry.counter("eth_lens_deep_analysis_results_total", "정밀 분석 작업 결과 수 (상태별)", ["status"])
+DEEP_LATENCY = registry.histogram("eth_lens_deep_analysis_seconds", "정밀 분석 작업 실행 시간",
+                                  buckets=(1, 5, 10, 30, 60, 120, 300, 600))
+
+# 캐시해도 되는 최종 상태 (실패, 시간 초과, 도구 없음은 환경 문제일 수 있으므로 다시 시도)
+CACHEABLE_STATUSES = ("completed",)
+
+def source_hash(source_code: str) -> str:
+    """소스코드의 내용 해시를 반환합니다."""
+    return hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+
+def _limit_resources(memory_bytes: int, cpu_seconds: int):
+    """자식 프로세스의 주소 공간과 CPU 시간을 제한하는 preexec 함수를 반환합니다."""
+    def apply():
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    return apply
+
+def run_sandboxed(command: List[str], cwd: str, timeout: float, memory_mb: int) -> Dict:
+    """명령을 별도 프로세스 그룹에서 시간/메모리 제한과 함께 실행합니다.
+
+    시간이 초과되면 solc 같은 하위 프로세스까지 프로세스 그룹 전체를 종료합니다.
+    """
+    env = {key: os.environ[key] for key in ("PATH", "HOME", "LANG", "SOLC_VERSION", "VIRTUAL_ENV") if key in os.environ}
+    preexec = _limit_resources(memory_mb * 1024 * 1024, int(timeout) + 5) if sys.platform != "win32" else None
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=cwd, env=env,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        preexec_fn=preexec, start_new_session=True
+    )
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        stdout, stderr = process.communicate()
+        timed_out = True
+    return {
+        'returncode': process.returncode,
+        'stdout': stdout.decode('utf-8', 'replace'),
+        'stderr': stderr.decode('utf-8', 'replace'),
+        'timed_out': timed_out,
+        'elapsed_seconds': round(time.perf_counter() - started, 2)
+    }
+
+def parse_slither_output(output: str) -> List[Dict]:
+    """Slither JSON 출력의 탐지 결과를 발견 사항 목록으로 변환합니다.
+
+    각 발견 사항의 function은 분석기 노드와 같은 "컨트랙트.함수" 형식이며,
+    특정 함수에 속하지 않는 결과(컨트랙트 수준)는 None입니다.
+    """
+    data = json.loads(output)
+    if not data.get('success', False):
+        raise Exception(data.get('error') or "Slither 분석이 실패했습니다.")
+    findings = []
+    for detector in (data.get('results') or {}).get('detectors', []):
+        severity = IMPACT_SEVERITY.get(detector.get('impact'))
+        if severity is None:
+            continue
+        functions = []
+        for element in detector.get('elements', []):
+            function = _element_function(element)
+            if function and function not in functions:
+                functions.append(function)
+        for function in functions or [None]:
+            findings.append({
+                'function': function,
+                'category': f"slither:{detector.get('check')}",
+                'severity': severity,
+                'confidence': detector.get('confidence'),
+                'description': detector.get('description', '').strip()
+            })
+    return findings
+
+def _element_function(element: Dict) -> Optional[str]:
+    """탐지 요소가 속한 함수의 "컨트랙트.함수" 이름을 반환합니다."""
+    parent = element.get('type_specific_fields', {}).get('parent', {})
+    if element.get('type') == 'function':
+        name, contract = element.get('name'), parent.get('name') if parent.get('type') == 'contract' else None
+    elif parent.get('type') == 'function':
+        # 문장(node) 요소는 부모 함수, 그 부모 컨트랙트 순으로 거슬러 올라감
+        grandparent = parent.get('type_specific_fields', {}).get('parent', {})
+        name, contract = parent.get('name'), grandparent.get('name')
+    else:
+        return None
+    if name in ('slitherConstructorVariables', 'slitherConstructorConstantVariables'):
+        return None
+    return f"{contract}.{name}" if contract else name
+
+def merge_deep_findings(graph, deep_result: Dict):
+    """정밀 분석 발견 사항을 빠른 분석 그래프(networkx.DiGraph)의 노드 위험 유형에 합친 새 그래프를 반환합니다."""
+    merged = graph.copy()
+    for node in merged.nodes():
+        # 노드 속성의 리스트/딕셔너리는 원본 그래프(캐시된 결과)와 공유되지 않도록 복사
+        merged.nodes[node]['dangers'] = list(merged.nodes[node].get('dangers', []))
+        merged.nodes[node]['severities'] = dict(merged.nodes[node].get('severities', {}))
+    unmapped = []
+    for finding in deep_result.get('findings', []):
+        node = finding['function']
+        if node in merged:
+            data = merged.nodes[node]
+            if finding['category'] not in data['dangers']:
+                data['dangers'].append(finding['category'])
+            data['severities'][finding['category']] = finding['severity']
+        else:
+            unmapped.append(finding)
+    merged.graph['deep_analysis'] = {
+        'status': deep_result.get('status'),
+        'tool': deep_result.get('tool'),
+        'source_hash': deep_result.get('source_hash'),
+        'unmapped_findings': unmapped
+    }
+    return merged
+
+class DeepAnalysisEngine:
+    """Slither 정밀 분석을 격리된 프로세스에서 비동기로 실행하고 결과를 (소스, 도구 버전)별로 캐시합니다.
+
+    submit()은 즉시 반환하며, 같은 소스에 대한 작업이 진행 중이면 그 작업을 공유합니다.
+    완료된 결과와 입력 자체가 원인인 실패(다중 파일 소스)만 캐시하므로, 도구나 solc를 설치/업그레이드하면
+    이전 실패 결과에 묶이지 않고 다시 분석합니다.
+    """
+
+    def __init__(self, cache_dir: str,
+                 command: Optional[List[str]] = None,
+                 max_workers: int = DEEP_ANALYSIS_WORKERS,
+                 timeout: float = DEEP_ANALYSIS_TIMEOUT,
+                 memory_mb: int = DEEP_ANALYSIS_MEMORY_MB):
+        self.cache_dir = cache_dir
+        self.command = command or ["slither"]
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deep-analysis")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Future] = {}
+        self._tool_version = (None, "")  # (실행 파일 경로와 수정 시각, 버전 문자열)
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def is_available(self) -> bool:
+        """분석 도구 실행 파일이 설치되어 있는지 확인합니다."""
+        return shutil.which(self.command[0]) is not None
+
+    def tool_version(self) -> str:
+        """분석 도구의 버전을 반환합니다 (실행 파일이 바뀔 때만 다시 확인, 설치되어 있지 않으면 빈 문자열)."""
+        path = shutil.which(self.command[0])
+        try:
+            stamp = (path, os.stat(path).st_mtime_ns) if path else None
+        except OSError:
+            stamp = None
+        with self._lock:
+            if self._tool_version[0] == stamp:
+                return self._tool_version[1]
+        version = ""
+        if stamp is not None:
+            try:
+                run = subprocess.run(self.command + ["--version"], stdin=subprocess.DEVNULL,
+                                     capture_output=True, timeout=60)
+                version = run.stdout.decode('utf-8', 'replace').strip()
+            except (OSError, subprocess.SubprocessError) as e:
+                log.warning("정밀 분석 도구 버전 확인 실패: %s", e)
+        with self._lock:
+            self._tool_version = (stamp, version)
+        return version
+
+    def cache_key(self, source_code: str) -> str:
+        """소스 해시, 도구와 버전, solc 버전 설정으로 작업/캐시 키를 만듭니다."""
+        identity = "\n".join([source_hash(source_code), ' '.join(self.command), self.tool_version(),
+                              os.getenv("SOLC_VERSION", "")])
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get_cached(self, key: str) -> Optional[Dict]:
+        """캐시된 정밀 분석 결과를 반환합니다."""
+        path = self._cache_path(key)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return None
+        return None
+
+    def submit(self, source_code: str) -> str:
+        """정밀 분석 작업을 등록하고 작업 키를 반환합니다."""
+        key = self.cache_key(source_code)
+        if self.get_cached(key) is not None:
+            return key
+        with self._lock:
+            # 디스크 캐시에 저장된 완료 작업과 예외로 끝난 작업은 목록에서 정리 (예외로 끝난 작업은 다시 실행)
+            self._jobs = {k: j for k, j in self._jobs.items()
+                          if not (j.done() and (j.exception() is not None
+                                                or j.result()['status'] in CACHEABLE_STATUSES))}
+            job = self._jobs.get(key)
+            if job is None or (job.done() and job.result().get('status') not in CACHEABLE_STATUSES):
+                DEEP_JOBS.inc(state="queued")
+                self._jobs[key] = self._executor.submit(self._run, key, source_code)
+        return key
+
+    def status(self, key: str) -> str:
+        """작업 상태를 반환합니다 (queued, running, completed, failed, timeout, unavailable, unknown)."""
+        cached = self.get_cached(key)
+        if cached is not None:
+            return cached['status']
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None:
+            return "unknown"
+        if job.done():
+            return self._finished_result(key, job)['status']
+        return "running" if job.running() else "queued"
+
+    def result(self, key: str, wait: Optional[float] = 0) -> Optional[Dict]:
+        """완료된 작업 결과를 반환합니다. wait 초만큼 기다려도 끝나지 않았으면 None을 반환합니다."""
+        cached = self.get_cached(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None:
+            return None
+        try:
+            job.exception(timeout=wait)
+        except FutureTimeoutError:
+            return None
+        return self._finished_result(key, job)
+
+    @staticmethod
+    def _finished_result(key: str, job) -> Dict:
+        """끝난 작업의 결과를 반환합니다. 작업이 예외로 끝났으면 실패 결과로 바꿔 반환합니다."""
+        error = job.exception()
+        if error is not None:
+            return {'status': 'failed', 'source_hash': key, 'error': str(error), 'findings': []}
+        return job.result()
+
+    def _run(self, key: str, source_code: str) -> Dict:
+        """작업 하나를 실행하고 결과 상태를 지표에 기록합니다 (작업 스레드에서 호출)."""
+        DEEP_JOBS.dec(state="queued")
+        DEEP_JOBS.inc(state="running")
+        try:
+            with DEEP_LATENCY.time():
+                result = self._execute(key, source_code)
+        finally:
+            DEEP_JOBS.dec(state="running")
+        DEEP_RESULTS.inc(status=result['status'])
+        return result
+
+    def _execute(self, key: str, source_code: str) -> Dict:
+        """도구를 실행하여 결과를 만들고 캐시합니다."""
+        result = {'source_hash': source_hash(source_code), 'tool': ' '.join(self.command),
+                  'tool_version': self.tool_version(), 'findings': []}
+        if not self.is_available():
+            result.update(status='unavailable', error=f"{self.command[0]} 실행 파일을 찾을 수 없습니다.")
+            return result
+        if source_code.lstrip().startswith('{'):
+            # 입력 형식 때문에 항상 같은 결과가 나오는 실패이므로 캐시
+            result.update(status='failed', error="다중 파일(JSON) 소스는 정밀 분석을 지원하지 않습니다.")
+            self._store_quietly(key, result)
+            return result
+
+        with tempfile.TemporaryDirectory(prefix="eth-lens-deep-") as work_dir:
+            with open(os.path.join(work_dir, "Contract.sol"), 'w', encoding='utf-8') as f:
+                f.write(source_code)
+            log.info("정밀 분석 시작: %s", key[:12])
+            try:
+                run = run_sandboxed(
+                    self.command + ["Contract.sol", "--json", "-", "--disable-color", "--exclude-optimization"],
+                    cwd=work_dir, timeout=self.timeout, memory_mb=self.memory_mb
+                )
+            except OSError as e:
+                result.update(status='failed', error=f"정밀 분석 프로세스를 시작할 수 없습니다: {e}")
+                return result
+        result['elapsed_seconds'] = run['elapsed_seconds']
+        if run['timed_out']:
+            result.update(status='timeout', error=f"제한 시간({self.timeout:.0f}초)을 초과했습니다.")
+        else:
+            try:
+                result.update(status='completed', findings=parse_slither_output(run['stdout']))
+            except Exception as e:
+                # 메모리 상한 초과나 컴파일 실패 등으로 JSON 결과가 없는 경우
+                detail = run['stderr'].strip().splitlines()[-1:] or [str(e)]
+                result.update(status='failed', error=f"{e} ({detail[0][:300]})")
+        log.info("정밀 분석 종료: %s", key[:12], status=result['status'], seconds=run['elapsed_seconds'])
+        if result['status'] in CACHEABLE_STATUSES:
+            self._store_quietly(key, result)
+        return result
+
+    def _store_quietly(self, key: str, result: Dict):
+        """결과를 캐시에 저장합니다. 저장에 실패해도 분석 결과는 그대로 돌려주도록 로그만 남깁니다."""
+        try:
+            self._store(key, result)
+        except Exception as e:
+            log.warning("정밀 분석 결과를 캐시에 저장하지 못했습니다: %s (%s)", key[:12], e)
+
+    def _store(self, key: str, result: Dict):
+        """결과를 캐시 파일에 원자적으로 저장합니다."""
+        path = self._cache_path(key)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
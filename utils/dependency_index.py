@@ -0,0 +1,167 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 의존 관계 종류
+DEPENDENCY_KINDS = ["inherits", "uses", "library", "delegatecall", "external"]
+
+class DependencyIndex:
+    """모든 분석 결과의 컨트랙트 간 의존 관계를 디스크(SQLite)에 누적하는 전역 의존성 그래프.
+
+    분석 결과를 저장할 때마다 해당 주소의 의존 관계만 교체하므로 전체를 다시 만들 필요가 없고,
+    "이 라이브러리로 delegatecall하는 컨트랙트" 같은 질의는 대상 이름 색인으로 바로 조회합니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS contracts ("
+                "address TEXT NOT NULL, contract TEXT NOT NULL, kind TEXT, bases TEXT, analyzed_at TEXT, "
+                "PRIMARY KEY (address, contract))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dependencies ("
+                "address TEXT NOT NULL, source TEXT, target TEXT NOT NULL, kind TEXT NOT NULL, "
+                "function TEXT, target_function TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS dependencies_target ON dependencies (target, kind)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS dependencies_address ON dependencies (address)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS contracts_name ON contracts (contract)")
+
+    def add_analysis(self, analysis_result: Dict) -> int:
+        """분석 결과 하나의 의존 관계로 해당 주소의 항목을 교체하고 추가된 의존 관계 수를 반환합니다."""
+        return self.add_analyses([analysis_result])
+
+    def add_analyses(self, analysis_results: Iterable[Dict]) -> int:
+        """여러 분석 결과를 하나의 트랜잭션으로 반영합니다."""
+        added = 0
+        with self._lock, self._conn:
+            for analysis_result in analysis_results:
+                address = analysis_result.get('contract_address', '').lower()
+                analyzed_at = analysis_result.get('analysis_date')
+                row = self._conn.execute(
+                    "SELECT MAX(analyzed_at) FROM contracts WHERE address = ?", (address,)).fetchone()
+                if row[0] and analyzed_at and row[0] > analyzed_at:
+                    continue  # 더 최신 분석이 이미 반영됨
+                self._conn.execute("DELETE FROM contracts WHERE address = ?", (address,))
+                self._conn.execute("DELETE FROM dependencies WHERE address = ?", (address,))
+                self._conn.executemany(
+                    "INSERT INTO contracts VALUES (?, ?, ?, ?, ?)",
+                    [(address, name, info.get('kind'), json.dumps(info.get('bases', [])), analyzed_at)
+                     for name, info in analysis_result.get('contracts', {}).items()]
+                )
+                dependencies = analysis_result.get('dependencies', [])
+                self._conn.executemany(
+                    "INSERT INTO dependencies VALUES (?, ?, ?, ?, ?, ?)",
+                    [(address, d.get('source'), d['target'], d['kind'], d.get('function'), d.get('target_function'))
+                     for d in dependencies]
+                )
+                added += len(dependencies)
+        return added
+
+    def remove_address(self, address: str) -> int:
+        """분석 주소의 컨트랙트와 의존 관계를 색인에서 지우고 지운 의존 관계 수를 반환합니다."""
+        address = address.lower()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM contracts WHERE address = ?", (address,))
+            return self._conn.execute("DELETE FROM dependencies WHERE address = ?", (address,)).rowcount
+
+    def dependents(self, target: str, kinds: Optional[Iterable[str]] = None,
+                   target_function: Optional[str] = None, limit: Optional[int] = 1000) -> List[Dict]:
+        """대상 컨트랙트/라이브러리(이름)에 의존하는 분석된 컨트랙트를 반환합니다."""
+        query = "SELECT address, source, target, kind, function, target_function FROM dependencies WHERE target = ?"
+        params: List = [target]
+        kinds = list(kinds or [])
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        if target_function:
+            query += " AND target_function = ?"
+            params.append(target_function)
+        query += " ORDER BY address, source"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._rows(query, params)
+
+    def dependencies(self, address: str) -> List[Dict]:
+        """분석된 주소의 모든 의존 관계를 반환합니다."""
+        return self._rows(
+            "SELECT address, source, target, kind, function, target_function FROM dependencies "
+            "WHERE address = ? ORDER BY source", [address.lower()]
+        )
+
+    def defined_in(self, contract: str) -> List[str]:
+        """해당 이름의 컨트랙트/라이브러리를 소스에 포함한 분석 주소 목록을 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT address FROM contracts WHERE contract = ? ORDER BY address", (contract,)).fetchall()
+        return [row[0] for row in rows]
+
+    def _rows(self, query: str, params: List) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{'address': r[0], 'source': r[1], 'target': r[2], 'kind': r[3],
+                 'function': r[4], 'target_function': r[5]} for r in rows]
+
+    def to_graph(self, kinds: Optional[Iterable[str]] = None):
+        """컨트랙트 단위 전역 의존성 그래프(networkx.DiGraph)를 생성합니다.
+
+        분석된 컨트랙트 노드는 "주소:이름", 의존 대상은 같은 주소에 정의되어 있으면 "주소:이름",
+        아니면 이름만 사용합니다 (여러 컨트랙트가 공유하는 라이브러리/인터페이스).
+        """
+        import networkx as nx
+        graph = nx.DiGraph()
+        with self._lock:
+            contracts = self._conn.execute("SELECT address, contract, kind FROM contracts").fetchall()
+            dependencies = self._conn.execute(
+                "SELECT DISTINCT address, source, target, kind FROM dependencies").fetchall()
+        defined = set()
+        for address, contract, kind in contracts:
+            graph.add_node(f"{address}:{contract}", address=address, contract=contract, kind=kind)
+            defined.add((address, contract))
+        kinds = set(kinds) if kinds else None
+        for address, source, target, kind in dependencies:
+            if kinds and kind not in kinds:
+                continue
+            target_node = f"{address}:{target}" if (address, target) in defined else target
+            if target_node not in graph:
+                graph.add_node(target_node, address=None, contract=target, kind=None)
+            graph.add_edge(f"{address}:{source}", target_node, kind=kind)
+        return graph
+
+    def get_stats(self) -> Dict:
+        """색인 통계를 반환합니다."""
+        with self._lock:
+            contracts = self._conn.execute("SELECT COUNT(DISTINCT address) FROM contracts").fetchone()[0]
+            dependencies = self._conn.execute("SELECT COUNT(*) FROM dependencies").fetchone()[0]
+        return {'analyzed_addresses': contracts, 'dependencies': dependencies}
+
+    def rebuild(self, report_paths: Iterable[str]) -> int:
+        """색인을 비우고 저장된 JSON 분석 결과로부터 다시 생성합니다."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM contracts")
+            self._conn.execute("DELETE FROM dependencies")
+        total = 0
+        for path in report_paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    analysis_result = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning("의존성 색인 재생성 중 파일 건너뜀: %s (%s)", path, e)
+                continue
+            total += self.add_analysis(analysis_result)
+        return total
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,277 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+from typing import BinaryIO, Dict, List
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+EXPORT_FORMAT_NAME = "eth-lens-analysis"
+EXPORT_FORMAT_VERSION = 1
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_PROPERTIES_KEY = "ethLens"
+
+# 그래프를 이루는 키 (형식마다 따로 기록) — 나머지 키는 메타데이터로 그대로 기록
+_GRAPH_KEYS = ('functions', 'function_calls', 'graph_data')
+# MessagePack에서 함수 정보는 키 이름을 반복하지 않도록 이 순서의 배열로 기록
+FUNCTION_FIELDS = ('hash', 'visibility', 'dangers', 'severities', 'contract', 'name', 'signatures', 'selectors', 'mentions')
+# 심각도 → SARIF 결과 수준
+SARIF_LEVELS = {'critical': "error", 'high': "error", 'medium': "warning", 'low': "note"}
+
+def _metadata(analysis_result: Dict) -> Dict:
+    return {key: value for key, value in analysis_result.items() if key not in _GRAPH_KEYS}
+
+def _edges(analysis_result: Dict):
+    """(호출 함수, 피호출 함수, 종류)를 차례로 반환합니다."""
+    graph_data = analysis_result.get('graph_data', {})
+    edges = graph_data.get('edges', analysis_result.get('function_calls', []))
+    edge_kinds = graph_data.get('edge_kinds') or ['internal'] * len(edges)
+    for edge, kind in zip(edges, edge_kinds):
+        yield edge[0], edge[1], kind
+
+def _assemble(metadata: Dict, nodes: List[str], functions: Dict, edges: List[List[str]], edge_kinds: List[str]) -> Dict:
+    """형식별로 읽은 조각을 build_analysis_result와 같은 분석 결과로 합칩니다."""
+    analysis_result = dict(metadata)
+    analysis_result['function_calls'] = edges
+    analysis_result['functions'] = functions
+    analysis_result['graph_data'] = {'nodes': nodes, 'edges': [list(edge) for edge in edges], 'edge_kinds': edge_kinds}
+    return analysis_result
+
+class _BufferedWriter:
+    """작은 조각을 모아 한 번에 기록합니다 (조각마다 write를 호출하지 않도록)."""
+
+    def __init__(self, stream: BinaryIO, flush_size: int = 1 << 16):
+        self.stream = stream
+        self.flush_size = flush_size
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.stream.write("".join(self._parts).encode('utf-8'))
+            self._parts, self._size = [], 0
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def _write_json_value(writer: _BufferedWriter, value, depth: int):
+    """바깥쪽 depth 단계의 딕셔너리와 그 안의 리스트(노드·엣지 목록 등)는 원소별로, 나머지는 한 번에 직렬화해 기록합니다."""
+    if depth > 0 and isinstance(value, dict):
+        writer.write("{")
+        for i, (key, item) in enumerate(value.items()):
+            writer.write(("," if i else "") + _dumps(str(key)) + ":")
+            _write_json_value(writer, item, depth - 1)
+        writer.write("}")
+    elif depth >= 0 and isinstance(value, list):
+        writer.write("[")
+        for i, item in enumerate(value):
+            if i:
+                writer.write(",")
+            _write_json_value(writer, item, depth - 1)
+        writer.write("]")
+    else:
+        writer.write(_dumps(value))
+
+def write_json(analysis_result: Dict, stream: BinaryIO):
+    """분석 결과를 공백 없는 JSON으로 기록합니다 (노드·엣지·함수 단위로 나눠 기록)."""
+    writer = _BufferedWriter(stream)
+    _write_json_value(writer, analysis_result, depth=2)
+    writer.flush()
+
+def write_msgpack(analysis_result: Dict, stream: BinaryIO):
+    """분석 결과를 MessagePack으로 기록합니다.
+
+    function_calls와 graph_data의 중복을 없애고, 엣지는 노드 번호와 종류 번호로, 함수 정보는
+    FUNCTION_FIELDS 순서의 배열로 기록합니다. 노드·엣지는 하나씩 기록하므로 전체 문서를 메모리에 만들지 않습니다.
+    """
+    import msgpack
+    packer = msgpack.Packer(use_bin_type=True)
+    nodes = analysis_result.get('graph_data', {}).get('nodes') or list(analysis_result.get('functions', {}))
+    functions = analysis_result.get('functions', {})
+    metadata = _metadata(analysis_result)
+    edge_count = len(analysis_result.get('graph_data', {}).get('edges', analysis_result.get('function_calls', [])))
+
+    stream.write(packer.pack_map_header(len(metadata) + 5))
+    stream.write(packer.pack("format"))
+    stream.write(packer.pack({'name': EXPORT_FORMAT_NAME, 'version': EXPORT_FORMAT_VERSION,
+                              'function_fields': list(FUNCTION_FIELDS)}))
+    for key, value in metadata.items():
+        stream.write(packer.pack(key))
+        stream.write(packer.pack(value))
+
+    stream.write(packer.pack("nodes"))
+    stream.write(packer.pack_array_header(len(nodes)))
+    for node in nodes:
+        stream.write(packer.pack(node))
+    stream.write(packer.pack("functions"))
+    stream.write(packer.pack_array_header(len(nodes)))
+    for node in nodes:
+        info = functions.get(node, {})
+        stream.write(packer.pack([info.get(field) for field in FUNCTION_FIELDS]))
+
+    node_ids = {node: i for i, node in enumerate(nodes)}
+    kind_ids: Dict[str, int] = {}
+    stream.write(packer.pack("edges"))
+    stream.write(packer.pack_array_header(edge_count))
+    for source, target, kind in _edges(analysis_result):
+        stream.write(packer.pack([node_ids[source], node_ids[target], kind_ids.setdefault(kind, len(kind_ids))]))
+    stream.write(packer.pack("edge_kinds"))
+    stream.write(packer.pack(list(kind_ids)))
+
+def _read_msgpack(stream: BinaryIO) -> Dict:
+    import msgpack
+    document = msgpack.unpack(stream, raw=False, strict_map_key=False)
+    header = document.pop('format', {})
+    if header.get('name') != EXPORT_FORMAT_NAME:
+        raise Exception("ETH Lens 분석 결과 MessagePack 파일이 아닙니다.")
+    if header.get('version', 0) > EXPORT_FORMAT_VERSION:
+        raise Exception(f"지원하지 않는 MessagePack 형식 버전입니다: {header.get('version')}")
+    fields = header.get('function_fields', FUNCTION_FIELDS)
+    nodes = document.pop('nodes', [])
+    functions = {node: dict(zip(fields, values)) for node, values in zip(nodes, document.pop('functions', []))}
+    kinds = document.pop('edge_kinds', [])
+    packed_edges = document.pop('edges', [])
+    edges = [[nodes[source], nodes[target]] for source, target, _ in packed_edges]
+    return _assemble(document, nodes, functions, edges, [kinds[kind] for _, _, kind in packed_edges])
+
+def _fingerprint(contract_address: str, finding: Dict) -> str:
+    """같은 발견 사항이 분석을 반복해도 같은 값을 갖도록 주소/함수/유형으로 지문을 만듭니다."""
+    key = f"{(contract_address or '').lower()}|{finding['function']}|{finding['category']}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+def write_sarif(analysis_result: Dict, stream: BinaryIO):
+    """분석 결과를 SARIF 2.1.0으로 기록합니다 (코드 스캐닝 도구용).
+
+    발견 사항은 results에, 함수 호출 그래프는 run.graphs에, 나머지 분석 정보는 run.properties에 기록하므로
+    load_analysis로 다시 읽을 수 있습니다. 결과·노드·엣지는 하나씩 기록해 전체 문서를 메모리에 만들지 않습니다.
+    소스 위치 정보가 없으므로 위치는 함수 이름(logicalLocations)으로만 표시합니다.
+    """
+    from utils.rules import get_ruleset
+
+    ruleset = get_ruleset()
+    descriptions = {rule['category']: rule.get('description') for rule in ruleset.rules}
+    findings = analysis_result.get('findings', [])
+    categories = list(dict.fromkeys(finding['category'] for finding in findings))
+    rule_ids = {category: i for i, category in enumerate(categories)}
+    rules = [{'id': category,
+              'shortDescription': {'text': descriptions.get(category) or category},
+              'defaultConfiguration': {'level': SARIF_LEVELS.get(ruleset.severity(category), "warning")},
+              'properties': {'severity': ruleset.severity(category)}}
+             for category in categories]
+    driver = {'name': "ETH Anomaly Lens", 'rules': rules}
+    if analysis_result.get('ruleset_version'):
+        driver['version'] = analysis_result['ruleset_version']
+    metadata = {key: value for key, value in _metadata(analysis_result).items() if key != 'findings'}
+    contract_address = analysis_result.get('contract_address')
+    writer = _BufferedWriter(stream)
+    write, dumps = writer.write, _dumps
+
+    write(f'{{"$schema":{dumps(SARIF_SCHEMA)},"version":"2.1.0","runs":[{{')
+    write(f'"tool":{{"driver":{dumps(driver)}}},')
+    write(f'"properties":{{{dumps(SARIF_PROPERTIES_KEY)}:{dumps(metadata)}}},')
+    write('"results":[')
+    for i, finding in enumerate(findings):
+        function = finding['function']
+        result = {
+            'ruleId': finding['category'],
+            'ruleIndex': rule_ids[finding['category']],
+            'level': SARIF_LEVELS.get(finding.get('severity'), "warning"),
+            'message': {'text': f"{function}: {finding['category']} ({finding.get('severity')})"},
+            'locations': [{'logicalLocations': [{'fullyQualifiedName': function, 'kind': "function"}]}],
+            'partialFingerprints': {'ethLensFinding/v1': _fingerprint(contract_address, finding)},
+            'properties': {key: value for key, value in finding.items() if key not in ('function', 'category')},
+        }
+        write(("," if i else "") + dumps(result))
+    write('],"graphs":[{"description":{"text":"function call graph"},"nodes":[')
+    functions = analysis_result.get('functions', {})
+    nodes = analysis_result.get('graph_data', {}).get('nodes') or list(functions)
+    for i, node in enumerate(nodes):
+        write(("," if i else "") + dumps({'id': node, 'label': {'text': node}, 'properties': functions.get(node, {})}))
+    write('],"edges":[')
+    for i, (source, target, kind) in enumerate(_edges(analysis_result)):
+        write(("," if i else "") + dumps({'id': str(i), 'sourceNodeId': source, 'targetNodeId': target,
+                                         'label': {'text': kind}}))
+    write(']}]}]}')
+    writer.flush()
+
+def _read_sarif(document: Dict) -> Dict:
+    runs = document.get('runs') or [{}]
+    run = runs[0]
+    metadata = dict(run.get('properties', {}).get(SARIF_PROPERTIES_KEY, {}))
+    metadata['findings'] = [
+        {'function': result['locations'][0]['logicalLocations'][0]['fullyQualifiedName'],
+         'category': result['ruleId'], **result.get('properties', {})}
+        for result in run.get('results', [])
+    ]
+    graph = (run.get('graphs') or [{}])[0]
+    nodes = [node['id'] for node in graph.get('nodes', [])]
+    functions = {node['id']: node.get('properties', {}) for node in graph.get('nodes', [])}
+    edges = [[edge['sourceNodeId'], edge['targetNodeId']] for edge in graph.get('edges', [])]
+    edge_kinds = [edge.get('label', {}).get('text', 'internal') for edge in graph.get('edges', [])]
+    return _assemble(metadata, nodes, functions, edges, edge_kinds)
+
+# 형식 이름 → (파일 확장자, 기록 함수)
+EXPORT_FORMATS = {
+    'json': ('.json', write_json),
+    'msgpack': ('.msgpack', write_msgpack),
+    'sarif': ('.sarif', write_sarif),
+}
+
+def export_analysis(analysis_result: Dict, path: str, export_format: str):
+    """분석 결과를 지정한 형식의 파일로 기록합니다."""
+    if export_format not in EXPORT_FORMATS:
+        raise Exception(f"지원하지 않는 내보내기 형식입니다: {export_format} (지원: {', '.join(EXPORT_FORMATS)})")
+    with open(path, 'wb') as f:
+        EXPORT_FORMATS[export_format][1](analysis_result, f)
+
+def load_analysis(path: str) -> Dict:
+    """JSON, MessagePack, SARIF 중 어떤 형식으로 저장된 분석 결과든 읽어 분석 결과 딕셔너리로 반환합니다."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'rb') as f:
+        if extension == EXPORT_FORMATS['msgpack'][0]:
+            return _read_msgpack(f)
+        if extension not in (EXPORT_FORMATS['json'][0], EXPORT_FORMATS['sarif'][0]):
+            # 확장자로 알 수 없으면 내용으로 판단 (다른 도구가 만든 JSON/SARIF는 BOM이나 공백으로 시작할 수 있음)
+            head = f.read(64)
+            f.seek(0)
+            if not head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'{'):
+                return _read_msgpack(f)
+        document = json.load(f)  # 바이트 입력이므로 UTF-8 BOM은 json이 처리
+    if 'runs' in document and 'version' in document:
+        return _read_sarif(document)
+    return document
+
+def main(argv: List[str] = None) -> int:
+    """저장된 분석 결과를 다른 형식으로 변환합니다."""
+    parser = argparse.ArgumentParser(description="ETH Anomaly Lens 분석 결과 형식 변환")
+    parser.add_argument("inputs", nargs="+", help="분석 결과 파일 (JSON, MessagePack, SARIF)")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="sarif", help="변환할 형식 (기본값: sarif)")
+    parser.add_argument("--out-dir", default=None, help="출력 디렉터리 (기본값: 입력 파일과 같은 위치)")
+    args = parser.parse_args(argv)
+
+    extension = EXPORT_FORMATS[args.format][0]
+    failed = 0
+    for path in args.inputs:
+        out_path = os.path.join(args.out_dir or os.path.dirname(path), os.path.splitext(os.path.basename(path))[0] + extension)
+        if os.path.abspath(out_path) == os.path.abspath(path):
+            log.warning("입력과 출력 파일이 같아 건너뜁니다: %s", path)
+            continue
+        try:
+            export_analysis(load_analysis(path), out_path, args.format)
+        except Exception as e:
+            failed += 1
+            log.error("변환 실패: %s (%s)", path, e)
+            continue
+        print(json.dumps({'input': path, 'output': out_path, 'bytes': os.path.getsize(out_path)}))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
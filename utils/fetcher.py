@@ -0,0 +1,258 @@
+import os
+import time
+import threading
+import requests
+from collections import OrderedDict
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from utils.metrics import registry
+from utils.log import get_logger, redact
+
+# .env 파일에서 환경변수 로드
+load_dotenv()
+ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY")
+ETHERSCAN_API_URL = "https://api.etherscan.io/api"
+# 프로세스 전체의 Etherscan 호출 한도 (초당 호출 수, 0이면 제한 없음; 무료 API 키는 초당 5회)
+ETHERSCAN_RATE_LIMIT = float(os.getenv("ETH_LENS_ETHERSCAN_RATE", "5"))
+# 응답 캐시에 보관하는 최대 컨트랙트 수 (항목마다 전체 소스코드를 들고 있으므로 제한)
+ETHERSCAN_CACHE_SIZE = int(os.getenv("ETH_LENS_ETHERSCAN_CACHE_SIZE", "1024"))
+
+# Etherscan 호출 지표
+ETHERSCAN_REQUESTS = registry.counter(
+    "eth_lens_etherscan_requests_total", "Etherscan API 호출 수 (결과별)", ["outcome"])
+ETHERSCAN_LATENCY = registry.histogram(
+    "eth_lens_etherscan_request_seconds", "Etherscan API 응답 시간")
+ETHERSCAN_LOOKUPS = registry.counter(
+    "eth_lens_etherscan_lookups_total", "컨트랙트 조회 수 (캐시 적중/요청 병합/API 호출)", ["source"])
+ETHERSCAN_THROTTLE_SECONDS = registry.counter(
+    "eth_lens_etherscan_throttle_seconds_total", "호출 한도 때문에 Etherscan 호출을 기다린 시간 합계")
+ETHERSCAN_CACHE_EVICTIONS = registry.counter(
+    "eth_lens_etherscan_cache_evictions_total", "Etherscan 응답 캐시에서 제거된 항목 수 (이유별)", ["reason"])
+
+log = get_logger(__name__)
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷. 여러 스레드가 하나의 호출 한도를 나눠 씁니다."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 기다리고 기다린 시간(초)을 반환합니다."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class _InFlightCall:
+    """진행 중인 요청 하나를 나타내며, 같은 주소를 기다리는 스레드들이 결과를 공유합니다."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[Exception] = None
+
+class EtherscanFetcher:
+    """Etherscan `getsourcecode` 호출을 한 곳에서 처리합니다.
+
+    같은 주소에 대한 동시 요청은 하나의 API 호출로 합쳐지고(single-flight),
+    완료된 결과는 짧은 시간 동안 캐시되어 메타데이터 조회와 분석이 같은 응답을 공유합니다.
+    캐시는 최대 max_entries개를 보관하는 LRU이며, 새 항목을 넣을 때 오래된 항목과 만료된 항목을 제거합니다.
+    """
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 api_url: str = ETHERSCAN_API_URL,
+                 cache_ttl: float = 300.0,
+                 timeout: float = 10.0,
+                 rate_limit: float = ETHERSCAN_RATE_LIMIT,
+                 max_entries: int = ETHERSCAN_CACHE_SIZE):
+        self.api_key = api_key if api_key is not None else ETHERSCAN_API_KEY
+        self.api_url = api_url
+        self.cache_ttl = cache_ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate_limit)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlightCall] = {}
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # 주소 → (저장 시각, 응답), 오래 쓰지 않은 순
+
+    def fetch_contract(self, address: str, refresh: bool = False) -> Dict:
+        """컨트랙트 메타데이터와 소스코드를 함께 반환합니다.
+
+        refresh가 True면 캐시를 건너뛰고 새로 조회합니다 (결과는 다시 캐시되므로 이어지는 분석은 API를 호출하지 않음).
+        """
+        if not self.api_key:
+            raise Exception("ETHERSCAN_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+
+        # 주소 형식 검증
+        if not address.startswith('0x') or len(address) != 42:
+            raise Exception("올바른 이더리움 주소 형식이 아닙니다. (0x로 시작하는 42자리 주소)")
+
+        key = address.lower()
+        with self._lock:
+            cached = None if refresh else self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                self._cache.move_to_end(key)
+                ETHERSCAN_LOOKUPS.inc(source="cache")
+                return cached[1]
+
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._inflight[key] = call
+        ETHERSCAN_LOOKUPS.inc(source="api" if is_leader else "coalesced")
+
+        if not is_leader:
+            # 다른 스레드가 이미 요청 중이면 그 결과를 기다립니다
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._request_contract(address)
+            with self._lock:
+                self._store(key, call.result)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def _store(self, key: str, result: Dict):
+        """응답을 캐시에 넣고 용량을 넘거나 만료된 항목을 오래 쓰지 않은 것부터 제거합니다 (잠금 안에서 호출)."""
+        now = time.monotonic()
+        self._cache[key] = (now, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > 1:
+            oldest_key, (stored_at, _) = next(iter(self._cache.items()))
+            if len(self._cache) > self.max_entries:
+                reason = "capacity"
+            elif now - stored_at >= self.cache_ttl:
+                reason = "expired"
+            else:
+                break
+            del self._cache[oldest_key]
+            ETHERSCAN_CACHE_EVICTIONS.inc(reason=reason)
+
+    def _call_api(self, params: Dict, address: str) -> Dict:
+        """호출 한도 안에서 Etherscan API를 호출하고 응답 JSON을 반환합니다."""
+        params = {**params, "apikey": self.api_key}
+        waited = self.rate_limiter.acquire()
+        if waited:
+            ETHERSCAN_THROTTLE_SECONDS.inc(waited)
+        started = time.perf_counter()
+        try:
+            response = requests.get(self.api_url, params=params, timeout=self.timeout)
+            data = response.json()
+        except requests.exceptions.Timeout:
+            ETHERSCAN_REQUESTS.inc(outcome="timeout")
+            log.warning("Etherscan 요청 시간 초과: %s", address, timeout=self.timeout)
+            raise Exception("API 요청 시간 초과. 잠시 후 다시 시도해주세요.")
+        except requests.exceptions.RequestException as e:
+            ETHERSCAN_REQUESTS.inc(outcome="network_error")
+            log.warning("Etherscan 네트워크 오류: %s (%s)", address, e)
+            # 요청 예외 메시지에는 apikey가 포함된 URL이 들어 있으므로 화면에 보이기 전에 가림
+            raise Exception(f"네트워크 오류: {redact(str(e))}")
+        finally:
+            ETHERSCAN_LATENCY.observe(time.perf_counter() - started)
+        return data
+
+    def _request_contract(self, address: str) -> Dict:
+        """Etherscan API를 실제로 호출합니다."""
+        data = self._call_api({"module": "contract", "action": "getsourcecode", "address": address}, address)
+        if data.get('status') == '1' and data.get('result'):
+            ETHERSCAN_REQUESTS.inc(outcome="ok")
+            contract_data = data['result'][0]
+            source_code = contract_data.get('SourceCode', '')
+            return {
+                'address': address,
+                'contract_name': contract_data.get('ContractName', 'Unknown'),
+                'compiler_version': contract_data.get('CompilerVersion', 'Unknown'),
+                'optimization_used': contract_data.get('OptimizationUsed', 'Unknown'),
+                'source_code': source_code,
+                'abi': contract_data.get('ABI', ''),
+                'proxy': contract_data.get('Proxy', '0') == '1',
+                'implementation': contract_data.get('Implementation', ''),
+                'verified': source_code != ''
+            }
+        elif data.get('status') == '0':
+            error_msg = data.get('message', 'Unknown error')
+            result_text = str(data.get('result', ''))
+            log.warning("Etherscan API 오류: %s (%s: %s)", address, error_msg, result_text[:200])
+            if 'rate limit' in result_text.lower():
+                ETHERSCAN_REQUESTS.inc(outcome="rate_limited")
+            elif 'No records found' in error_msg:
+                ETHERSCAN_REQUESTS.inc(outcome="not_found")
+            else:
+                ETHERSCAN_REQUESTS.inc(outcome="api_error")
+            if 'NOTOK' in error_msg:
+                raise Exception("API 키가 유효하지 않거나 사용량 제한에 도달했습니다.")
+            elif 'No records found' in error_msg:
+                raise Exception("해당 주소의 컨트랙트를 찾을 수 없습니다.")
+            else:
+                raise Exception(f"API 오류: {error_msg}")
+        else:
+            ETHERSCAN_REQUESTS.inc(outcome="api_error")
+            raise Exception(f"API 응답 오류: {data}")
+
+    def _request_rpc(self, params: Dict, address: str) -> str:
+        """Etherscan의 JSON-RPC 프록시(module=proxy)를 호출하고 결과 16진 문자열을 반환합니다."""
+        if not self.api_key:
+            raise Exception("ETHERSCAN_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        data = self._call_api({"module": "proxy", "tag": "latest", **params}, address)
+        result = data.get('result')
+        if isinstance(result, str) and result.startswith('0x'):
+            ETHERSCAN_REQUESTS.inc(outcome="ok")
+            return result
+        ETHERSCAN_REQUESTS.inc(outcome="api_error")
+        error = (data.get('error') or {}).get('message') or result or data.get('message')
+        raise Exception(f"API 오류: {error}")
+
+    def get_storage_at(self, address: str, slot: str) -> str:
+        """컨트랙트 저장소 슬롯 값(32바이트 16진 문자열)을 조회합니다."""
+        return self._request_rpc({"action": "eth_getStorageAt", "address": address, "position": slot}, address)
+
+    def get_code(self, address: str) -> str:
+        """컨트랙트의 런타임 바이트코드(16진 문자열)를 조회합니다."""
+        return self._request_rpc({"action": "eth_getCode", "address": address}, address)
+
+    def call(self, address: str, data: str) -> str:
+        """읽기 전용 호출(eth_call)의 반환값을 조회합니다."""
+        return self._request_rpc({"action": "eth_call", "to": address, "data": data}, address)
+
+    def clear_cache(self):
+        """캐시된 응답을 모두 삭제합니다."""
+        with self._lock:
+            self._cache.clear()
+
+# 프로세스 전체에서 공유하는 기본 fetcher
+_default_fetcher: Optional[EtherscanFetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+def get_fetcher() -> EtherscanFetcher:
+    """프로세스 전역 EtherscanFetcher 인스턴스를 반환합니다."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = EtherscanFetcher()
+        return _default_fetcher
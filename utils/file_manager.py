@@ -1,12 +1,36 @@
 import os
 import shutil
+import threading
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+from utils.dependency_index import DependencyIndex
+from utils.profiling import PROFILE_FILE_PREFIX, is_profile_file
+from utils.exporters import EXPORT_FORMATS, export_analysis, load_analysis
+from utils.metrics import registry
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 파일 저장소 지표
+REPORTS_SAVED = registry.counter("eth_lens_reports_saved_total", "저장한 보고서 수 (형식별)", ["type"])
+REPORT_BYTES_SAVED = registry.counter("eth_lens_report_bytes_saved_total", "저장한 보고서 크기 합계 (형식별)", ["type"])
+FILE_OPERATION_LATENCY = registry.histogram(
+    "eth_lens_file_operation_seconds", "보고서 저장/조회 시간 (색인 갱신 포함)", ["operation"])
+
+# 분석 결과를 담은 파일 종류 (load_analysis로 읽을 수 있음)
+ANALYSIS_FILE_TYPES = ('JSON', 'MSGPACK', 'SARIF')
 
 class FileManager:
     def __init__(self, save_dir: str = "saved_reports"):
         self.save_dir = save_dir
         self._ensure_directory()
+        self.dependency_index = DependencyIndex(os.path.join(save_dir, "dependency_index.sqlite3"))
+        # NumPy를 쓰는 색인은 처음 사용할 때 임포트하고 열어 앱 시작 시간에 포함되지 않도록 함
+        self._index_lock = threading.Lock()
+        self._findings_index = None
+        self._selector_index = None
+        self._contract_search_index = None
+        self._clone_detector = None
     
     def _ensure_directory(self):
         """저장 디렉토리가 존재하는지 확인하고 없으면 생성합니다."""
@@ -15,39 +39,110 @@ class FileManager:
     
     def save_json_report(self, contract_address: str, analysis_result: Dict) -> str:
         """JSON 분석 결과를 저장합니다."""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"analysis_{contract_address}_{timestamp}.json"
-        filepath = os.path.join(self.save_dir, filename)
+        with FILE_OPERATION_LATENCY.time(operation="save_json"):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"analysis_{contract_address}_{timestamp}.json"
+            filepath = os.path.join(self.save_dir, filename)
         
-        print(f"JSON 파일 저장 중: {filepath}")
+            log.debug("JSON 파일 저장 중: %s", filepath)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            import json
-            json.dump(analysis_result, f, ensure_ascii=False, indent=2)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                import json
+                json.dump(analysis_result, f, ensure_ascii=False, indent=2)
+        
+            log.info("JSON 파일 저장 완료: %s", filename)
+            REPORTS_SAVED.inc(type="json")
+            REPORT_BYTES_SAVED.inc(os.path.getsize(filepath), type="json")
         
-        print(f"JSON 파일 저장 완료: {filename}")
-        return filename
+            # 발견 사항 색인 갱신
+            self.findings_index.add_analysis(filename, analysis_result)
+            self.selector_index.add_analysis(analysis_result)
+            self.dependency_index.add_analysis(analysis_result)
+            if self._contract_search_index is not None:
+                self._contract_search_index.add_analysis(filename, analysis_result)
+            return filename
+    
+    def save_export(self, contract_address: str, analysis_result: Dict, export_format: str) -> str:
+        """분석 결과를 MessagePack/SARIF 등 다른 형식으로 저장합니다 (검색 색인은 JSON 보고서로만 갱신)."""
+        if export_format not in EXPORT_FORMATS:
+            raise Exception(f"지원하지 않는 내보내기 형식입니다: {export_format} (지원: {', '.join(EXPORT_FORMATS)})")
+        with FILE_OPERATION_LATENCY.time(operation="save_export"):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"analysis_{contract_address}_{timestamp}{EXPORT_FORMATS[export_format][0]}"
+            filepath = os.path.join(self.save_dir, filename)
+        
+            export_analysis(analysis_result, filepath, export_format)
+        
+            log.info("분석 결과 내보내기 완료: %s", filename)
+            REPORTS_SAVED.inc(type=export_format)
+            REPORT_BYTES_SAVED.inc(os.path.getsize(filepath), type=export_format)
+            return filename
     
     def save_pdf_report(self, contract_address: str, pdf_bytes: bytes) -> str:
         """PDF 보고서를 저장합니다."""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"security_report_{contract_address}_{timestamp}.pdf"
-        filepath = os.path.join(self.save_dir, filename)
+        with FILE_OPERATION_LATENCY.time(operation="save_pdf"):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"security_report_{contract_address}_{timestamp}.pdf"
+            filepath = os.path.join(self.save_dir, filename)
         
-        print(f"PDF 파일 저장 중: {filepath}")
+            log.debug("PDF 파일 저장 중: %s", filepath)
         
-        with open(filepath, 'wb') as f:
-            f.write(pdf_bytes)
+            with open(filepath, 'wb') as f:
+                f.write(pdf_bytes)
+        
+            log.info("PDF 파일 저장 완료: %s", filename)
+            REPORTS_SAVED.inc(type="pdf")
+            REPORT_BYTES_SAVED.inc(len(pdf_bytes), type="pdf")
+            return filename
+    
+    def save_comparison_report(self, base_address: str, target_address: str, pdf_bytes: bytes) -> str:
+        """두 분석 결과를 비교한 PDF 보고서를 저장합니다."""
+        with FILE_OPERATION_LATENCY.time(operation="save_pdf"):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"comparison_report_{base_address}_{target_address}_{timestamp}.pdf"
+            with open(os.path.join(self.save_dir, filename), 'wb') as f:
+                f.write(pdf_bytes)
         
-        print(f"PDF 파일 저장 완료: {filename}")
-        return filename
+            log.info("비교 보고서 저장 완료: %s", filename)
+            REPORTS_SAVED.inc(type="pdf")
+            REPORT_BYTES_SAVED.inc(len(pdf_bytes), type="pdf")
+            return filename
+    
+    def save_profile(self, contract_address: str, capture) -> List[str]:
+        """디버그 모드로 기록한 프로파일(ProfileCapture)을 보고서 옆에 저장합니다."""
+        with FILE_OPERATION_LATENCY.time(operation="save_profile"):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            basename = f"{PROFILE_FILE_PREFIX}{contract_address}_{capture.stage}_{timestamp}"
+            filenames = capture.save(self.save_dir, basename)
+        
+            log.info("프로파일 저장 완료: %s", ", ".join(filenames))
+            REPORTS_SAVED.inc(type="profile")
+            REPORT_BYTES_SAVED.inc(sum(os.path.getsize(os.path.join(self.save_dir, f)) for f in filenames),
+                                   type="profile")
+            return filenames
+    
+    @staticmethod
+    def _file_type(filename: str) -> Optional[str]:
+        """파일명으로 저장 파일 종류(JSON/MSGPACK/SARIF/PDF/PROFILE)를 판단합니다. 관리 대상이 아니면 None을 반환합니다."""
+        if filename.endswith('.json'):
+            return 'JSON'
+        if filename.endswith('.msgpack'):
+            return 'MSGPACK'
+        if filename.endswith('.sarif'):
+            return 'SARIF'
+        if filename.endswith('.pdf'):
+            return 'PDF'
+        if is_profile_file(filename):
+            return 'PROFILE'
+        return None
     
     def get_saved_files(self) -> List[Dict]:
         """저장된 파일 목록을 반환합니다."""
         files = []
         if os.path.exists(self.save_dir):
             for filename in os.listdir(self.save_dir):
-                if filename.endswith(('.json', '.pdf')):
+                file_type = self._file_type(filename)
+                if file_type:
                     filepath = os.path.join(self.save_dir, filename)
                     file_stat = os.stat(filepath)
                     
@@ -56,26 +151,80 @@ class FileManager:
                         'filepath': filepath,
                         'size': file_stat.st_size,
                         'modified': datetime.fromtimestamp(file_stat.st_mtime),
-                        'type': 'JSON' if filename.endswith('.json') else 'PDF'
+                        'type': file_type
                     })
         
         # 수정일 기준으로 정렬 (최신순)
         return sorted(files, key=lambda x: x['modified'], reverse=True)
     
     def delete_file(self, filename: str) -> bool:
-        """파일을 삭제합니다."""
+        """파일을 삭제하고 색인에서 해당 보고서의 항목을 지웁니다."""
+        if not self._remove_file(filename):
+            return False
+        self._forget_reports([filename])
+        return True
+    
+    def _remove_file(self, filename: str) -> bool:
         filepath = os.path.join(self.save_dir, filename)
         if os.path.exists(filepath):
             os.remove(filepath)
             return True
         return False
     
+    def _forget_reports(self, filenames: List[str]):
+        """삭제된 보고서를 가리키는 발견 사항 색인 행, 의존성 색인, 검색 색인을 정리합니다."""
+        self.findings_index.remove_reports(filenames)
+        # 의존성 색인은 주소별 최신 JSON 분석으로 구성되므로 남은 JSON 중 최신 것으로 다시 채움 (없으면 삭제)
+        addresses = {name[len("analysis_"):].rsplit('_', 2)[0].lower() for name in filenames
+                     if name.startswith("analysis_") and name.endswith(".json")}
+        for address in addresses:
+            self.dependency_index.remove_address(address)
+            latest = self._latest_json_analysis(address)
+            if latest is not None:
+                self.dependency_index.add_analysis(latest)
+        self._contract_search_index = None  # 다음 조회 때 남은 파일로 다시 생성
+    
+    def _latest_json_analysis(self, contract_address: str) -> Optional[Dict]:
+        """해당 주소의 가장 최근 JSON 분석 결과를 반환합니다 (읽을 수 있는 파일이 없으면 None)."""
+        import json
+        prefix = f"analysis_{contract_address.lower()}_"
+        for file_info in self.get_saved_files():
+            if file_info['type'] == 'JSON' and file_info['filename'].lower().startswith(prefix):
+                try:
+                    with open(file_info['filepath'], 'r', encoding='utf-8') as f:
+                        return json.load(f)
+                except (OSError, ValueError) as e:
+                    log.warning("의존성 색인용 분석 결과를 읽을 수 없습니다: %s (%s)", file_info['filename'], e)
+        return None
+    
     def get_file_content(self, filename: str) -> bytes:
         """파일 내용을 반환합니다."""
         filepath = os.path.join(self.save_dir, filename)
         with open(filepath, 'rb') as f:
             return f.read()
     
+    def get_latest_analysis(self, contract_address: str) -> Optional[Dict]:
+        """해당 주소의 가장 최근 분석 결과(JSON/MessagePack/SARIF)를 반환합니다. 없으면 None을 반환합니다."""
+        with FILE_OPERATION_LATENCY.time(operation="get_latest_analysis"):
+            prefix = f"analysis_{contract_address.lower()}_"
+            for file_info in self.get_saved_files():
+                if file_info['type'] in ANALYSIS_FILE_TYPES and file_info['filename'].lower().startswith(prefix):
+                    try:
+                        return load_analysis(file_info['filepath'])
+                    except Exception as e:
+                        log.warning("이전 분석 결과를 읽을 수 없습니다: %s (%s)", file_info['filename'], e)
+            return None
+    
+    def get_analysis_files(self) -> List[Dict]:
+        """분석 결과 파일(JSON/MessagePack/SARIF) 목록을 최신순으로 반환합니다."""
+        return [f for f in self.get_saved_files()
+                if f['type'] in ANALYSIS_FILE_TYPES and f['filename'].startswith("analysis_")]
+    
+    def load_analysis(self, filename: str) -> Dict:
+        """저장된 분석 결과 파일을 형식에 관계없이 읽어 반환합니다."""
+        with FILE_OPERATION_LATENCY.time(operation="load_analysis"):
+            return load_analysis(os.path.join(self.save_dir, filename))
+    
     def get_file_info(self, filename: str) -> Dict:
         """파일 정보를 반환합니다."""
         filepath = os.path.join(self.save_dir, filename)
@@ -85,21 +234,86 @@ class FileManager:
                 'filename': filename,
                 'size': file_stat.st_size,
                 'modified': datetime.fromtimestamp(file_stat.st_mtime),
-                'type': 'JSON' if filename.endswith('.json') else 'PDF'
+                'type': self._file_type(filename)
             }
         return {}
     
     def clear_old_files(self, days: int = 30) -> int:
         """지정된 일수보다 오래된 파일들을 삭제합니다."""
         cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
-        deleted_count = 0
+        deleted = []
         
         for file_info in self.get_saved_files():
             if file_info['modified'].timestamp() < cutoff_date:
-                if self.delete_file(file_info['filename']):
-                    deleted_count += 1
+                if self._remove_file(file_info['filename']):
+                    deleted.append(file_info['filename'])
         
-        return deleted_count
+        if deleted:
+            # 색인은 삭제한 파일을 모아 한 번에 정리
+            self._forget_reports(deleted)
+        return len(deleted)
+    
+    @property
+    def findings_index(self) -> "FindingsIndex":
+        """발견 사항 색인을 반환합니다. 처음 접근할 때 디스크의 세그먼트를 읽습니다."""
+        with self._index_lock:
+            if self._findings_index is None:
+                from utils.findings_index import FindingsIndex
+                self._findings_index = FindingsIndex(os.path.join(self.save_dir, "findings_index"))
+            return self._findings_index
+    
+    def findings_index_generation(self) -> int:
+        """발견 사항 색인의 세대 번호를 색인을 열지 않고 읽습니다 (화면 캐시의 키로 사용)."""
+        try:
+            with open(os.path.join(self.save_dir, "findings_index", "generation"), 'r', encoding='utf-8') as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+    
+    @property
+    def selector_index(self) -> "SelectorIndex":
+        """함수 선택자 색인을 반환합니다. 처음 접근할 때 디스크의 색인을 읽습니다."""
+        with self._index_lock:
+            if self._selector_index is None:
+                from utils.selector_index import SelectorIndex
+                self._selector_index = SelectorIndex(os.path.join(self.save_dir, "selector_index"))
+            return self._selector_index
+    
+    @property
+    def contract_search_index(self) -> "ContractSearchIndex":
+        """분석된 컨트랙트/함수 검색 색인을 반환합니다. 처음 접근할 때 저장된 JSON으로 생성합니다."""
+        if self._contract_search_index is None:
+            import json
+            from utils.search_index import ContractSearchIndex
+            index = ContractSearchIndex()
+            for file_info in reversed(self.get_saved_files()):
+                if file_info['type'] != 'JSON':
+                    continue
+                try:
+                    with open(file_info['filepath'], 'r', encoding='utf-8') as f:
+                        index.add_analysis(file_info['filename'], json.load(f))
+                except (OSError, ValueError) as e:
+                    log.warning("검색 색인 생성 중 파일 건너뜀: %s (%s)", file_info['filename'], e)
+            self._contract_search_index = index
+        return self._contract_search_index
+    
+    @property
+    def clone_detector(self) -> "CloneDetector":
+        """알려진 취약 코드 유사도 검색 색인을 반환합니다. 처음 접근할 때 SQLite 파일을 엽니다."""
+        if self._clone_detector is None:
+            from utils.clone_detector import CloneDetector
+            self._clone_detector = CloneDetector(os.path.join(self.save_dir, "clone_index.sqlite3"))
+        return self._clone_detector
+    
+    def rebuild_findings_index(self) -> int:
+        """저장된 모든 JSON 분석 결과로 발견 사항 색인을 다시 생성합니다."""
+        json_paths = [f['filepath'] for f in reversed(self.get_saved_files()) if f['type'] == 'JSON']
+        return self.findings_index.rebuild(json_paths)
+    
+    def rebuild_dependency_index(self) -> int:
+        """저장된 모든 JSON 분석 결과로 컨트랙트 의존성 색인을 다시 생성합니다."""
+        json_paths = [f['filepath'] for f in reversed(self.get_saved_files()) if f['type'] == 'JSON']
+        return self.dependency_index.rebuild(json_paths)
     
     def get_storage_info(self) -> Dict:
         """저장소 정보를 반환합니다."""
@@ -110,5 +324,7 @@ class FileManager:
             'total_files': len(files),
             'total_size': total_size,
             'json_files': len([f for f in files if f['type'] == 'JSON']),
-            'pdf_files': len([f for f in files if f['type'] == 'PDF'])
+            'export_files': len([f for f in files if f['type'] in ('MSGPACK', 'SARIF')]),
+            'pdf_files': len([f for f in files if f['type'] == 'PDF']),
+            'profile_files': len([f for f in files if f['type'] == 'PROFILE'])
         } 
\ No newline at end of file
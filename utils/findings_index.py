@@ -0,0 +1,326 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable, Tuple
+import numpy as np
+from utils.log import get_logger
+from utils.reachability import REACHABILITY_FLAGS
+
+try:
+    import fcntl  # 앱, 코퍼스 분석, 감시 프로세스가 같은 색인을 갱신하므로 파일 잠금으로 직렬화
+except ImportError:
+    fcntl = None  # Windows 등: 프로세스 안의 잠금만 사용
+
+log = get_logger(__name__)
+
+# 문자열 컬럼은 사전(dictionary) 인코딩하여 정수 코드로 저장
+STRING_COLUMNS = ["contract", "function", "category", "report"]
+COLUMN_DTYPES = {
+    "contract": np.int32,
+    "function": np.int32,
+    "category": np.int32,
+    "report": np.int32,
+    "flags": np.uint8,
+    "analyzed_at": np.int64
+}
+
+class FindingsIndex:
+    """저장된 모든 분석 결과의 위험 함수 발견 사항을 컬럼 형식으로 색인합니다.
+
+    각 저장 시점마다 작은 세그먼트 파일이 추가되며, 세그먼트가 많아지면 하나로 병합합니다.
+    조회는 메모리에 올린 NumPy 컬럼에 대한 벡터 연산으로 처리됩니다.
+    여러 프로세스가 같은 디렉토리를 갱신할 수 있으므로 쓰기는 파일 잠금 안에서 디스크의 최신 상태를
+    다시 읽은 뒤 수행하고, 쓸 때마다 세대 번호(generation 파일)를 올려 다른 프로세스가 조회 전에
+    변경을 알아채고 다시 읽도록 합니다.
+    """
+
+    def __init__(self, index_dir: str, max_segments: int = 32):
+        self.index_dir = index_dir
+        self.segment_dir = os.path.join(index_dir, "segments")
+        self.dictionary_path = os.path.join(index_dir, "dictionaries.json")
+        self.generation_path = os.path.join(index_dir, "generation")
+        self.lock_path = os.path.join(index_dir, ".lock")
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._generation = None
+        self._ensure_directory()
+        with self._lock, self._file_lock(shared=True):
+            self._load()
+
+    def _ensure_directory(self):
+        """색인 디렉토리가 존재하는지 확인하고 없으면 생성합니다."""
+        if not os.path.exists(self.segment_dir):
+            os.makedirs(self.segment_dir)
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """다른 프로세스와 공유하는 색인 잠금을 잡습니다 (조회용은 공유, 갱신용은 배타 잠금)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_generation(self) -> int:
+        """디스크의 색인 세대 번호를 반환합니다."""
+        try:
+            with open(self.generation_path, 'r', encoding='utf-8') as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _bump_generation(self):
+        """색인을 바꾼 뒤 세대 번호를 올립니다 (배타 잠금 안에서 호출)."""
+        self._generation = self._read_generation() + 1
+        self._write_atomic(self.generation_path, lambda f: f.write(str(self._generation).encode('ascii')))
+
+    def _refresh(self):
+        """다른 프로세스가 색인을 바꿨으면 다시 읽습니다 (self._lock 안에서 호출)."""
+        if self._read_generation() != self._generation:
+            with self._file_lock(shared=True):
+                self._load()
+
+    def _load(self):
+        """사전과 세그먼트 파일을 읽어 메모리 컬럼을 구성합니다."""
+        self._generation = self._read_generation()
+        self._dictionaries = {name: [] for name in STRING_COLUMNS}
+        if os.path.exists(self.dictionary_path):
+            with open(self.dictionary_path, 'r', encoding='utf-8') as f:
+                self._dictionaries.update(json.load(f))
+        self._codes = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in self._dictionaries.items()
+        }
+
+        segments = [np.load(path) for path in self._segment_paths()]
+        self._columns = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            parts = [segment[name] for segment in segments]
+            self._columns[name] = np.concatenate(parts).astype(dtype) if parts else np.empty(0, dtype=dtype)
+
+    def _segment_paths(self) -> List[str]:
+        """세그먼트 파일 경로를 생성 순서대로 반환합니다."""
+        names = sorted(n for n in os.listdir(self.segment_dir) if n.endswith('.npz'))
+        return [os.path.join(self.segment_dir, n) for n in names]
+
+    def _encode(self, column: str, value: str) -> int:
+        """문자열 값을 사전 코드로 변환합니다. 처음 보는 값은 사전에 추가합니다."""
+        codes = self._codes[column]
+        if value not in codes:
+            codes[value] = len(self._dictionaries[column])
+            self._dictionaries[column].append(value)
+        return codes[value]
+
+    def _write_atomic(self, path: str, writer):
+        """임시 파일에 쓴 뒤 교체하여 부분적으로 쓰인 파일이 남지 않도록 합니다."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            writer(f)
+        os.replace(temp_path, path)
+
+    def _write_dictionaries(self):
+        self._write_atomic(
+            self.dictionary_path,
+            lambda f: f.write(json.dumps(self._dictionaries, ensure_ascii=False).encode('utf-8'))
+        )
+
+    def _write_segment(self, columns: Dict[str, np.ndarray]):
+        existing = self._segment_paths()
+        next_id = int(os.path.basename(existing[-1])[:-4]) + 1 if existing else 1
+        path = os.path.join(self.segment_dir, f"{next_id:08d}.npz")
+        self._write_atomic(path, lambda f: np.savez(f, **columns))
+
+    def add_analysis(self, report_name: str, analysis_result: Dict) -> int:
+        """분석 결과 하나의 발견 사항을 색인에 추가하고 추가된 행 수를 반환합니다."""
+        return self.add_analyses([(report_name, analysis_result)])
+
+    def _encode_rows(self, items: Iterable[Tuple[str, Dict]]) -> Dict[str, np.ndarray]:
+        """분석 결과들의 발견 사항을 컬럼 배열로 변환합니다."""
+        rows = {name: [] for name in COLUMN_DTYPES}
+        for report_name, analysis_result in items:
+            findings = analysis_result.get('findings')
+            if findings is None:
+                # 이전 형식의 결과: 유형 정보 없이 위험 함수 목록만 존재
+                findings = [{'function': name, 'category': 'unknown', 'reachable_from': []}
+                            for name in analysis_result.get('dangerous_functions', [])]
+            analyzed_at = _parse_timestamp(analysis_result.get('analysis_date'))
+            contract = analysis_result.get('contract_address', '').lower()
+            for finding in findings:
+                rows['contract'].append(self._encode('contract', contract))
+                rows['function'].append(self._encode('function', finding['function']))
+                rows['category'].append(self._encode('category', finding['category']))
+                rows['report'].append(self._encode('report', report_name))
+                rows['flags'].append(encode_flags(finding.get('reachable_from', [])))
+                rows['analyzed_at'].append(analyzed_at)
+        return {name: np.asarray(values, dtype=COLUMN_DTYPES[name]) for name, values in rows.items()}
+
+    def _append(self, columns: Dict[str, np.ndarray]):
+        """새 행을 세그먼트로 쓰고 메모리 컬럼에 더합니다 (배타 잠금 안에서 호출)."""
+        self._write_dictionaries()
+        self._write_segment(columns)
+        for name, values in columns.items():
+            self._columns[name] = np.concatenate([self._columns[name], values])
+        if len(self._segment_paths()) > self.max_segments:
+            self._compact()
+
+    def add_analyses(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        """여러 분석 결과의 발견 사항을 하나의 세그먼트로 추가하고 추가된 행 수를 반환합니다."""
+        with self._lock, self._file_lock():
+            if self._read_generation() != self._generation:
+                # 다른 프로세스가 추가한 사전 항목과 세그먼트를 덮어쓰지 않도록 최신 상태에서 시작
+                self._load()
+            columns = self._encode_rows(items)
+            added = len(columns['flags'])
+            if not added:
+                return 0
+            self._append(columns)
+            self._bump_generation()
+        return added
+
+    def remove_reports(self, report_names: Iterable[str]) -> int:
+        """삭제된 보고서 파일들의 발견 사항을 색인에서 지우고 지운 행 수를 반환합니다."""
+        with self._lock, self._file_lock():
+            if self._read_generation() != self._generation:
+                self._load()
+            report_codes = self._codes['report']
+            codes = [report_codes[name] for name in report_names if name in report_codes]
+            if not codes:
+                return 0
+            keep = ~np.isin(self._columns['report'], codes)
+            removed = len(keep) - int(np.count_nonzero(keep))
+            if not removed:
+                return 0
+            # 사전 항목은 남겨 두어도 기존 코드가 그대로 유효하므로 컬럼만 걸러서 하나의 세그먼트로 다시 씀
+            self._columns = {name: values[keep] for name, values in self._columns.items()}
+            self._compact()
+            self._bump_generation()
+        log.info("발견 사항 색인에서 삭제된 보고서 반영: %d행", removed)
+        return removed
+
+    def _compact(self):
+        """모든 세그먼트를 하나의 세그먼트로 병합합니다."""
+        old_paths = self._segment_paths()
+        self._write_segment(self._columns)
+        for path in old_paths:
+            os.remove(path)
+
+    def query(self,
+              contract: Optional[str] = None,
+              function: Optional[str] = None,
+              categories: Optional[Iterable[str]] = None,
+              reachable_from: Optional[Iterable[str]] = None,
+              since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              limit: Optional[int] = 1000) -> List[Dict]:
+        """조건에 맞는 발견 사항을 최신순으로 반환합니다.
+
+        contract와 function은 대소문자를 무시한 부분 일치, categories는 정확히 일치,
+        reachable_from은 지정한 모든 진입 지점에서 도달 가능한 발견 사항만 남깁니다.
+        """
+        with self._lock:
+            self._refresh()
+            # 사전은 추가만 되므로 복사하지 않고 참조해도 기존 코드는 그대로 유효
+            columns = dict(self._columns)
+            dictionaries = self._dictionaries
+
+        mask = np.ones(len(columns['flags']), dtype=bool)
+        if contract:
+            mask &= np.isin(columns['contract'], _matching_codes(dictionaries['contract'], contract))
+        if function:
+            mask &= np.isin(columns['function'], _matching_codes(dictionaries['function'], function))
+        if categories:
+            wanted = set(categories)
+            codes = [code for code, value in enumerate(dictionaries['category']) if value in wanted]
+            mask &= np.isin(columns['category'], codes)
+        if reachable_from:
+            required = encode_flags(reachable_from)
+            mask &= (columns['flags'] & required) == required
+        if since is not None:
+            mask &= columns['analyzed_at'] >= int(since.timestamp())
+        if until is not None:
+            mask &= columns['analyzed_at'] <= int(until.timestamp())
+
+        rows = np.flatnonzero(mask)
+        # 최신 분석 결과가 먼저 오도록 정렬
+        rows = rows[np.argsort(-columns['analyzed_at'][rows], kind='stable')]
+        if limit is not None:
+            rows = rows[:limit]
+
+        return [{
+            'contract': dictionaries['contract'][columns['contract'][row]],
+            'function': dictionaries['function'][columns['function'][row]],
+            'category': dictionaries['category'][columns['category'][row]],
+            'reachable_from': decode_flags(int(columns['flags'][row])),
+            'analyzed_at': datetime.fromtimestamp(int(columns['analyzed_at'][row])),
+            'report': dictionaries['report'][columns['report'][row]]
+        } for row in rows]
+
+    def get_categories(self) -> List[str]:
+        """색인에 등록된 위험 유형 목록을 반환합니다."""
+        with self._lock:
+            self._refresh()
+            return sorted(self._dictionaries['category'])
+
+    def get_stats(self) -> Dict:
+        """색인 통계를 반환합니다."""
+        with self._lock:
+            self._refresh()
+            return {
+                'total_findings': len(self._columns['flags']),
+                'total_contracts': len(np.unique(self._columns['contract'])),
+                'segments': len(self._segment_paths())
+            }
+
+    def rebuild(self, report_paths: Iterable[str]) -> int:
+        """색인을 비우고 저장된 JSON 분석 결과로부터 다시 생성합니다."""
+        def read_reports():
+            for path in report_paths:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        yield os.path.basename(path), json.load(f)
+                except (OSError, ValueError) as e:
+                    log.warning("색인 재생성 중 파일 건너뜀: %s (%s)", path, e)
+
+        with self._lock, self._file_lock():
+            for path in self._segment_paths():
+                os.remove(path)
+            if os.path.exists(self.dictionary_path):
+                os.remove(self.dictionary_path)
+            self._load()
+            columns = self._encode_rows(read_reports())
+            total = len(columns['flags'])
+            if total:
+                self._append(columns)
+            self._bump_generation()
+        return total
+
+def encode_flags(entry_points: Iterable[str]) -> int:
+    """진입 지점 이름 목록을 비트 플래그로 변환합니다."""
+    flags = 0
+    for entry in entry_points:
+        flags |= REACHABILITY_FLAGS.get(entry, 0)
+    return flags
+
+def decode_flags(flags: int) -> List[str]:
+    """비트 플래그를 진입 지점 이름 목록으로 변환합니다."""
+    return [entry for entry, bit in REACHABILITY_FLAGS.items() if flags & bit]
+
+def _matching_codes(values: List[str], term: str) -> List[int]:
+    """사전에서 검색어를 부분 문자열로 포함하는 값들의 코드를 반환합니다."""
+    term = term.lower()
+    return [code for code, value in enumerate(values) if term in value.lower()]
+
+def _parse_timestamp(analysis_date: Optional[str]) -> int:
+    """ISO 형식 분석 일시를 유닉스 타임스탬프로 변환합니다."""
+    if analysis_date:
+        try:
+            return int(datetime.fromisoformat(analysis_date).timestamp())
+        except ValueError:
+            pass
+    return int(datetime.now().timestamp())
@@ -0,0 +1,274 @@
+import os
+import re
+import time
+from typing import Dict, Optional
+from utils.metrics import registry
+from utils.log import get_logger
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parse
+
+log = get_logger(__name__)
+
+# 분석 하나에 허용하는 자원 (환경 변수로 변경 가능, 0이면 제한 없음)
+ANALYSIS_TIME_BUDGET = float(os.getenv("ETH_LENS_ANALYSIS_TIMEOUT", "60"))        # 초
+ANALYSIS_MEMORY_BUDGET_MB = float(os.getenv("ETH_LENS_ANALYSIS_MEMORY_MB", "64"))  # 소스와 잘라낸 함수 본문의 총량
+
+BUDGET_EXCEEDED = registry.counter(
+    "eth_lens_budget_exceeded_total", "자원 예산 초과로 부분 결과를 반환한 분석 수", ["resource", "stage"])
+
+class AnalysisBudget:
+    """분석 하나의 실행 시간과 메모리 사용량 상한을 관리합니다.
+
+    분석 단계의 반복문은 항목마다 ok()로 시간을, charge()로 새로 만드는 텍스트 크기를 확인하고
+    False가 반환되면 그때까지의 결과로 부분 결과를 만듭니다. 처음 초과한 내용은 exceeded에 기록됩니다.
+    """
+
+    __slots__ = ('seconds', 'memory_bytes', 'started', 'deadline', 'used_bytes', 'exceeded')
+
+    def __init__(self, seconds: Optional[float] = None, memory_mb: Optional[float] = None):
+        self.seconds = ANALYSIS_TIME_BUDGET if seconds is None else seconds
+        memory_mb = ANALYSIS_MEMORY_BUDGET_MB if memory_mb is None else memory_mb
+        self.memory_bytes = int(memory_mb * 1024 * 1024) if memory_mb > 0 else None
+        self.started = time.monotonic()
+        self.deadline = self.started + self.seconds if self.seconds > 0 else None
+        self.used_bytes = 0
+        self.exceeded: Optional[Dict] = None
+
+    @classmethod
+    def unlimited(cls) -> "AnalysisBudget":
+        """제한이 없는 예산을 반환합니다."""
+        return cls(seconds=0, memory_mb=0)
+
+    def ok(self, stage: str) -> bool:
+        """시간 예산이 남아 있는지 확인합니다."""
+        if self.deadline is None or time.monotonic() <= self.deadline:
+            return True
+        self._record('time', stage, self.seconds, round(time.monotonic() - self.started, 3))
+        return False
+
+    def charge(self, nbytes: int, stage: str) -> bool:
+        """nbytes만큼의 텍스트를 만들어도 되는지 확인하고 사용량에 더합니다."""
+        if self.memory_bytes is not None and self.used_bytes + nbytes > self.memory_bytes:
+            self._record('memory', stage, self.memory_bytes, self.used_bytes + nbytes)
+            return False
+        self.used_bytes += nbytes
+        return self.ok(stage)
+
+    def _record(self, resource: str, stage: str, limit: float, used: float):
+        if self.exceeded is not None:
+            return
+        self.exceeded = {'resource': resource, 'stage': stage, 'limit': limit, 'used': used}
+        BUDGET_EXCEEDED.inc(resource=resource, stage=stage)
+        log.warning("분석 예산 초과, 부분 결과 반환", resource=resource, stage=stage, limit=limit, used=used)
+
+def budget_message(exceeded: Dict) -> str:
+    """저장된 예산 초과 기록을 사용자에게 보여줄 문장으로 변환합니다."""
+    if exceeded['resource'] == 'time':
+        return f"분석 시간 예산({exceeded['limit']:g}초)을 초과해 '{exceeded['stage']}' 단계에서 중단했습니다."
+    return (f"분석 메모리 예산({exceeded['limit'] / 1024 / 1024:.3g}MB)을 초과해 "
+            f"'{exceeded['stage']}' 단계에서 중단했습니다.")
+
+def limit_process_memory(memory_mb: float):
+    """현재 프로세스의 주소 공간 크기를 제한합니다 (코퍼스 워커 등 전용 프로세스에서 사용)."""
+    try:
+        import resource
+    except ImportError:
+        return  # Windows 등 resource 모듈이 없는 환경
+    limit = int(memory_mb * 1024 * 1024)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+class ForwardFinder:
+    """증가하는 시작 위치로 반복 호출되는 str.find를 전체 선형 시간으로 처리합니다.
+
+    이전에 찾은 위치가 시작 위치 이후이면 다시 찾지 않고, 한 번 찾지 못하면 이후에도 찾지 않습니다.
+    (정규식의 [^)]* 같은 구간이 닫는 문자가 없을 때 매 시작 위치마다 끝까지 훑는 문제를 피합니다.)
+    """
+
+    __slots__ = ('text', 'sub', '_found')
+
+    def __init__(self, text: str, sub: str):
+        self.text = text
+        self.sub = sub
+        self._found = -2  # 아직 찾지 않음
+
+    def find(self, start: int) -> int:
+        """start 이후 처음 나오는 위치를 반환합니다 (start는 이전 호출보다 작으면 안 됩니다)."""
+        found = self._found
+        if found == -1 or found >= start:
+            return found
+        self._found = self.text.find(self.sub, start)
+        return self._found
+
+_COMMENT_START_PATTERN = re.compile(r'/[/*]')
+
+def blank_comments(text: str, keep_layout: bool = True) -> str:
+    """주석을 공백으로 바꿉니다. keep_layout이면 줄바꿈을 유지한 같은 길이의 공백을 사용합니다.
+
+    닫히지 않은 블록 주석은 주석으로 보지 않으며, 한 번 찾지 못한 "*/"는 다시 찾지 않으므로 선형 시간입니다.
+    """
+    parts = []
+    position = 0
+    search_from = 0
+    block_end = ForwardFinder(text, '*/')
+    while True:
+        match = _COMMENT_START_PATTERN.search(text, search_from)
+        if match is None:
+            break
+        start = match.start()
+        if match.group(0) == '//':
+            end = text.find('\n', start)
+            end = len(text) if end == -1 else end
+        else:
+            close = block_end.find(start + 2)
+            if close == -1:
+                search_from = start + 1
+                continue
+            end = close + 2
+        parts.append(text[position:start])
+        comment = text[start:end]
+        parts.append(re.sub(r'[^\n]', ' ', comment) if keep_layout else ' ')
+        position = search_from = end
+    if not parts:
+        return text
+    parts.append(text[position:])
+    return ''.join(parts)
+
+def match_braces(text: str) -> Dict[int, int]:
+    """모든 여는 중괄호 위치 → 짝이 맞는 닫는 중괄호 다음 위치를 한 번의 훑기로 계산합니다.
+
+    짝이 없는 여는 중괄호는 텍스트 끝(len(text))에 대응합니다.
+    """
+    ends = {}
+    stack = []
+    for match in re.finditer(r'[{}]', text):
+        if match.group(0) == '{':
+            stack.append(match.start())
+        elif stack:
+            ends[stack.pop()] = match.end()
+    for start in stack:
+        ends[start] = len(text)
+    return ends
+
+# 문자 클래스가 겹치는지 판단할 때 사용하는 대표 문자 (ASCII 전체와 몇 가지 비ASCII 문자)
+_PROBE_CHARS = frozenset([chr(code) for code in range(128)] + ['\u00a0', '\u00e9', '\u0416', '\uac00', '\u3000'])
+_CATEGORY_PATTERNS = {
+    'CATEGORY_DIGIT': r'\d', 'CATEGORY_NOT_DIGIT': r'\D', 'CATEGORY_SPACE': r'\s',
+    'CATEGORY_NOT_SPACE': r'\S', 'CATEGORY_WORD': r'\w', 'CATEGORY_NOT_WORD': r'\W',
+}
+
+def _class_chars(op_name: str, value) -> Optional[frozenset]:
+    """한 글자에 일치하는 항목이 받아들이는 대표 문자 집합을 반환합니다 (대소문자는 구분하지 않음)."""
+    if op_name == 'LITERAL':
+        chars = {chr(value)}
+    elif op_name == 'NOT_LITERAL':
+        chars = _PROBE_CHARS - {chr(value)}
+    elif op_name == 'ANY':
+        chars = _PROBE_CHARS - {'\n'}
+    elif op_name == 'IN':
+        chars = set()
+        negate = False
+        for item_op, item_value in value:
+            item_name = str(item_op)
+            if item_name == 'NEGATE':
+                negate = True
+            elif item_name == 'LITERAL':
+                chars.add(chr(item_value))
+            elif item_name == 'RANGE':
+                low, high = item_value
+                chars.update(c for c in _PROBE_CHARS if low <= ord(c) <= high)
+            elif item_name == 'CATEGORY':
+                pattern = _CATEGORY_PATTERNS.get(str(item_value))
+                chars.update(c for c in _PROBE_CHARS if pattern is None or re.match(pattern, c))
+            else:
+                chars.update(_PROBE_CHARS)
+        if negate:
+            chars = _PROBE_CHARS - chars
+    else:
+        return None
+    return frozenset(c.lower() for c in chars)
+
+def _first_chars(items):
+    """패턴 조각의 첫 글자가 될 수 있는 문자 집합과, 빈 문자열에 일치할 수 있는지를 반환합니다."""
+    first = set()
+    for op, value in items:
+        name = str(op)
+        chars = _class_chars(name, value)
+        if chars is not None:
+            return first | chars, False
+        if name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            low, _, sub = value
+            chars, nullable = _first_chars(sub)
+            nullable = nullable or low == 0
+        elif name == 'SUBPATTERN':
+            chars, nullable = _first_chars(value[-1])
+        elif name == 'ATOMIC_GROUP':
+            chars, nullable = _first_chars(value)
+        elif name == 'BRANCH':
+            chars, nullable = set(), False
+            for branch in value[1]:
+                branch_chars, branch_nullable = _first_chars(branch)
+                chars |= branch_chars
+                nullable = nullable or branch_nullable
+        elif name == 'AT':
+            continue
+        else:
+            return first | _PROBE_CHARS, False  # 알 수 없는 항목은 모든 문자로 간주
+        first |= chars
+        if not nullable:
+            return first, False
+    return first, True
+
+def check_linear_pattern(pattern: str):
+    """역추적이 폭발할 수 있는 정규식 구조를 거부합니다.
+
+    역참조, 전후방 탐색, 반복 안의 반복(예: (a+)+, (\\w+\\s*)*), 반복 안에서 첫 글자가 겹치거나
+    비어 있을 수 있는 대안(예: (?:a|a)*, (?:a|ab)*), 빈 문자열로만 떨어진 채 같은 문자를 받는
+    무한 반복의 연속(예: \\w*\\w*, \\w+\\s*\\w+)을 허용하지 않습니다.
+    """
+    def visit(items, inside_repeat: bool, pending: list) -> list:
+        # pending: 빈 문자열에 일치할 수 있는 항목만 사이에 두고 바로 앞에 놓인 무한 반복들의 문자 집합
+        for op, value in items:
+            name = str(op)
+            if name in ('GROUPREF', 'GROUPREF_EXISTS'):
+                raise Exception("역참조는 사용할 수 없습니다.")
+            if name in ('ASSERT', 'ASSERT_NOT'):
+                raise Exception("전후방 탐색(lookaround)은 사용할 수 없습니다.")
+            if name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+                low, high, sub = value
+                repeats = high != low  # a{2}처럼 횟수가 고정된 반복은 역추적을 일으키지 않음
+                if repeats and inside_repeat:
+                    raise Exception("반복 안에 반복이 있는 패턴은 사용할 수 없습니다.")
+                visit(sub, inside_repeat or repeats, [])
+                chars, nullable = _first_chars(sub)
+                nullable = nullable or low == 0
+                if repeats and high == _sre_parse.MAXREPEAT:
+                    if any(chars & previous for previous in pending):
+                        raise Exception("같은 문자에 일치하는 무한 반복을 연달아 사용할 수 없습니다.")
+                    pending = pending + [chars] if nullable else [chars]
+                elif not nullable:
+                    pending = []
+            elif name == 'SUBPATTERN':
+                pending = visit(value[-1], inside_repeat, pending)
+            elif name == 'ATOMIC_GROUP':
+                pending = visit(value, inside_repeat, pending)
+            elif name == 'BRANCH':
+                if inside_repeat:
+                    seen = set()
+                    for branch in value[1]:
+                        chars, nullable = _first_chars(branch)
+                        if nullable or chars & seen:
+                            raise Exception("반복 안에서 첫 글자가 겹치거나 비어 있을 수 있는 대안은 사용할 수 없습니다.")
+                        seen |= chars
+                nullable = False
+                for branch in value[1]:
+                    visit(branch, inside_repeat, [])
+                    nullable = nullable or _first_chars(branch)[1]
+                if not nullable:
+                    pending = []
+            elif name != 'AT':
+                pending = []
+        return pending
+    visit(_sre_parse.parse(pattern), False, [])
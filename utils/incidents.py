@@ -0,0 +1,165 @@
+import os
+import re
+import json
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils.search_index import TrigramIndex
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_INCIDENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "incidents.json")
+
+# 플랫폼 영어 변환 맵
+PLATFORM_MAP = {
+    "🔵 이더리움 (Ethereum)": "Ethereum",
+    "🟣 거래소 (Exchange)": "Exchange"
+}
+
+# cause 영어 변환 맵 (실제 incidents 데이터 기반 상세)
+CAUSE_MAP = {
+    "브리지 취약점": "Bridge Vulnerability",
+    "거래소 운영 부실": "Exchange Mismanagement",
+    "플래시론 공격": "Flash Loan Attack",
+    "지갑 보안 취약점": "Wallet Security Vulnerability",
+    "클라우드 서비스 취약점": "Cloud Service Vulnerability",
+    "거래소 보안 취약점": "Exchange Security Vulnerability",
+}
+
+TEXT_COLUMNS = ["date", "platform", "incident", "description", "loss", "cause", "source"]
+
+_LOSS_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?|\.\d+')
+
+def parse_losses(loss_labels: np.ndarray) -> np.ndarray:
+    """"$1.5B", "$600M", "$45K" 형식의 손실액 문자열 배열을 달러 단위 숫자 배열로 변환합니다.
+
+    "undisclosed"처럼 숫자로 읽을 수 없는 값은 경고를 남기고 0으로 처리합니다.
+    """
+    values = np.char.upper(np.char.strip(np.char.replace(np.char.replace(loss_labels, "$", ""), ",", "")))
+    multipliers = np.select(
+        [np.char.endswith(values, "B"), np.char.endswith(values, "M"), np.char.endswith(values, "K")],
+        [1_000_000_000, 1_000_000, 1_000],
+        default=1
+    )
+    numbers = np.char.rstrip(values, "BMK")
+    # 외부 데이터의 잘못된 값 하나로 전체 변환이 실패하지 않도록 형식을 먼저 검사 (고유값만 검사)
+    unique_numbers, inverse = np.unique(numbers, return_inverse=True)
+    valid = np.array([number == "" or _LOSS_NUMBER_PATTERN.fullmatch(number) is not None
+                      for number in unique_numbers], dtype=bool)[inverse.reshape(numbers.shape)]
+    if not valid.all():
+        invalid = sorted(set(np.asarray(loss_labels)[~valid].tolist()))
+        log.warning("숫자로 읽을 수 없는 손실액 %d건을 0으로 처리합니다: %s", int((~valid).sum()), invalid[:10])
+    numbers = np.where(valid & (numbers != ""), numbers, "0")
+    return numbers.astype(np.float64) * multipliers
+
+def translate_cause(cause: str) -> str:
+    """원인 문자열을 그래프용 영문 레이블로 변환합니다. 변환할 수 없으면 빈 문자열을 반환합니다."""
+    cause_no_emoji = ''.join(c for c in cause if c.isalnum() or c.isspace()).strip()
+    cause_en = CAUSE_MAP.get(cause_no_emoji)
+    if not cause_en:
+        if re.search(r'[가-힣]', cause_no_emoji):
+            try:
+                from unidecode import unidecode
+                cause_en = unidecode(cause_no_emoji)
+            except ImportError:
+                cause_en = cause_no_emoji
+        else:
+            cause_en = cause_no_emoji
+    # 알파벳/숫자/공백만 남기고 모두 제거
+    return re.sub(r'[^a-zA-Z0-9 ]', '', cause_en).strip()
+
+class IncidentTable:
+    """보안 사건사고 데이터를 컬럼(NumPy 배열) 형식으로 보관합니다.
+
+    손실액과 연도, 영문 레이블은 로드 시 한 번만 계산하고, 집계는 벡터 연산으로 처리합니다.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "IncidentTable":
+        """사건 딕셔너리 목록으로부터 테이블을 생성합니다."""
+        columns = {name: np.array([str(r.get(name, "")) for r in records], dtype=str) for name in TEXT_COLUMNS}
+        if not records:
+            columns = {name: np.array([], dtype=str) for name in TEXT_COLUMNS}
+        columns["year"] = np.array([d[:4] for d in columns["date"]], dtype=str)
+        columns["loss_usd"] = parse_losses(columns["loss"]) if records else np.array([], dtype=np.float64)
+        columns["platform_en"] = np.array([PLATFORM_MAP.get(p, p) for p in columns["platform"]], dtype=str)
+        # 원인 레이블은 종류가 적으므로 고유값만 변환
+        unique_causes, inverse = np.unique(columns["cause"], return_inverse=True)
+        translated = np.array([translate_cause(c) for c in unique_causes], dtype=str)
+        columns["cause_en"] = translated[inverse] if len(unique_causes) else np.array([], dtype=str)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["date"])
+
+    def take(self, rows: np.ndarray) -> "IncidentTable":
+        """선택한 행(불리언 마스크 또는 인덱스 배열)만으로 새 테이블을 반환합니다."""
+        return IncidentTable({name: values[rows] for name, values in self.columns.items()})
+
+    def platform_mask(self, platform: Optional[str]) -> np.ndarray:
+        """플랫폼 필터 마스크를 반환합니다. None 또는 "All"이면 모든 행을 선택합니다."""
+        if not platform or platform == "All":
+            return np.ones(len(self), dtype=bool)
+        return self.columns["platform"] == platform
+
+    def count_platform(self, platform: str) -> int:
+        """플랫폼별 사건 수를 반환합니다."""
+        return int(np.count_nonzero(self.columns["platform"] == platform))
+
+    def per_year(self) -> Tuple[Tuple[str, int, float], ...]:
+        """연도별 (연도, 사건 수, 손실액 합계)를 연도순으로 반환합니다."""
+        years, inverse = np.unique(self.columns["year"], return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(years))
+        losses = np.bincount(inverse, weights=self.columns["loss_usd"], minlength=len(years))
+        return tuple((str(y), int(c), float(l)) for y, c, l in zip(years, counts, losses))
+
+    def per_platform_loss(self) -> Tuple[Tuple[str, float], ...]:
+        """플랫폼(영문)별 손실액 합계를 처음 등장한 순서대로 반환합니다."""
+        return self._group_sum("platform_en", self.columns["loss_usd"])
+
+    def per_cause_count(self) -> Tuple[Tuple[str, int], ...]:
+        """공격 유형(영문)별 사건 수를 처음 등장한 순서대로 반환합니다. 빈 레이블은 제외합니다."""
+        counts = self._group_sum("cause_en", np.ones(len(self)))
+        return tuple((cause, int(count)) for cause, count in counts if cause)
+
+    def _group_sum(self, column: str, weights: np.ndarray) -> Tuple[Tuple[str, float], ...]:
+        keys, first_index, inverse = np.unique(self.columns[column], return_index=True, return_inverse=True)
+        sums = np.bincount(inverse, weights=weights, minlength=len(keys))
+        order = np.argsort(first_index)
+        return tuple((str(keys[i]), float(sums[i])) for i in order)
+
+    def sorted_by(self, sort_by: str) -> "IncidentTable":
+        """"Date", "Loss", "Platform" 기준으로 정렬된 테이블을 반환합니다."""
+        if sort_by == "Loss":
+            order = np.argsort(-self.columns["loss_usd"], kind="stable")
+        elif sort_by == "Platform":
+            order = np.argsort(self.columns["platform"], kind="stable")
+        else:
+            order = np.argsort(self.columns["date"], kind="stable")
+        return self.take(order)
+
+    def build_search_index(self) -> TrigramIndex:
+        """사건명, 설명, 원인, 플랫폼을 색인한 퍼지 검색 색인을 생성합니다 (key는 행 번호)."""
+        index = TrigramIndex()
+        for row in range(len(self)):
+            index.add(row, [self.columns[name][row] for name in ("incident", "description", "cause", "cause_en", "platform")])
+        return index
+
+    def search(self, index: TrigramIndex, term: Optional[str]) -> "IncidentTable":
+        """검색어와 비슷한 사건을 관련도순으로 반환합니다. 검색어가 없으면 그대로 반환합니다."""
+        if not term:
+            return self
+        rows = np.array([row for row, _ in index.search(term, limit=None)], dtype=np.intp)
+        return self.take(rows)
+
+    def records(self) -> List[Dict]:
+        """화면 표시용 사건 딕셔너리 목록을 반환합니다."""
+        return [{name: str(self.columns[name][i]) for name in TEXT_COLUMNS} for i in range(len(self))]
+
+def load_incidents(path: str = DEFAULT_INCIDENTS_PATH) -> IncidentTable:
+    """외부 데이터 파일(JSON 배열)에서 사건사고 테이블을 로드합니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return IncidentTable.from_records(json.load(f))
@@ -0,0 +1,147 @@
+import os
+import re
+import sys
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+LOG_LEVEL_ENV_VAR = "ETH_LENS_LOG_LEVEL"      # DEBUG / INFO / WARNING / ERROR (기본값: INFO)
+LOG_FORMAT_ENV_VAR = "ETH_LENS_LOG_FORMAT"    # text / json (기본값: text)
+LOG_SAMPLE_ENV_VAR = "ETH_LENS_LOG_SAMPLE"    # 빈번한 DEBUG 이벤트를 N번에 한 번만 기록 (기본값: 10)
+ROOT_LOGGER_NAME = "eth_lens"
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+# 함수/호출 엣지마다 발생하는 DEBUG 이벤트의 표본 추출 간격
+DEBUG_SAMPLE = max(1, int(os.getenv(LOG_SAMPLE_ENV_VAR, "10")))
+
+# 로그에 그대로 남기면 안 되는 값 (apikey=..., "token": "..." 형태)
+_SECRET_PATTERN = re.compile(
+    r'(?i)\b(api[_-]?key|token|secret|password)(["\']?\s*[=:]\s*["\']?)[^&\s"\',}]+')
+# 값 자체를 가려야 하는 환경변수 (URL이나 예외 메시지 어디에 섞여 있어도 제거)
+_SECRET_ENV_VARS = ("ETHERSCAN_API_KEY",)
+_REDACTED = "***"
+
+def redact(text: str) -> str:
+    """문자열에서 API 키 등 비밀 값을 가립니다."""
+    for name in _SECRET_ENV_VARS:
+        value = os.getenv(name)
+        if value and len(value) >= 6 and value in text:
+            text = text.replace(value, _REDACTED)
+    return _SECRET_PATTERN.sub(lambda m: m.group(1) + m.group(2) + _REDACTED, text)
+
+class StructuredFormatter(logging.Formatter):
+    """메시지와 구조화된 필드를 한 줄 텍스트 또는 JSON으로 출력하고 비밀 값을 가립니다.
+
+    메시지의 % 인자는 이 단계에서만 포맷되므로, 꺼진 레벨의 로그는 문자열을 만들지 않습니다.
+    """
+
+    def __init__(self, json_format: bool = False):
+        super().__init__()
+        self.json_format = json_format
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        fields = getattr(record, 'fields', None) or {}
+        timestamp = datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds')
+        if self.json_format:
+            entry = {'time': timestamp, 'level': record.levelname.lower(), 'logger': record.name,
+                     'message': message, **fields}
+            if record.exc_info:
+                entry['exception'] = self.formatException(record.exc_info)
+            text = json.dumps(entry, ensure_ascii=False, default=str)
+        else:
+            text = f"{timestamp} {record.levelname:<7} {record.name} {message}"
+            if fields:
+                text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+            if record.exc_info:
+                text += "\n" + self.formatException(record.exc_info)
+        return redact(text)
+
+class StructuredLogger:
+    """레벨, 구조화된 필드(키워드 인자), 표본 추출을 지원하는 로거.
+
+    log.debug("함수 호출 발견: %s → %s", caller, callee, sample=DEBUG_SAMPLE, kind="internal")
+    처럼 사용합니다. 레벨이 꺼져 있으면 레벨 비교 외에는 아무 작업도 하지 않습니다.
+    sample=N이면 같은 메시지 형식의 로그를 N번에 한 번만 기록합니다.
+    """
+
+    __slots__ = ('_logger', '_sample_counts')
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+        self._sample_counts: Dict[str, int] = {}
+
+    @property
+    def name(self) -> str:
+        return self._logger.name
+
+    def isEnabledFor(self, level: int) -> bool:
+        """해당 레벨의 로그가 기록되는지 반환합니다 (반복문 전체를 건너뛸 때 사용)."""
+        return self._logger.isEnabledFor(level)
+
+    def _log(self, level: int, msg: str, args: tuple, fields: Dict, sample: int, exc_info):
+        if sample > 1:
+            # 표본 추출은 대략적이어도 되므로 잠금 없이 센다
+            count = self._sample_counts.get(msg, 0)
+            self._sample_counts[msg] = count + 1
+            if count % sample:
+                return
+            fields['sample'] = sample
+        self._logger.log(level, msg, *args, exc_info=exc_info, extra={'fields': fields}, stacklevel=3)
+
+    def debug(self, msg: str, *args, sample: int = 1, exc_info=None, **fields):
+        if self._logger.isEnabledFor(DEBUG):
+            self._log(DEBUG, msg, args, fields, sample, exc_info)
+
+    def info(self, msg: str, *args, sample: int = 1, exc_info=None, **fields):
+        if self._logger.isEnabledFor(INFO):
+            self._log(INFO, msg, args, fields, sample, exc_info)
+
+    def warning(self, msg: str, *args, sample: int = 1, exc_info=None, **fields):
+        if self._logger.isEnabledFor(WARNING):
+            self._log(WARNING, msg, args, fields, sample, exc_info)
+
+    def error(self, msg: str, *args, sample: int = 1, exc_info=None, **fields):
+        if self._logger.isEnabledFor(ERROR):
+            self._log(ERROR, msg, args, fields, sample, exc_info)
+
+_configure_lock = threading.Lock()
+_configured = False
+_loggers: Dict[str, StructuredLogger] = {}
+
+def configure_logging(level: Optional[str] = None, json_format: Optional[bool] = None,
+                      stream=None, force: bool = False):
+    """eth_lens 로거의 레벨과 출력 형식을 설정합니다 (기본값은 환경변수).
+
+    로그는 표준 에러로 출력되므로 CLI의 표준 출력(JSON 결과 등)과 섞이지 않습니다.
+    """
+    global _configured
+    with _configure_lock:
+        if _configured and not force:
+            return
+        level = (level or os.getenv(LOG_LEVEL_ENV_VAR, "INFO")).upper()
+        if json_format is None:
+            json_format = os.getenv(LOG_FORMAT_ENV_VAR, "text").lower() == "json"
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(StructuredFormatter(json_format=json_format))
+        root.addHandler(handler)
+        root.setLevel(logging.getLevelName(level) if isinstance(logging.getLevelName(level), int) else INFO)
+        root.propagate = False
+        _configured = True
+
+def get_logger(name: str) -> StructuredLogger:
+    """모듈별 로거를 반환합니다 (처음 호출할 때 환경변수로 로깅을 설정)."""
+    configure_logging()
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, StructuredLogger(logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")))
+    return logger
@@ -0,0 +1,170 @@
+import io
+import os
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from typing import Dict, List, Optional
+from utils.metrics import registry
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+PROFILE_TOP_N = 25          # 요약에 포함할 함수/할당 위치 수
+PROFILE_FILE_PREFIX = "profile_"
+
+PROFILES_CAPTURED = registry.counter("eth_lens_profiles_captured_total", "디버그 모드로 기록한 프로파일 수", ["stage"])
+
+# tracemalloc은 프로세스 전체에 하나뿐이므로 동시에 진행 중인 측정 수를 세어 마지막 측정이 끝날 때 멈춥니다.
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+# cProfile 프로파일러는 한 번에 하나만 켤 수 있는 파이썬 버전이 있으므로 동시에 하나만 사용합니다.
+_profiler_lock = threading.Lock()
+
+# 할당 위치 집계에서 제외할 측정 도구 자체의 프레임
+_ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+def _start_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0:
+            # PYTHONTRACEMALLOC 등으로 이미 켜져 있었다면 끄지 않음
+            _tracemalloc_owned = not tracemalloc.is_tracing()
+            if _tracemalloc_owned:
+                tracemalloc.start()
+        _tracemalloc_users += 1
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+
+class ProfileCapture:
+    """코드 구간 하나를 cProfile과 tracemalloc으로 측정합니다.
+
+    with ProfileCapture("analysis") as capture: 로 감싼 뒤 summary()로 요약을, save()로 파일을 얻습니다.
+    enabled가 False면 아무것도 측정하지 않으므로 호출하는 쪽에서 분기하지 않아도 됩니다.
+    다른 스레드에서 측정이 진행 중이면 실행 시간 프로파일은 건너뛰고 메모리 할당만 기록합니다.
+    """
+
+    def __init__(self, stage: str, enabled: bool = True, top: int = PROFILE_TOP_N):
+        self.stage = stage
+        self.enabled = enabled
+        self.top = top
+        self.profiler: Optional[cProfile.Profile] = None
+        self.elapsed_seconds = 0.0
+        self.peak_memory_bytes = 0
+        self.allocations: List[Dict] = []
+        self._before = None
+        self._started = 0.0
+
+    def __enter__(self) -> "ProfileCapture":
+        if not self.enabled:
+            return self
+        _start_tracemalloc()
+        self._before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        if _profiler_lock.acquire(blocking=False):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            log.warning("다른 프로파일이 진행 중이어서 실행 시간 프로파일을 건너뜁니다", stage=self.stage)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if not self.enabled:
+            return False
+        self.elapsed_seconds = round(time.perf_counter() - self._started, 4)
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profiler_lock.release()
+        try:
+            self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            after = tracemalloc.take_snapshot()
+        finally:
+            _stop_tracemalloc()
+        self.allocations = self._top_allocations(self._before, after)
+        self._before = None
+        PROFILES_CAPTURED.inc(stage=self.stage)
+        log.info("프로파일 기록 완료", stage=self.stage, elapsed=self.elapsed_seconds,
+                 peak_memory_bytes=self.peak_memory_bytes)
+        return False
+
+    def _top_allocations(self, before, after) -> List[Dict]:
+        """측정 구간 동안 늘어난 메모리를 소스 줄 단위로 집계합니다."""
+        differences = after.filter_traces(_ALLOCATION_FILTERS).compare_to(
+            before.filter_traces(_ALLOCATION_FILTERS), 'lineno')
+        allocations = []
+        for stat in differences:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            allocations.append({'location': f"{frame.filename}:{frame.lineno}",
+                                'size_bytes': stat.size_diff, 'count': stat.count_diff})
+            if len(allocations) >= self.top:
+                break
+        return allocations
+
+    def hot_functions(self) -> List[Dict]:
+        """누적 시간이 긴 순서로 함수 목록을 반환합니다."""
+        if self.profiler is None:
+            return []
+        stats = pstats.Stats(self.profiler)
+        rows = []
+        for (filename, lineno, function), (_, calls, total, cumulative, _) in stats.stats.items():
+            rows.append({'function': f"{filename}:{lineno}({function})", 'calls': calls,
+                         'total_seconds': round(total, 6), 'cumulative_seconds': round(cumulative, 6)})
+        rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+        return rows[:self.top]
+
+    def summary(self) -> Dict:
+        """측정 결과 요약 (화면 표시와 로그용)을 반환합니다."""
+        return {
+            'stage': self.stage,
+            'elapsed_seconds': self.elapsed_seconds,
+            'peak_memory_bytes': self.peak_memory_bytes,
+            'hot_functions': self.hot_functions(),
+            'allocations': self.allocations,
+        }
+
+    def report_text(self) -> str:
+        """pstats 출력과 메모리 할당 상위 위치를 사람이 읽을 수 있는 텍스트로 반환합니다."""
+        buffer = io.StringIO()
+        buffer.write(f"stage: {self.stage}\n")
+        buffer.write(f"elapsed: {self.elapsed_seconds}s\n")
+        buffer.write(f"peak traced memory: {self.peak_memory_bytes / 1024 / 1024:.2f} MB\n\n")
+        buffer.write(f"== top {self.top} allocation sites (size increase during capture) ==\n")
+        for allocation in self.allocations:
+            buffer.write(f"{allocation['size_bytes'] / 1024:>10.1f} KiB {allocation['count']:>8} blocks  "
+                         f"{allocation['location']}\n")
+        buffer.write(f"\n== top {self.top} functions by cumulative time ==\n")
+        if self.profiler is None:
+            buffer.write("(skipped: another profile was running)\n")
+        else:
+            pstats.Stats(self.profiler, stream=buffer).sort_stats('cumulative').print_stats(self.top)
+        return buffer.getvalue()
+
+    def save(self, directory: str, basename: str) -> List[str]:
+        """<basename>.prof(pstats 형식, snakeviz 등으로 열 수 있음)와 <basename>.txt를 저장하고 파일명을 반환합니다."""
+        filenames = []
+        if self.profiler is not None:
+            self.profiler.dump_stats(os.path.join(directory, f"{basename}.prof"))
+            filenames.append(f"{basename}.prof")
+        with open(os.path.join(directory, f"{basename}.txt"), 'w', encoding='utf-8') as f:
+            f.write(self.report_text())
+        filenames.append(f"{basename}.txt")
+        return filenames
+
+def is_profile_file(filename: str) -> bool:
+    """saved_reports 안의 파일이 프로파일 결과인지 확인합니다."""
+    return filename.startswith(PROFILE_FILE_PREFIX) and filename.endswith(('.prof', '.txt'))
@@ -0,0 +1,291 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import networkx as nx
+from utils.metrics import registry
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 프록시 감지 설정 (환경 변수로 변경 가능)
+PROXY_SLOT_CHECK = os.getenv("ETH_LENS_PROXY_SLOTS", "1") == "1"      # 소스 조회와 함께 저장소 슬롯도 조회
+PROXY_CACHE_TTL = float(os.getenv("ETH_LENS_PROXY_CACHE_TTL", "600"))  # 프록시→구현 주소 매핑 유지 시간 (초)
+PROXY_PREFETCH_WORKERS = 8
+IMPLEMENTATION_GRAPH_CACHE_SIZE = 64   # 소스 해시별로 보관하는 구현 컨트랙트 분석 결과 수
+
+# EIP-1967 저장소 슬롯 (keccak256("eip1967.proxy.implementation") - 1 등)
+EIP1967_IMPLEMENTATION_SLOT = "0x360894a13ba1a3210667c828492db98dca3e2076cc3735a920a3ca505d382bbc"
+EIP1967_BEACON_SLOT = "0xa3f0ad74e5423aebfd80d3ef4346578335a9a72aeaee59ff6cb3582b35133d50"
+BEACON_IMPLEMENTATION_SELECTOR = "0x5c60da1b"   # implementation()
+TEST_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+PROXY_LOOKUPS = registry.counter("eth_lens_proxy_lookups_total", "프록시 구현 주소 조회 수 (결과별)", ["outcome"])
+
+# 프록시 주소 → (조회 시각, 매핑); 매핑이 None이면 프록시가 아님
+_mapping_cache: Dict[str, Tuple[float, Optional[Dict]]] = {}
+_mapping_lock = threading.Lock()
+# (구현 소스 해시, 규칙 버전) → (그래프, 위험 함수 목록); 같은 구현을 쓰는 프록시가 많으므로 재사용
+_implementation_graphs: "OrderedDict[Tuple[str, str], Tuple[nx.DiGraph, List[str]]]" = OrderedDict()
+_graphs_lock = threading.Lock()
+_prefetch_pool = ThreadPoolExecutor(max_workers=PROXY_PREFETCH_WORKERS, thread_name_prefix="proxy-prefetch")
+
+def _slot_address(value: Optional[str]) -> Optional[str]:
+    """32바이트 슬롯 값의 하위 20바이트를 주소로 변환합니다 (비어 있으면 None)."""
+    if not value or int(value, 16) == 0:
+        return None
+    return "0x" + value[-40:].lower()
+
+def _result_or_none(future, what: str):
+    """부가 조회(슬롯 등)의 실패는 분석을 막지 않으므로 None으로 처리합니다."""
+    try:
+        return future.result()
+    except Exception as e:
+        log.debug("%s 조회 실패: %s", what, e)
+        return None
+
+def cached_mapping(address: str) -> Tuple[bool, Optional[Dict]]:
+    """캐시된 (매핑이 있는지, 매핑)을 반환합니다."""
+    with _mapping_lock:
+        cached = _mapping_cache.get(address.lower())
+    if cached and time.monotonic() - cached[0] < PROXY_CACHE_TTL:
+        return True, cached[1]
+    return False, None
+
+def invalidate_mapping(address: str):
+    """구현 주소가 바뀐 것으로 알려진 프록시의 매핑을 삭제합니다."""
+    with _mapping_lock:
+        _mapping_cache.pop(address.lower(), None)
+
+def _slot_implementation(fetcher, slots: Dict[str, Optional[str]]) -> Tuple[Optional[str], str]:
+    """EIP-1967 구현/비컨 슬롯 값으로 (구현 주소 또는 None, 감지 방법)을 반환합니다."""
+    implementation = _slot_address(slots.get('implementation'))
+    if implementation is not None:
+        return implementation, "eip1967"
+    beacon = _slot_address(slots.get('beacon'))
+    if beacon is None:
+        return None, "eip1967"
+    # 비컨 프록시는 비컨 컨트랙트에 구현 주소를 물어봐야 하므로 한 번 더 조회
+    # (조회 스레드 안에서도 호출되므로 풀에 다시 제출하지 않고 직접 호출)
+    try:
+        implementation = _slot_address(fetcher.call(beacon, BEACON_IMPLEMENTATION_SELECTOR))
+    except Exception as e:
+        log.debug("비컨 구현 주소 조회 실패: %s", e)
+        implementation = None
+    return implementation, "eip1967-beacon"
+
+def read_onchain_state(address: str) -> Dict[str, Optional[str]]:
+    """EIP-1967 슬롯과 런타임 바이트코드를 동시에 읽어 현재 구현 주소와 바이트코드 해시를 반환합니다.
+
+    Etherscan의 Implementation 필드는 슬롯만 바뀌는 업그레이드를 늦게 반영하므로 감시에서는 온체인 값을 직접 읽습니다.
+    슬롯을 읽지 못하면 'implementation'이, 바이트코드를 읽지 못하면 'code_hash'가 None입니다
+    (슬롯을 읽었지만 프록시가 아니면 'implementation'은 빈 문자열).
+    """
+    from utils.fetcher import get_fetcher
+    fetcher = get_fetcher()
+    futures = {
+        'implementation': _prefetch_pool.submit(fetcher.get_storage_at, address, EIP1967_IMPLEMENTATION_SLOT),
+        'beacon': _prefetch_pool.submit(fetcher.get_storage_at, address, EIP1967_BEACON_SLOT),
+        'code': _prefetch_pool.submit(fetcher.get_code, address),
+    }
+    values = {name: _result_or_none(future, f"온체인 상태({name})") for name, future in futures.items()}
+    implementation = None
+    if values['implementation'] is not None and values['beacon'] is not None:
+        implementation = _slot_implementation(fetcher, values)[0]
+        if implementation is None and _slot_address(values['beacon']) is None:
+            implementation = ""  # 두 슬롯이 모두 비어 있음 (비컨 조회 실패는 알 수 없음으로 처리)
+    code = values['code']
+    return {'implementation': implementation,
+            'code_hash': hashlib.sha256(code.lower().encode('ascii')).hexdigest() if code is not None else None}
+
+def _detect_implementations(fetcher, address: str, contract: Dict, slots: Dict[str, Optional[str]]) -> Optional[Dict]:
+    """Etherscan 응답과 저장소 슬롯 값으로 프록시의 구현 주소를 찾습니다."""
+    implementation, detected_by = _slot_implementation(fetcher, slots)
+    if implementation is None and contract.get('implementation'):
+        # 온체인 슬롯을 읽지 못한 경우 (EIP-1967이 아닌 프록시 등) Etherscan의 Implementation 필드 사용
+        implementation = contract['implementation'].lower()
+        detected_by = "etherscan"
+    if implementation is None or implementation == address.lower():
+        return None
+    return {'address': address.lower(), 'implementation': implementation, 'detected_by': detected_by}
+
+def _prefetch_from_slots(fetcher, address: str, slot_futures: Dict[str, Future]) -> Future:
+    """슬롯 조회가 모두 끝나는 즉시 구현 주소를 찾고 구현 컨트랙트 소스 조회를 시작합니다.
+
+    프록시 소스 조회를 기다리지 않으므로 매핑이 캐시되지 않은 프록시도 구현 소스 조회가 직렬 왕복으로 밀리지 않습니다.
+    반환하는 Future의 결과는 (구현 주소, 감지 방법, fetch_contract 결과 또는 예외)이며, 슬롯으로 찾지 못하면 None입니다.
+    """
+    prefetched = Future()
+    start_lock = threading.Lock()
+    started = []
+
+    def fetch():
+        try:
+            slots = {name: _result_or_none(future, f"저장소 슬롯({name})") for name, future in slot_futures.items()}
+            implementation, detected_by = _slot_implementation(fetcher, slots)
+            if implementation is None or implementation == address.lower():
+                prefetched.set_result(None)
+                return
+            try:
+                contract = fetcher.fetch_contract(implementation)
+            except Exception as e:
+                contract = e
+            prefetched.set_result((implementation, detected_by, contract))
+        except Exception as e:
+            prefetched.set_exception(e)
+
+    def start(_):
+        # 마지막으로 끝난 슬롯 조회의 콜백에서 한 번만 시작
+        with start_lock:
+            if started or not all(future.done() for future in slot_futures.values()):
+                return
+            started.append(True)
+        try:
+            _prefetch_pool.submit(fetch)
+        except RuntimeError as e:  # 인터프리터 종료 중
+            prefetched.set_exception(e)
+
+    for future in slot_futures.values():
+        future.add_done_callback(start)
+    return prefetched
+
+def fetch_contract_sources(address: str) -> Tuple[str, Optional[Dict], Dict[str, Dict]]:
+    """컨트랙트 소스와, 프록시이면 구현 컨트랙트 정보를 함께 가져옵니다.
+
+    소스 조회와 EIP-1967 슬롯 조회를 동시에 보내고, 매핑이 캐시되어 있으면 구현 컨트랙트 소스도
+    프록시 소스와 동시에 가져옵니다. 캐시되지 않았으면 슬롯 조회가 끝나는 즉시 구현 소스 조회를 시작하므로
+    프록시 소스 조회와 겹쳐 진행됩니다 (슬롯으로 찾지 못해 Etherscan 필드를 쓰는 경우에만 한 번 더 기다림).
+    반환값은 (소스, 프록시 매핑 또는 None, 구현 주소 → fetch_contract 결과)입니다.
+    """
+    from utils.analyzer import load_source_code
+    from utils.fetcher import get_fetcher
+    if address.lower() == TEST_ADDRESS:
+        return load_source_code(address), None, {}
+    fetcher = get_fetcher()
+    has_mapping, mapping = cached_mapping(address)
+    contract_future = _prefetch_pool.submit(fetcher.fetch_contract, address)
+    prefetched = None
+    implementation_futures = {}
+    if has_mapping:
+        PROXY_LOOKUPS.inc(outcome="cache")
+        if mapping is not None:
+            implementation_futures[mapping['implementation']] = _prefetch_pool.submit(
+                fetcher.fetch_contract, mapping['implementation'])
+    elif PROXY_SLOT_CHECK and fetcher.api_key:
+        slot_futures = {
+            'implementation': _prefetch_pool.submit(fetcher.get_storage_at, address, EIP1967_IMPLEMENTATION_SLOT),
+            'beacon': _prefetch_pool.submit(fetcher.get_storage_at, address, EIP1967_BEACON_SLOT),
+        }
+        prefetched = _prefetch_from_slots(fetcher, address, slot_futures)
+
+    try:
+        contract = contract_future.result()
+    except Exception as e:
+        raise Exception(f"Etherscan API 오류: {e}")
+    if not contract['verified']:
+        raise Exception("컨트랙트 소스코드가 공개되지 않았습니다. (Verified 컨트랙트만 분석 가능)")
+
+    implementations = {}
+    if not has_mapping:
+        found = _result_or_none(prefetched, "슬롯 기반 구현 주소") if prefetched is not None else None
+        if found is not None:
+            implementation, detected_by, implementation_contract = found
+            mapping = {'address': address.lower(), 'implementation': implementation, 'detected_by': detected_by}
+            if isinstance(implementation_contract, Exception):
+                log.warning("구현 컨트랙트 조회 실패: %s (%s)", implementation, implementation_contract, proxy=address)
+                implementation_contract = {'address': implementation, 'verified': False,
+                                           'error': str(implementation_contract)}
+            implementations[implementation] = implementation_contract
+        else:
+            # 슬롯으로 찾지 못한 경우 (EIP-1967이 아닌 프록시 등) Etherscan의 Implementation 필드 사용
+            mapping = _detect_implementations(fetcher, address, contract, {})
+            if mapping is not None:
+                implementation_futures[mapping['implementation']] = _prefetch_pool.submit(
+                    fetcher.fetch_contract, mapping['implementation'])
+        with _mapping_lock:
+            _mapping_cache[address.lower()] = (time.monotonic(), mapping)
+        PROXY_LOOKUPS.inc(outcome="proxy" if mapping else "not_proxy")
+
+    for implementation, future in implementation_futures.items():
+        try:
+            implementations[implementation] = future.result()
+        except Exception as e:
+            log.warning("구현 컨트랙트 조회 실패: %s (%s)", implementation, e, proxy=address)
+            implementations[implementation] = {'address': implementation, 'verified': False, 'error': str(e)}
+    return contract['source_code'], mapping, implementations
+
+def _analyze_implementation(source_code: str) -> Tuple[nx.DiGraph, List[str]]:
+    """구현 컨트랙트를 분석합니다 (같은 소스와 규칙이면 이전 결과의 복사본을 반환)."""
+    from utils.analyzer import analyze_solidity_code
+    from utils.rules import get_ruleset
+    key = (hashlib.sha256(source_code.encode('utf-8')).hexdigest(), get_ruleset().version)
+    with _graphs_lock:
+        cached = _implementation_graphs.get(key)
+        if cached is not None:
+            _implementation_graphs.move_to_end(key)
+    if cached is None:
+        cached = analyze_solidity_code(source_code)
+        with _graphs_lock:
+            _implementation_graphs[key] = cached
+            while len(_implementation_graphs) > IMPLEMENTATION_GRAPH_CACHE_SIZE:
+                _implementation_graphs.popitem(last=False)
+    graph, dangerous_functions = cached
+    return graph.copy(), list(dangerous_functions)
+
+def merge_implementation(graph: nx.DiGraph, dangerous_functions: List[str], mapping: Dict,
+                         implementation: Dict) -> Tuple[nx.DiGraph, List[str]]:
+    """프록시 그래프에 구현 컨트랙트 그래프를 합치고 프록시 → 구현 함수 delegatecall 엣지를 추가합니다.
+
+    delegatecall을 수행하는 프록시 함수(없으면 fallback)에서 구현 컨트랙트의 외부 호출 가능 함수로 엣지를 그립니다.
+    프록시와 이름이 같지만 내용이 다른 구현 쪽 함수는 "컨트랙트@구현주소.함수"로 이름을 바꿔 구분합니다.
+    """
+    from utils.analyzer import bare_name, contract_of
+    proxy_info = {**mapping, 'contract_name': implementation.get('contract_name'),
+                  'verified': implementation.get('verified', False)}
+    graph.graph['proxy'] = proxy_info
+    if not implementation.get('verified'):
+        proxy_info['error'] = implementation.get('error') or "구현 컨트랙트 소스코드가 공개되지 않았습니다."
+        return graph, dangerous_functions
+
+    impl_graph, impl_dangerous = _analyze_implementation(implementation['source_code'])
+    suffix = f"@{mapping['implementation'][:10]}"
+    renamed = {node: f"{contract_of(node) or ''}{suffix}.{bare_name(node)}"
+               for node, data in impl_graph.nodes(data=True)
+               if node in graph and graph.nodes[node].get('hash') != data.get('hash')}
+    if renamed:
+        impl_graph = nx.relabel_nodes(impl_graph, renamed)
+        for node in renamed.values():
+            impl_graph.nodes[node]['contract'] = contract_of(node)
+    for node in impl_graph:
+        impl_graph.nodes[node]['implementation'] = mapping['implementation']
+
+    merged = nx.compose(impl_graph, graph)  # 같은 이름·내용의 함수(공용 라이브러리 등)는 프록시 쪽 노드 사용
+    merged.graph = dict(graph.graph)
+    merged.graph['contracts'] = {**impl_graph.graph.get('contracts', {}), **graph.graph.get('contracts', {})}
+    merged.graph['budget_exceeded'] = graph.graph.get('budget_exceeded') or impl_graph.graph.get('budget_exceeded')
+
+    proxy_nodes = [node for node in graph if 'implementation' not in graph.nodes[node]]
+    sources = [node for node in proxy_nodes
+               if {'delegatecall', 'callcode'} & set(graph.nodes[node].get('dangers', []))]
+    sources = sources or [node for node in proxy_nodes if bare_name(node) == 'fallback']
+    targets = [node for node, data in impl_graph.nodes(data=True)
+               if data.get('visibility') in ('public', 'external') and bare_name(node) != 'constructor']
+    delegations = []
+    for source in sources:
+        for target in targets:
+            merged.add_edge(source, target, kind='delegatecall')
+        for target_contract in dict.fromkeys(contract_of(target) for target in targets):
+            delegations.append({'source': contract_of(source), 'target': target_contract, 'kind': 'delegatecall',
+                                'function': source, 'target_function': None})
+    merged.graph['dependencies'] = (graph.graph.get('dependencies', []) + impl_graph.graph.get('dependencies', [])
+                                    + delegations)
+    proxy_info['delegatecall_edges'] = len(sources) * len(targets)
+
+    dangerous = list(dict.fromkeys(dangerous_functions + [renamed.get(node, node) for node in impl_dangerous]))
+    log.info("프록시 구현 컨트랙트 병합: %s → %s", mapping['address'], mapping['implementation'],
+             detected_by=mapping['detected_by'], functions=impl_graph.number_of_nodes(),
+             delegatecall_edges=proxy_info['delegatecall_edges'])
+    return merged, dangerous
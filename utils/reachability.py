@@ -0,0 +1,7 @@
+# 진입 지점 이름과 도달성 플래그 비트 (무거운 의존성 없이 앱 시작 시 바로 임포트할 수 있도록 분리)
+
+# 외부에서 직접 진입 가능한 지점 (도달성 플래그 이름)
+ENTRY_POINTS = ["fallback", "receive", "constructor", "external"]
+
+# 발견 사항 색인에 저장하는 도달성 플래그 비트 (ENTRY_POINTS 순서)
+REACHABILITY_FLAGS = {entry: 1 << bit for bit, entry in enumerate(ENTRY_POINTS)}
@@ -7,6 +7,23 @@ import matplotlib.pyplot as plt
 import networkx as nx
 from typing import Dict, List, Tuple, Optional
 import matplotlib.patches as mpatches
+from utils.analyzer import build_analysis_result, graph_from_result, compare_graphs
+from utils.risk_scoring import RiskModel
+from utils.tracing import tracer
+from utils.metrics import registry
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 보고서 생성 지표
+PDF_REPORTS = registry.counter("eth_lens_pdf_reports_total", "PDF 보고서 생성 수 (결과별)", ["outcome"])
+PDF_BUILD_LATENCY = registry.histogram("eth_lens_pdf_build_seconds", "PDF 보고서 생성 시간")
+GRAPH_IMAGE_LATENCY = registry.histogram("eth_lens_graph_image_seconds", "보고서용 호출 그래프 이미지 생성 시간")
+
+# 비교 보고서에 항목별로 나열하는 최대 개수 (나머지는 개수만 표시)
+COMPARISON_LIST_LIMIT = 50
+# 비교 보고서 그림에 그리는 최대 함수 수
+COMPARISON_IMAGE_MAX_NODES = 60
 
 class SecurityReportGenerator:
     def __init__(self):
@@ -14,6 +31,8 @@ class SecurityReportGenerator:
         self.pdf.add_page()
         # 유니코드 지원 폰트 설정
         self.pdf.set_font("Arial", size=12)
+        # 마지막 보고서 생성의 단계별 소요 시간 (추적이 꺼져 있으면 None)
+        self.last_trace = None
         
     def generate_report(self, 
                        contract_address: str,
@@ -25,34 +44,88 @@ class SecurityReportGenerator:
             if analysis_date is None:
                 analysis_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 
-            # 제목 페이지
-            self._add_title_page(contract_address, analysis_date)
-            
-            # 요약 페이지
-            self._add_summary_page(contract_address, graph, dangerous_functions)
-            
-            # 위험 함수 상세 분석
-            if dangerous_functions:
-                self._add_dangerous_functions_page(dangerous_functions)
-            
-            # 함수 호출 구조 페이지 추가 (그래프 이미지만)
-            self._add_function_calls_page_with_image(graph, dangerous_functions)
-            
-            # 함수 호출 상세 정보 페이지 추가
-            self._add_function_call_details_page(graph, dangerous_functions)
-            
-            # 권장사항
-            self._add_recommendations_page()
-            
-            # PDF 바이트 반환
-            pdf_bytes = self.pdf.output(dest='S')
+            with PDF_BUILD_LATENCY.time(), tracer.span("generate_report") as root:
+                # 제목 페이지
+                with tracer.span("title_page"):
+                    self._add_title_page(contract_address, analysis_date)
+                
+                # 요약 페이지
+                with tracer.span("summary_page"):
+                    self._add_summary_page(contract_address, graph, dangerous_functions)
+                
+                # 위험 함수 상세 분석
+                if dangerous_functions:
+                    with tracer.span("dangerous_functions_page"):
+                        self._add_dangerous_functions_page(dangerous_functions)
+                
+                # 함수 호출 구조 페이지 추가 (그래프 이미지만)
+                with tracer.span("function_calls_page"):
+                    self._add_function_calls_page_with_image(graph, dangerous_functions)
+                
+                # 함수 호출 상세 정보 페이지 추가
+                with tracer.span("call_details_page"):
+                    self._add_function_call_details_page(graph, dangerous_functions)
+                
+                # 권장사항
+                with tracer.span("recommendations_page"):
+                    self._add_recommendations_page()
+                
+                # PDF 바이트 반환
+                with tracer.span("pdf_output"):
+                    pdf_bytes = self.pdf.output(dest='S')
+            if root is not None:
+                self.last_trace = root.to_dict()
+            PDF_REPORTS.inc(outcome="ok")
             return bytes(pdf_bytes)
             
         except Exception as e:
-            print(f"PDF 생성 중 오류: {str(e)}")
+            PDF_REPORTS.inc(outcome="error")
+            log.error("PDF 생성 중 오류: %s", e, exc_info=True)
             # 오류 발생 시 기본 PDF 생성
             return self._create_error_pdf(contract_address, str(e))
     
+    def generate_comparison_report(self,
+                                   base_result: Dict,
+                                   target_result: Dict,
+                                   comparison: Optional[Dict] = None) -> bytes:
+        """저장된 두 분석 결과를 비교한 보고서를 생성합니다 (다시 조회하거나 분석하지 않음).
+
+        comparison을 주지 않으면 compare_graphs로 함수, 호출 엣지, 발견 사항, 위험 경로 차이를 계산합니다.
+        """
+        base_address = base_result.get('contract_address', '')
+        target_address = target_result.get('contract_address', '')
+        try:
+            with PDF_BUILD_LATENCY.time(), tracer.span("generate_comparison_report") as root:
+                with tracer.span("restore_graphs"):
+                    base_graph = graph_from_result(base_result)
+                    target_graph = graph_from_result(target_result)
+                if comparison is None:
+                    with tracer.span("compare_graphs"):
+                        comparison = compare_graphs(base_graph, target_graph, path_limit=COMPARISON_LIST_LIMIT)
+
+                with tracer.span("title_page"):
+                    self._add_comparison_title_page(base_result, target_result)
+                with tracer.span("summary_page"):
+                    self._add_comparison_summary_page(base_result, target_result, comparison)
+                with tracer.span("danger_paths_page"):
+                    self._add_danger_path_changes_page(comparison)
+                with tracer.span("structure_changes_page"):
+                    self._add_structure_changes_page(comparison)
+                with tracer.span("comparison_graph_page"):
+                    self._add_comparison_graph_page(base_graph, target_graph, comparison)
+
+                with tracer.span("pdf_output"):
+                    pdf_bytes = self.pdf.output(dest='S')
+            if root is not None:
+                self.last_trace = root.to_dict()
+            PDF_REPORTS.inc(outcome="ok")
+            return bytes(pdf_bytes)
+
+        except Exception as e:
+            PDF_REPORTS.inc(outcome="error")
+            log.error("비교 보고서 생성 중 오류: %s", e, exc_info=True)
+            return self._create_error_pdf(f"{base_address} vs {target_address}", str(e))
+
     def _create_error_pdf(self, contract_address: str, error_msg: str) -> bytes:
         """오류 발생 시 기본 PDF를 생성합니다."""
         error_pdf = FPDF()
@@ -101,15 +174,16 @@ class SecurityReportGenerator:
         self.pdf.cell(0, 10, "Risk Assessment:", ln=True)
         self.pdf.set_font("Arial", size=12)
         
-        if len(dangerous_functions) == 0:
-            self.pdf.cell(0, 8, "- Risk Level: LOW", ln=True)
-            self.pdf.cell(0, 8, "- No dangerous functions detected", ln=True)
-        elif len(dangerous_functions) <= 2:
-            self.pdf.cell(0, 8, "- Risk Level: MEDIUM", ln=True)
+        # 발견 유형의 심각도, 진입 지점 도달성, 호출 구조상 중심성을 반영한 점수
+        assessment = RiskModel().assess(build_analysis_result(contract_address, graph, dangerous_functions))
+        self.pdf.cell(0, 8, f"- Risk Level: {assessment['risk_level']}", ln=True)
+        self.pdf.cell(0, 8, f"- Risk Score: {assessment['score']}", ln=True)
+        if dangerous_functions:
             self.pdf.cell(0, 8, f"- {len(dangerous_functions)} dangerous functions found", ln=True)
+            for feature, contribution in assessment['contributions'][:3]:
+                self.pdf.cell(0, 8, f"  * {feature}: +{contribution}", ln=True)
         else:
-            self.pdf.cell(0, 8, "- Risk Level: HIGH", ln=True)
-            self.pdf.cell(0, 8, f"- {len(dangerous_functions)} dangerous functions found", ln=True)
+            self.pdf.cell(0, 8, "- No dangerous functions detected", ln=True)
             
     def _add_dangerous_functions_page(self, dangerous_functions: List[str]):
         """위험 함수 상세 분석 페이지를 추가합니다."""
@@ -203,16 +277,217 @@ class SecurityReportGenerator:
         self.pdf.cell(0, 8, "Note: This report is for educational purposes only.", ln=True)
         self.pdf.cell(0, 8, "For production use, consult with security professionals.", ln=True)
 
+    def _list_lines(self, lines: List[str], color: Tuple[int, int, int] = (0, 0, 0)):
+        """목록을 최대 COMPARISON_LIST_LIMIT줄까지 출력하고 나머지는 개수만 표시합니다."""
+        self.pdf.set_font("Arial", size=9)
+        self.pdf.set_text_color(*color)
+        for line in lines[:COMPARISON_LIST_LIMIT]:
+            self.pdf.multi_cell(0, 6, line, new_x="LMARGIN", new_y="NEXT")
+        self.pdf.set_text_color(0, 0, 0)
+        if len(lines) > COMPARISON_LIST_LIMIT:
+            self.pdf.set_font("Arial", 'I', 9)
+            self.pdf.cell(0, 6, f"... and {len(lines) - COMPARISON_LIST_LIMIT} more", ln=True)
+        if not lines:
+            self.pdf.set_font("Arial", 'I', 9)
+            self.pdf.cell(0, 6, "(none)", ln=True)
+
+    def _add_comparison_title_page(self, base_result: Dict, target_result: Dict):
+        """비교 보고서 제목 페이지를 추가합니다."""
+        self.pdf.add_page()
+        self.pdf.set_font("Arial", 'B', 24)
+        self.pdf.cell(0, 40, "ETH Anomaly Lens", ln=True, align='C')
+        self.pdf.cell(0, 20, "Security Comparison Report", ln=True, align='C')
+
+        self.pdf.set_font("Arial", size=12)
+        self.pdf.cell(0, 20, "", ln=True)
+        self.pdf.cell(0, 10, f"Base: {base_result.get('contract_address', '')}", ln=True)
+        self.pdf.cell(0, 10, f"  analyzed {base_result.get('analysis_date', 'unknown')}", ln=True)
+        self.pdf.cell(0, 10, f"Target: {target_result.get('contract_address', '')}", ln=True)
+        self.pdf.cell(0, 10, f"  analyzed {target_result.get('analysis_date', 'unknown')}", ln=True)
+        self.pdf.cell(0, 10, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
+
+    def _add_comparison_summary_page(self, base_result: Dict, target_result: Dict, comparison: Dict):
+        """두 분석의 규모·위험 점수와 변경 개수를 요약합니다."""
+        self.pdf.add_page()
+        self.pdf.set_font("Arial", 'B', 16)
+        self.pdf.cell(0, 20, "Comparison Summary", ln=True)
+
+        model = RiskModel()
+        base_risk, target_risk = model.assess(base_result), model.assess(target_result)
+        rows = [
+            ("Functions", base_result.get('total_functions', 0), target_result.get('total_functions', 0)),
+            ("Function Calls", len(base_result.get('function_calls', [])), len(target_result.get('function_calls', []))),
+            ("Dangerous Functions", len(base_result.get('dangerous_functions', [])),
+             len(target_result.get('dangerous_functions', []))),
+            ("Findings", len(base_result.get('findings', [])), len(target_result.get('findings', []))),
+            ("Risk Score", base_risk['score'], target_risk['score']),
+        ]
+        self.pdf.set_font("Arial", 'B', 11)
+        for header, width in (("", 60), ("Base", 40), ("Target", 40), ("Change", 40)):
+            self.pdf.cell(width, 8, header, border=1)
+        self.pdf.ln()
+        self.pdf.set_font("Arial", size=11)
+        for label, base_value, target_value in rows:
+            change = round(target_value - base_value, 2)
+            self.pdf.cell(60, 8, label, border=1)
+            self.pdf.cell(40, 8, str(base_value), border=1)
+            self.pdf.cell(40, 8, str(target_value), border=1)
+            self.pdf.cell(40, 8, f"{change:+g}", border=1)
+            self.pdf.ln()
+        self.pdf.cell(0, 8, f"Risk Level: {base_risk['risk_level']} -> {target_risk['risk_level']}", ln=True)
+
+        self.pdf.cell(0, 6, "", ln=True)
+        self.pdf.set_font("Arial", 'B', 12)
+        self.pdf.cell(0, 10, "Changes:", ln=True)
+        self.pdf.set_font("Arial", size=11)
+        self.pdf.set_text_color(200, 0, 0)
+        self.pdf.cell(0, 8, f"- New danger paths: {len(comparison['added_danger_paths'])}", ln=True)
+        self.pdf.cell(0, 8, f"- New findings: {len(comparison['added_findings'])}", ln=True)
+        self.pdf.set_text_color(0, 128, 0)
+        self.pdf.cell(0, 8, f"- Removed danger paths: {len(comparison['removed_danger_paths'])}", ln=True)
+        self.pdf.cell(0, 8, f"- Removed findings: {len(comparison['removed_findings'])}", ln=True)
+        self.pdf.set_text_color(0, 0, 0)
+        self.pdf.cell(0, 8, f"- Unchanged danger paths: {comparison['unchanged_danger_paths']}", ln=True)
+        self.pdf.cell(0, 8, f"- Functions added/removed/changed: {len(comparison['added_functions'])}/"
+                            f"{len(comparison['removed_functions'])}/{len(comparison['changed_functions'])}", ln=True)
+        self.pdf.cell(0, 8, f"- Calls added/removed: {len(comparison['added_edges'])}/"
+                            f"{len(comparison['removed_edges'])}", ln=True)
+
+    def _add_danger_path_changes_page(self, comparison: Dict):
+        """새로 생기거나 사라진 위험 경로(진입 함수 -> 위험 함수)를 강조해 나열합니다."""
+        def describe(path: Dict) -> str:
+            route = " -> ".join(path['path']) if path.get('path') else f"{path['entry']} -> ... -> {path['function']}"
+            return f"{route}  [{', '.join(path['dangers'])}]"
+
+        self.pdf.add_page()
+        self.pdf.set_font("Arial", 'B', 16)
+        self.pdf.cell(0, 20, "Danger Path Changes", ln=True)
+        self.pdf.set_font("Arial", 'B', 12)
+        self.pdf.set_text_color(200, 0, 0)
+        self.pdf.cell(0, 10, f"+ New danger paths ({len(comparison['added_danger_paths'])})", ln=True)
+        self._list_lines([f"+ {describe(path)}" for path in comparison['added_danger_paths']], (200, 0, 0))
+
+        self.pdf.cell(0, 6, "", ln=True)
+        self.pdf.set_font("Arial", 'B', 12)
+        self.pdf.set_text_color(0, 128, 0)
+        self.pdf.cell(0, 10, f"- Removed danger paths ({len(comparison['removed_danger_paths'])})", ln=True)
+        self._list_lines([f"- {describe(path)}" for path in comparison['removed_danger_paths']], (0, 128, 0))
+
+    def _add_structure_changes_page(self, comparison: Dict):
+        """발견 사항, 함수, 호출 엣지 변경 목록을 추가합니다."""
+        self.pdf.add_page()
+        self.pdf.set_font("Arial", 'B', 16)
+        self.pdf.cell(0, 20, "Findings and Structure Changes", ln=True)
+        sections = [
+            ("New findings", [f"+ {node}: {category}" for node, category in comparison['added_findings']], (200, 0, 0)),
+            ("Removed findings", [f"- {node}: {category}" for node, category in comparison['removed_findings']], (0, 128, 0)),
+            ("Added functions", [f"+ {node}" for node in comparison['added_functions']], (0, 0, 0)),
+            ("Removed functions", [f"- {node}" for node in comparison['removed_functions']], (0, 0, 0)),
+            ("Changed functions (body differs)", [f"* {node}" for node in comparison['changed_functions']], (0, 0, 0)),
+            ("Added calls", [f"+ {caller} -> {callee}" for caller, callee in comparison['added_edges']], (0, 0, 0)),
+            ("Removed calls", [f"- {caller} -> {callee}" for caller, callee in comparison['removed_edges']], (0, 0, 0)),
+        ]
+        for title, lines, color in sections:
+            self.pdf.set_font("Arial", 'B', 12)
+            self.pdf.cell(0, 10, f"{title} ({len(lines)})", ln=True)
+            self._list_lines(lines, color)
+
+    def _add_comparison_graph_page(self, base_graph: nx.DiGraph, target_graph: nx.DiGraph, comparison: Dict):
+        """변경된 위험 경로와 함수만 모은 비교 그림 페이지를 추가합니다."""
+        self.pdf.add_page()
+        self.pdf.set_font("Arial", 'B', 16)
+        self.pdf.cell(0, 20, "Changed Call Structure", ln=True)
+        try:
+            image = create_comparison_image(base_graph, target_graph, comparison)
+            temp_image_path = "temp_comparison_graph.png"
+            with open(temp_image_path, 'wb') as f:
+                f.write(image)
+            self.pdf.image(temp_image_path, x=10, y=50, w=190, h=200)
+            os.remove(temp_image_path)
+        except Exception as e:
+            self.pdf.set_font("Arial", size=12)
+            self.pdf.cell(0, 8, f"Graph image generation failed: {str(e)}", ln=True)
+
+def create_comparison_image(base_graph: nx.DiGraph, target_graph: nx.DiGraph, comparison: Dict) -> bytes:
+    """두 그래프에서 바뀐 부분(위험 경로, 추가/삭제 함수와 호출)만 그린 이미지를 생성합니다."""
+    with GRAPH_IMAGE_LATENCY.time(), tracer.span("create_comparison_image"):
+        added_paths = [path['path'] for path in comparison['added_danger_paths'] if path.get('path')]
+        removed_paths = [path['path'] for path in comparison['removed_danger_paths'] if path.get('path')]
+        deleted_calls = set(map(tuple, comparison['removed_edges']))
+        # 새 위험 경로의 호출은 빨간색, 사라진 위험 경로의 호출은 초록색 (실제로 삭제된 호출만 점선)
+        added_edges = set(map(tuple, comparison['added_edges']))
+        removed_edges = set(deleted_calls)
+        for path in added_paths:
+            added_edges.update(zip(path, path[1:]))
+        for path in removed_paths:
+            removed_edges.update(zip(path, path[1:]))
+        nodes = list(dict.fromkeys(
+            [node for path in added_paths + removed_paths for node in path]
+            + comparison['added_functions'] + comparison['removed_functions']
+            + [node for edge in added_edges | removed_edges for node in edge]
+        ))[:COMPARISON_IMAGE_MAX_NODES]
+        shown = set(nodes)
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(nodes)
+        for caller, callee in added_edges | removed_edges:
+            if caller in shown and callee in shown:
+                graph.add_edge(caller, callee)
+        for caller, callee in target_graph.subgraph(nodes).edges():
+            graph.add_edge(caller, callee)
+        if not graph.nodes():
+            return _create_default_graph_image()
+
+        added_functions, removed_functions = set(comparison['added_functions']), set(comparison['removed_functions'])
+        dangerous = {node for node in nodes
+                     if (target_graph.nodes[node] if node in target_graph else base_graph.nodes[node]).get('dangers')}
+        try:
+            plt.figure(figsize=(14, 10))
+            pos = nx.spring_layout(graph, k=4, iterations=150) if len(graph.nodes()) > 1 else nx.spring_layout(graph)
+            node_colors = ['red' if node in dangerous and node not in removed_functions
+                           else 'orange' if node in added_functions
+                           else 'lightgray' if node in removed_functions
+                           else 'lightblue' for node in graph.nodes()]
+            edge_colors = ['red' if edge in added_edges else 'green' if edge in removed_edges else 'gray'
+                           for edge in graph.edges()]
+            edge_styles = ['dashed' if edge in deleted_calls else 'solid' for edge in graph.edges()]
+            nx.draw(graph, pos, node_color=node_colors, node_size=2500, font_size=8, font_weight='bold',
+                    arrows=True, edge_color=edge_colors, style=edge_styles, width=2, with_labels=True,
+                    arrowstyle='->', arrowsize=20)
+            plt.title("Changed Call Structure", fontsize=16, fontweight='bold', pad=20)
+            legend_elements = [
+                mpatches.Patch(color='red', label='Dangerous Functions / New Danger Path Calls'),
+                mpatches.Patch(color='green', label='Removed Calls (dashed)'),
+                mpatches.Patch(color='orange', label='Added Functions'),
+                mpatches.Patch(color='lightgray', label='Removed Functions'),
+                mpatches.Patch(color='lightblue', label='Unchanged Functions')
+            ]
+            plt.legend(handles=legend_elements, loc='upper right', fontsize=10)
+            plt.tight_layout()
+            img_buffer = io.BytesIO()
+            plt.savefig(img_buffer, format='png', dpi=200, bbox_inches='tight')
+            plt.close()
+            return img_buffer.getvalue()
+        except Exception as e:
+            log.error("비교 그림 생성 중 오류: %s", e, exc_info=True)
+            plt.close()
+            return _create_default_graph_image()
+
 def create_graph_image(graph: nx.DiGraph, dangerous_functions: List[str]) -> bytes:
     """그래프 이미지를 생성합니다."""
+    with GRAPH_IMAGE_LATENCY.time(), tracer.span("create_graph_image"):
+        return _create_graph_image(graph, dangerous_functions)
+
+def _create_graph_image(graph: nx.DiGraph, dangerous_functions: List[str]) -> bytes:
     try:
         plt.figure(figsize=(14, 10))  # PDF용 크기 조정
         
         # 레이아웃 설정 - 더 넓은 간격
-        if len(graph.nodes()) > 1:
-            pos = nx.spring_layout(graph, k=4, iterations=150)  # 더 넓은 간격
-        else:
-            pos = nx.spring_layout(graph)
+        with tracer.span("spring_layout", nodes=len(graph.nodes())):
+            if len(graph.nodes()) > 1:
+                pos = nx.spring_layout(graph, k=4, iterations=150)  # 더 넓은 간격
+            else:
+                pos = nx.spring_layout(graph)
         
         # 노드 색상 및 크기 설정
         node_colors = ['red' if node in dangerous_functions else 'lightblue' for node in graph.nodes()]
@@ -227,19 +502,20 @@ def create_graph_image(graph: nx.DiGraph, dangerous_functions: List[str]) -> byt
                 edge_colors.append('gray')
         
         # 그래프 그리기
-        nx.draw(
-            graph, pos,
-            node_color=node_colors,
-            node_size=node_sizes,
-            font_size=9,  # PDF용 폰트 크기
-            font_weight='bold',
-            arrows=True,
-            edge_color=edge_colors,
-            width=2,
-            with_labels=True,
-            arrowstyle='->',
-            arrowsize=20
-        )
+        with tracer.span("draw"):
+            nx.draw(
+                graph, pos,
+                node_color=node_colors,
+                node_size=node_sizes,
+                font_size=9,  # PDF용 폰트 크기
+                font_weight='bold',
+                arrows=True,
+                edge_color=edge_colors,
+                width=2,
+                with_labels=True,
+                arrowstyle='->',
+                arrowsize=20
+            )
         
         plt.title("Function Call Structure", fontsize=16, fontweight='bold', pad=20)
         
@@ -254,15 +530,16 @@ def create_graph_image(graph: nx.DiGraph, dangerous_functions: List[str]) -> byt
         plt.tight_layout()
         
         # 이미지를 바이트로 변환
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close()
+        with tracer.span("render_png"):
+            img_buffer = io.BytesIO()
+            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
+            img_buffer.seek(0)
+            plt.close()
         
         return img_buffer.getvalue()
         
     except Exception as e:
-        print(f"그래프 이미지 생성 중 오류: {str(e)}")
+        log.error("그래프 이미지 생성 중 오류: %s", e, exc_info=True)
         # 오류 발생 시 기본 이미지 생성
         return _create_default_graph_image()
     
@@ -282,6 +559,6 @@ def _create_default_graph_image() -> bytes:
         return img_buffer.getvalue()
         
     except Exception as e:
-        print(f"기본 이미지 생성 중 오류: {str(e)}")
+        log.error("기본 이미지 생성 중 오류: %s", e)
         # 최후의 수단: 빈 바이트 반환
         return b'' 
\ No newline at end of file
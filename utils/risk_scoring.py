@@ -0,0 +1,171 @@
+import sys
+import json
+import argparse
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from utils.rules import RuleSet, get_ruleset
+
+# 심각도별 가중치
+SEVERITY_WEIGHTS = {
+    "low": 1.0,
+    "medium": 3.0,
+    "high": 6.0,
+    "critical": 10.0
+}
+
+# 진입 지점별 노출 가중치 (fallback/receive는 누구나 송금만으로 실행 가능, constructor는 배포 시 한 번뿐)
+ENTRY_WEIGHTS = {
+    "fallback": 1.0,
+    "receive": 1.0,
+    "external": 0.6,
+    "constructor": 0.0
+}
+
+# 구조 특징 가중치
+REACHABLE_SEVERITY_WEIGHT = 1.0   # 진입 지점에서 도달 가능한 발견 사항의 심각도 합
+DANGER_CENTRALITY_WEIGHT = 5.0    # 위험 함수의 연결 중심성 합
+DANGER_RATIO_WEIGHT = 4.0         # 전체 함수 중 위험 함수 비율
+
+# 위험 등급 하한 점수 (오름차순)
+RISK_LEVELS = [("LOW", 0.0), ("MEDIUM", 5.0), ("HIGH", 15.0), ("CRITICAL", 30.0)]
+
+STRUCTURAL_FEATURES = ["reachable_severity", "danger_centrality", "danger_ratio"]
+
+class RiskModel:
+    """분석 결과를 특징 행렬로 변환하고 가중 점수로 위험도를 평가합니다.
+
+    특징은 위험 유형별 발견 수, 진입 지점 도달성으로 가중한 심각도 합, 위험 함수의 연결 중심성 합,
+    위험 함수 비율입니다. 점수는 특징 행렬과 가중치 벡터의 곱 한 번으로 전체 배치에 대해 계산됩니다.
+    """
+
+    def __init__(self, ruleset: Optional[RuleSet] = None):
+        self.ruleset = ruleset or get_ruleset()
+        # 규칙에 없는 유형(이전 결과의 'unknown' 등)은 마지막 유형 열에 모음
+        self.categories = list(self.ruleset.categories) + ["other"]
+        self._category_columns = {category: i for i, category in enumerate(self.categories)}
+        self.feature_names = [f"count:{category}" for category in self.categories] + STRUCTURAL_FEATURES
+        self.weights = np.array(
+            [SEVERITY_WEIGHTS[self.ruleset.severity(category)] for category in self.categories]
+            + [REACHABLE_SEVERITY_WEIGHT, DANGER_CENTRALITY_WEIGHT, DANGER_RATIO_WEIGHT],
+            dtype=np.float64
+        )
+
+    def features(self, analysis_result: Dict, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """분석 결과 하나의 특징 벡터를 계산합니다."""
+        row = out if out is not None else np.zeros(len(self.feature_names), dtype=np.float64)
+        other = self._category_columns["other"]
+        categories = len(self.categories)
+
+        findings = analysis_result.get('findings')
+        if findings is None:
+            # 이전 형식의 결과: 유형 정보 없이 위험 함수 목록만 존재
+            findings = [{'function': name, 'category': 'unknown', 'reachable_from': []}
+                        for name in analysis_result.get('dangerous_functions', [])]
+
+        reachable_severity = 0.0
+        for finding in findings:
+            category = finding['category']
+            row[self._category_columns.get(category, other)] += 1
+            exposure = max((ENTRY_WEIGHTS.get(entry, 0.0) for entry in finding.get('reachable_from', [])), default=0.0)
+            # 정밀 분석(Slither) 발견 사항은 결과에 기록된 심각도를 사용
+            severity = finding.get('severity') if category not in self._category_columns else None
+            reachable_severity += SEVERITY_WEIGHTS[severity or self.ruleset.severity(category)] * exposure
+
+        graph_data = analysis_result.get('graph_data', {})
+        nodes = graph_data.get('nodes', [])
+        dangerous = {finding['function'] for finding in findings}
+        centrality = 0.0
+        if len(nodes) > 1 and dangerous:
+            # 연결 중심성 = (진입 차수 + 진출 차수) / (노드 수 - 1)
+            degree = dict.fromkeys(nodes, 0)
+            for caller, callee in graph_data.get('edges', []):
+                degree[caller] = degree.get(caller, 0) + 1
+                degree[callee] = degree.get(callee, 0) + 1
+            centrality = sum(degree.get(name, 0) for name in dangerous) / (len(nodes) - 1)
+
+        row[categories] = reachable_severity
+        row[categories + 1] = centrality
+        row[categories + 2] = len(dangerous) / len(nodes) if nodes else 0.0
+        return row
+
+    def feature_matrix(self, analysis_results: List[Dict]) -> np.ndarray:
+        """여러 분석 결과의 특징 행렬(결과 수 × 특징 수)을 생성합니다."""
+        matrix = np.zeros((len(analysis_results), len(self.feature_names)), dtype=np.float64)
+        for i, analysis_result in enumerate(analysis_results):
+            self.features(analysis_result, out=matrix[i])
+        return matrix
+
+    def score(self, matrix: np.ndarray) -> np.ndarray:
+        """특징 행렬의 각 행에 대한 위험 점수를 계산합니다."""
+        return matrix @ self.weights
+
+    def contributions(self, matrix: np.ndarray) -> np.ndarray:
+        """특징별 점수 기여도(결과 수 × 특징 수)를 계산합니다."""
+        return matrix * self.weights
+
+    def rank(self, analysis_results: List[Dict], limit: Optional[int] = None) -> List[Dict]:
+        """분석 결과를 위험 점수가 높은 순으로 정렬하여 반환합니다."""
+        if not analysis_results:
+            return []
+        matrix = self.feature_matrix(analysis_results)
+        scores = self.score(matrix)
+        levels = risk_levels(scores)
+        order = np.argsort(-scores, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return [{
+            'contract_address': analysis_results[i].get('contract_address', ''),
+            'score': round(float(scores[i]), 2),
+            'risk_level': levels[i],
+            'rank': rank
+        } for rank, i in enumerate(order, 1)]
+
+    def assess(self, analysis_result: Dict) -> Dict:
+        """분석 결과 하나의 위험 점수, 등급, 주요 기여 특징을 반환합니다."""
+        matrix = self.feature_matrix([analysis_result])
+        score = float(self.score(matrix)[0])
+        contributions = self.contributions(matrix)[0]
+        top = [(self.feature_names[i], round(float(contributions[i]), 2))
+               for i in np.argsort(-contributions, kind='stable') if contributions[i] > 0]
+        return {
+            'score': round(score, 2),
+            'risk_level': risk_levels(np.array([score]))[0],
+            'contributions': top
+        }
+
+def risk_levels(scores: np.ndarray) -> List[str]:
+    """점수 배열을 위험 등급 문자열 목록으로 변환합니다."""
+    names = np.array([name for name, _ in RISK_LEVELS])
+    bounds = np.array([bound for _, bound in RISK_LEVELS[1:]])
+    return names[np.searchsorted(bounds, scores, side='right')].tolist()
+
+def load_results(paths: Iterable[str]) -> List[Dict]:
+    """JSON 분석 결과 파일과 코퍼스 결과(JSONL) 파일에서 분석 결과를 읽어옵니다."""
+    results = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 중단된 실행의 마지막 줄
+                    if record.get('status', 'analyzed') == 'analyzed':
+                        results.append(record)
+            else:
+                results.append(json.load(f))
+    return results
+
+def main(argv: List[str] = None) -> int:
+    """명령행에서 분석 결과를 위험 점수순으로 정렬해 출력합니다."""
+    parser = argparse.ArgumentParser(description="ETH Anomaly Lens 위험 점수 순위")
+    parser.add_argument("paths", nargs="+", help="분석 결과 JSON 또는 코퍼스 결과 JSONL 파일")
+    parser.add_argument("--top", type=int, default=50, help="출력할 상위 결과 수 (기본값: 50)")
+    args = parser.parse_args(argv)
+
+    for entry in RiskModel().rank(load_results(args.paths), limit=args.top):
+        print(json.dumps(entry, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional
+from utils.log import get_logger
+from utils.guards import check_linear_pattern
+
+try:
+    import re2  # 선택: 선형 시간이 보장되는 RE2 엔진 (pip install google-re2)
+except ImportError:
+    re2 = None
+
+log = get_logger(__name__)
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "danger_rules.json")
+RULES_PATH = os.getenv("ETH_LENS_RULES_PATH", DEFAULT_RULES_PATH)
+
+# 규칙 파일 변경 여부를 확인하는 최소 간격 (초)
+RELOAD_CHECK_INTERVAL = 2.0
+
+SEVERITY_LEVELS = ["low", "medium", "high", "critical"]
+
+class RuleSet:
+    """위험 패턴 규칙 목록을 하나의 정규식으로 컴파일해 보관합니다.
+
+    모든 규칙은 이름 있는 그룹의 대안(alternation)으로 합쳐지므로 함수 본문을 한 번만 훑어
+    발견된 모든 위험 유형을 얻습니다. 같은 위치에서 여러 규칙이 일치하면 먼저 정의된 규칙이 우선합니다.
+    google-re2가 설치되어 있으면 본문 길이에 선형 시간이 보장되는 RE2 엔진으로 컴파일합니다.
+    """
+
+    def __init__(self, rules: List[Dict], version: str):
+        self.rules = rules
+        self.version = version
+        self.categories = [rule['category'] for rule in rules]
+        self.severities = {rule['category']: rule['severity'] for rule in rules}
+        self._group_to_category = {}
+        parts = []
+        for i, rule in enumerate(rules):
+            group = f"r{i}"
+            self._group_to_category[group] = rule['category']
+            flags = "(?i:" if rule.get('ignore_case', True) else "(?:"
+            parts.append(f"(?P<{group}>{flags}{rule['pattern']}))")
+        self.engine = "re2" if re2 is not None else "re"
+        self._matcher = (re2 or re).compile("|".join(parts)) if parts else None
+
+    @classmethod
+    def from_file(cls, path: str) -> "RuleSet":
+        """규칙 파일(JSON)을 읽어 검증하고 컴파일합니다."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw.decode('utf-8'))
+        rules = data['rules'] if isinstance(data, dict) else data
+        seen = set()
+        for rule in rules:
+            for field in ('category', 'severity', 'pattern'):
+                if not rule.get(field):
+                    raise Exception(f"규칙에 '{field}' 항목이 없습니다: {rule}")
+            if rule['severity'] not in SEVERITY_LEVELS:
+                raise Exception(f"알 수 없는 심각도입니다: {rule['severity']} (허용: {', '.join(SEVERITY_LEVELS)})")
+            if rule['category'] in seen:
+                raise Exception(f"중복된 규칙 유형입니다: {rule['category']}")
+            seen.add(rule['category'])
+            try:
+                re.compile(rule['pattern'])
+            except re.error as e:
+                raise Exception(f"잘못된 정규식입니다 ({rule['category']}): {e}")
+            try:
+                # 공격자가 작성한 소스에서 역추적이 폭발하지 않도록 위험한 구조를 거부
+                check_linear_pattern(rule['pattern'])
+            except Exception as e:
+                raise Exception(f"허용되지 않는 정규식입니다 ({rule['category']}): {e}")
+        return cls(rules, hashlib.sha256(raw).hexdigest()[:12])
+
+    def scan(self, text: str) -> List[str]:
+        """텍스트에서 발견된 위험 유형을 규칙 정의 순서대로 반환합니다."""
+        if self._matcher is None:
+            return []
+        found = set()
+        for match in self._matcher.finditer(text):
+            group = getattr(match, 'lastgroup', None) or next(
+                name for name, value in match.groupdict().items() if value is not None)
+            found.add(self._group_to_category[group])
+            if len(found) == len(self.categories):
+                break
+        return [category for category in self.categories if category in found]
+
+    def severity(self, category: str) -> str:
+        """위험 유형의 심각도를 반환합니다. 규칙에 없는 유형(예: 이전 결과)은 'medium'입니다."""
+        return self.severities.get(category, 'medium')
+
+class RuleRegistry:
+    """규칙 파일을 감시하여 변경되면 다시 컴파일합니다 (워커 재시작 불필요)."""
+
+    def __init__(self, path: str = RULES_PATH, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._ruleset: Optional[RuleSet] = None
+        self._mtime = None
+        self._last_check = 0.0
+
+    def get(self) -> RuleSet:
+        """현재 규칙 세트를 반환합니다. 파일이 바뀌었으면 다시 로드합니다."""
+        now = time.monotonic()
+        if self._ruleset is not None and now - self._last_check < self.check_interval:
+            return self._ruleset
+        with self._lock:
+            self._last_check = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                if self._ruleset is None:
+                    raise Exception(f"규칙 파일을 찾을 수 없습니다: {self.path} ({e})")
+                return self._ruleset
+            if mtime != self._mtime:
+                try:
+                    ruleset = RuleSet.from_file(self.path)
+                except Exception as e:
+                    if self._ruleset is None:
+                        raise
+                    # 잘못 수정된 파일은 무시하고 기존 규칙을 계속 사용
+                    log.warning("규칙 파일 다시 로드 실패, 기존 규칙 유지: %s", e)
+                else:
+                    if self._ruleset is not None and ruleset.version != self._ruleset.version:
+                        log.info("규칙 파일 다시 로드: %s → %s", self._ruleset.version, ruleset.version)
+                    self._ruleset = ruleset
+                self._mtime = mtime
+            return self._ruleset
+
+# 프로세스 전역 규칙 레지스트리
+_registry = RuleRegistry()
+
+def get_ruleset() -> RuleSet:
+    """프로세스 전역 규칙 세트를 반환합니다."""
+    return _registry.get()
@@ -0,0 +1,116 @@
+import re
+import threading
+import unicodedata
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+def normalize_text(text: str) -> str:
+    """검색용으로 텍스트를 정규화합니다 (NFKC, 소문자, 글자/숫자 외 문자는 공백)."""
+    text = unicodedata.normalize('NFKC', text).lower()
+    return ' '.join(re.sub(r'[^\w]+', ' ', text).split())
+
+def trigrams(text: str) -> set:
+    """정규화된 텍스트의 단어별 트라이그램 집합을 반환합니다 (pg_trgm과 같은 패딩)."""
+    grams = set()
+    for word in normalize_text(text).split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+class TrigramIndex:
+    """트라이그램 역색인 기반의 순위 있는 퍼지 검색.
+
+    트라이그램마다 문서 ID 목록(array)을 두고, 조회 시 쿼리 트라이그램의 목록만
+    NumPy로 합쳐 문서별 일치 수를 계산하므로 전체 코퍼스를 훑지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, array] = {}
+        self._keys: List = []
+        self._texts: List[str] = []
+        self._gram_counts = array('i')
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key, fields: Iterable[str]) -> int:
+        """문서를 추가하고 문서 ID를 반환합니다. key는 검색 결과로 돌려줄 값입니다."""
+        text = normalize_text(' '.join(f for f in fields if f))
+        grams = trigrams(text)
+        with self._lock:
+            doc_id = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(text)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array('i')
+                posting.append(doc_id)
+        return doc_id
+
+    def search(self, query: str, limit: Optional[int] = 20, min_score: float = 0.3) -> List[Tuple[object, float]]:
+        """쿼리와 비슷한 문서를 (key, score) 목록으로 점수순 반환합니다.
+
+        점수는 쿼리 트라이그램 중 문서에 포함된 비율이며, 쿼리 전체가 부분 문자열로
+        포함된 문서는 1점을 더해 오타 허용 결과보다 앞에 옵니다.
+        """
+        query_grams = trigrams(query)
+        normalized_query = normalize_text(query)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            postings = [self._postings[g] for g in query_grams if g in self._postings]
+            doc_count = len(self._keys)
+            if not postings or doc_count == 0:
+                return []
+            # array 버퍼를 복사 없이 NumPy로 보고 한 번에 합산
+            doc_ids = np.concatenate([np.frombuffer(p, dtype=np.int32) for p in postings])
+            matches = np.bincount(doc_ids, minlength=doc_count)
+            scores = matches / len(query_grams)
+            candidates = np.flatnonzero(scores >= min_score)
+            texts = self._texts
+            keys = self._keys
+
+            exact = np.fromiter((normalized_query in texts[i] for i in candidates), dtype=bool, count=len(candidates))
+            final_scores = scores[candidates] + exact
+            order = np.argsort(-final_scores, kind='stable')
+            if limit is not None:
+                order = order[:limit]
+            return [(keys[candidates[i]], round(float(final_scores[i]), 3)) for i in order]
+
+class ContractSearchIndex:
+    """분석된 컨트랙트 주소와 함수명에 대한 퍼지 검색 색인"""
+
+    def __init__(self):
+        self.index = TrigramIndex()
+        self._seen = set()
+
+    def add_analysis(self, report_name: str, analysis_result: Dict):
+        """분석 결과 하나의 컨트랙트 주소와 함수명을 색인합니다."""
+        contract = analysis_result.get('contract_address', '').lower()
+        dangerous = set(analysis_result.get('dangerous_functions', []))
+        functions = analysis_result.get('graph_data', {}).get('nodes', [])
+        if (contract, None) not in self._seen:
+            self._seen.add((contract, None))
+            self.index.add({'contract': contract, 'function': None, 'dangerous': False, 'report': report_name},
+                           [contract])
+        for function in functions:
+            if (contract, function) in self._seen:
+                continue
+            self._seen.add((contract, function))
+            self.index.add({'contract': contract, 'function': function,
+                            'dangerous': function in dangerous, 'report': report_name},
+                           [function, _split_identifier(function)])
+
+    def search(self, query: str, limit: int = 50) -> List[Dict]:
+        """주소 또는 함수명으로 검색하여 점수순 결과를 반환합니다."""
+        return [{**key, 'score': score} for key, score in self.index.search(query, limit=limit)]
+
+def _split_identifier(name: str) -> str:
+    """camelCase/snake_case 식별자를 단어로 분리합니다 (예: executeDelegateCall → execute delegate call)."""
+    return ' '.join(re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+', name))
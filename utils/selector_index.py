@@ -0,0 +1,260 @@
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from utils.guards import ForwardFinder
+
+# 별칭 타입의 정식 ABI 이름
+TYPE_ALIASES = {
+    "uint": "uint256",
+    "int": "int256",
+    "byte": "bytes1",
+    "fixed": "fixed128x18",
+    "ufixed": "ufixed128x18"
+}
+
+_ELEMENTARY_PATTERN = re.compile(r'^(address|bool|string|bytes\d*|u?int\d*|u?fixed(\d+x\d+)?|function)$')
+_PARAM_TYPE_PATTERN = re.compile(r'^\s*([\w.]+)\s*((?:\[\s*\d*\s*\]\s*)*)')
+_STRUCT_PATTERN = re.compile(r'\bstruct\s+(\w+)\s*{')
+_ENUM_PATTERN = re.compile(r'\benum\s+(\w+)\s*{')
+_CONTRACT_PATTERN = re.compile(r'\b(?:contract|interface|library)\s+(\w+)')
+_VALUE_TYPE_PATTERN = re.compile(r'\btype\s+(\w+)\s+is\s+(\w+)\s*;')
+_SIGNATURE_PATTERN = re.compile(r'function\s+(\w+)\s*\(([^)]*)\)')
+_PUSH4 = 0x63
+
+# 델타 구간이 이 크기와 본 테이블의 1/DELTA_MERGE_RATIO 중 큰 값을 넘으면 본 테이블에 병합
+DELTA_MERGE_MIN = 4096
+DELTA_MERGE_RATIO = 8
+
+def collect_type_definitions(source_code: str) -> Dict[str, object]:
+    """소스코드의 사용자 정의 타입을 ABI 타입으로 변환하기 위한 정의 목록을 반환합니다.
+
+    enum은 uint8, 컨트랙트/인터페이스는 address, 사용자 정의 값 타입은 기반 타입이 되며,
+    struct는 멤버 타입 문자열 목록으로 두었다가 사용 시점에 튜플로 변환합니다.
+    """
+    definitions = {}
+    for match in _CONTRACT_PATTERN.finditer(source_code):
+        definitions[match.group(1)] = "address"
+    for match in _ENUM_PATTERN.finditer(source_code):
+        definitions[match.group(1)] = "uint8"
+    for match in _VALUE_TYPE_PATTERN.finditer(source_code):
+        definitions[match.group(1)] = match.group(2)
+    # 멤버 목록의 끝은 정규식 대신 선형 탐색으로 찾음 (닫는 중괄호가 없는 소스에서 매번 끝까지 훑지 않도록)
+    struct_end = ForwardFinder(source_code, '}')
+    resume = 0
+    for match in _STRUCT_PATTERN.finditer(source_code):
+        if match.start() < resume:
+            continue
+        end = struct_end.find(match.end())
+        if end == -1:
+            break
+        members = source_code[match.end():end]
+        definitions[match.group(1)] = [member for member in members.split(';') if member.strip()]
+        resume = end + 1
+    return definitions
+
+def canonical_type(param: str, type_definitions: Optional[Dict[str, object]] = None, _depth: int = 0) -> str:
+    """매개변수 선언(예: "uint[] memory amounts")을 정식 ABI 타입(예: "uint256[]")으로 변환합니다."""
+    match = _PARAM_TYPE_PATTERN.match(param)
+    if not match:
+        raise Exception(f"매개변수 타입을 해석할 수 없습니다: {param}")
+    base = match.group(1).split('.')[-1]  # IERC20.Order 같은 한정 이름은 마지막 부분만 사용
+    arrays = re.sub(r'\s+', '', match.group(2))
+    base = TYPE_ALIASES.get(base, base)
+    if not _ELEMENTARY_PATTERN.match(base):
+        definition = (type_definitions or {}).get(base)
+        if isinstance(definition, list):
+            if _depth > 8:
+                raise Exception(f"struct 정의가 너무 깊게 중첩되어 있습니다: {base}")
+            base = "(" + ",".join(canonical_type(member, type_definitions, _depth + 1) for member in definition) + ")"
+        elif definition:
+            base = canonical_type(definition, type_definitions, _depth + 1)
+        else:
+            # 소스에 정의가 없는 사용자 타입은 대부분 외부 컨트랙트/인터페이스 타입
+            base = "address"
+    return base + arrays
+
+def canonical_signature(func_name: str, signature: str,
+                        type_definitions: Optional[Dict[str, object]] = None) -> Optional[str]:
+    """함수 선언부를 정식 ABI 시그니처(예: "transfer(address,uint256)")로 변환합니다.
+
+    이름 있는 함수만 선택자를 가지므로 constructor/fallback/receive는 None을 반환합니다.
+    """
+    match = _SIGNATURE_PATTERN.search(signature)
+    if not match or match.group(1) != func_name:
+        return None
+    params = [p for p in match.group(2).split(',') if p.strip()]
+    return f"{func_name}({','.join(canonical_type(p, type_definitions) for p in params)})"
+
+def function_selector(canonical: str) -> str:
+    """정식 시그니처의 Keccak-256 해시 앞 4바이트(선택자)를 "0x" 16진수 문자열로 반환합니다."""
+    from eth_utils import keccak
+    return "0x" + keccak(text=canonical)[:4].hex()
+
+def selector_to_int(selector: Union[str, int, bytes]) -> int:
+    """선택자("0xa9059cbb", 4바이트, 정수)를 정수로 변환합니다."""
+    if isinstance(selector, int):
+        return selector
+    if isinstance(selector, (bytes, bytearray)):
+        return int.from_bytes(selector[:4], 'big')
+    text = selector[2:] if selector.lower().startswith("0x") else selector
+    if len(text) < 8:
+        raise Exception(f"선택자는 4바이트(16진수 8자리)여야 합니다: {selector}")
+    return int(text[:8], 16)
+
+def bytecode_selectors(bytecode: str) -> List[int]:
+    """런타임 바이트코드의 PUSH4 피연산자(함수 디스패처의 선택자 후보)를 등장 순서대로 반환합니다."""
+    code = bytes.fromhex(bytecode[2:] if bytecode.startswith("0x") else bytecode)
+    selectors = []
+    seen = set()
+    i = 0
+    while i < len(code):
+        opcode = code[i]
+        if 0x60 <= opcode <= 0x7f:
+            size = opcode - 0x5f
+            if opcode == _PUSH4 and i + 5 <= len(code):
+                value = int.from_bytes(code[i + 1:i + 5], 'big')
+                if value not in seen:
+                    seen.add(value)
+                    selectors.append(value)
+            i += size  # PUSH 데이터는 명령어가 아니므로 건너뜀
+        i += 1
+    return selectors
+
+class SelectorIndex:
+    """4바이트 선택자 → 정식 시그니처 조회 테이블.
+
+    선택자는 정렬된 uint32 배열로, 시그니처는 같은 순서의 배열로 보관하여 조회는
+    np.searchsorted 이진 탐색(O(log n))으로 처리합니다. 충돌하는 선택자는 인접한 여러 항목이 됩니다.
+    새 항목은 작은 델타 구간에만 기록하고, 델타가 본 테이블에 비해 커졌을 때 한 번에 병합합니다.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self.path = os.path.join(index_dir, "selectors.npz")
+        self.delta_path = os.path.join(index_dir, "selectors_delta.npz")
+        self._lock = threading.Lock()
+        if not os.path.exists(index_dir):
+            os.makedirs(index_dir)
+        self._load()
+
+    @staticmethod
+    def _read(path: str) -> Tuple[np.ndarray, np.ndarray]:
+        """저장된 (선택자, 시그니처) 배열을 읽어옵니다 (파일이 없으면 빈 배열)."""
+        if not os.path.exists(path):
+            return np.empty(0, dtype=np.uint32), np.empty(0, dtype=str)
+        with np.load(path) as data:
+            return data['selectors'].astype(np.uint32), data['signatures']
+
+    @staticmethod
+    def _write(path: str, selectors: np.ndarray, signatures: np.ndarray):
+        """배열을 임시 파일에 쓴 뒤 교체합니다."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.savez(f, selectors=selectors, signatures=signatures)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _sorted(selectors: np.ndarray, signatures: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(선택자, 시그니처) 순으로 정렬한 배열을 반환합니다."""
+        signatures = signatures.astype(str)
+        order = np.lexsort((signatures, selectors))
+        return selectors[order], signatures[order]
+
+    @staticmethod
+    def _contains(table: np.ndarray, signatures: np.ndarray, keys: np.ndarray, candidates: List[str]) -> np.ndarray:
+        """각 (키, 시그니처)가 정렬된 테이블에 이미 있는지 이진 탐색으로 확인합니다."""
+        left = np.searchsorted(table, keys, side='left')
+        right = np.searchsorted(table, keys, side='right')
+        return np.array([signature in signatures[lo:hi] for signature, lo, hi in zip(candidates, left, right)],
+                        dtype=bool)
+
+    def _load(self):
+        """저장된 선택자 테이블과 델타 구간을 읽어옵니다."""
+        selectors, signatures = self._read(self.path)
+        delta_selectors, delta_signatures = self._read(self.delta_path)
+        if len(delta_selectors):
+            # 병합 중 중단되어 본 테이블에 이미 들어간 항목은 제외
+            keep = ~self._contains(selectors, signatures, delta_selectors, delta_signatures.tolist())
+            delta_selectors, delta_signatures = delta_selectors[keep], delta_signatures[keep]
+        # (본 선택자, 본 시그니처, 델타 선택자, 델타 시그니처); 조회 중인 스레드가 일관된 구간을 보도록 한 번에 교체
+        self._segments = (selectors, signatures, delta_selectors, delta_signatures)
+
+    def __len__(self) -> int:
+        return len(self._segments[0]) + len(self._segments[2])
+
+    def add(self, entries: Iterable[Tuple[str, str]]) -> int:
+        """(선택자, 정식 시그니처) 목록을 추가하고 새로 추가된 항목 수를 반환합니다.
+
+        기존 항목 여부는 정렬된 배열의 이진 탐색으로 확인하고 델타 구간만 다시 쓰므로
+        저장 비용은 전체 테이블이 아니라 추가 항목과 델타 크기에 비례합니다.
+        """
+        entries = sorted({(selector_to_int(selector), signature) for selector, signature in entries})
+        if not entries:
+            return 0
+        keys = np.fromiter((s for s, _ in entries), dtype=np.uint32, count=len(entries))
+        candidates = [signature for _, signature in entries]
+        with self._lock:
+            selectors, signatures, delta_selectors, delta_signatures = self._segments
+            known = (self._contains(selectors, signatures, keys, candidates)
+                     | self._contains(delta_selectors, delta_signatures, keys, candidates))
+            if known.all():
+                return 0
+            new_selectors = keys[~known]
+            new_signatures = np.array(candidates, dtype=object)[~known]
+            delta_selectors, delta_signatures = self._sorted(
+                np.concatenate([delta_selectors, new_selectors]),
+                np.concatenate([delta_signatures.astype(object), new_signatures]))
+
+            if len(delta_selectors) > max(DELTA_MERGE_MIN, len(selectors) // DELTA_MERGE_RATIO):
+                selectors, signatures = self._sorted(
+                    np.concatenate([selectors, delta_selectors]),
+                    np.concatenate([signatures.astype(object), delta_signatures.astype(object)]))
+                self._write(self.path, selectors, signatures)
+                if os.path.exists(self.delta_path):
+                    os.remove(self.delta_path)
+                delta_selectors, delta_signatures = np.empty(0, dtype=np.uint32), np.empty(0, dtype=str)
+            else:
+                self._write(self.delta_path, delta_selectors, delta_signatures)
+            # 조회 중인 스레드는 이전 배열을 계속 사용하도록 참조만 교체
+            self._segments = (selectors, signatures, delta_selectors, delta_signatures)
+        return int((~known).sum())
+
+    def add_signatures(self, signatures: Iterable[str]) -> int:
+        """정식 시그니처 목록의 선택자를 계산하여 추가합니다."""
+        return self.add((function_selector(signature), signature) for signature in signatures)
+
+    def add_analysis(self, analysis_result: Dict) -> int:
+        """분석 결과의 함수 시그니처와 선택자를 추가합니다."""
+        entries = []
+        for info in analysis_result.get('functions', {}).values():
+            entries.extend(zip(info.get('selectors', []), info.get('signatures', [])))
+        return self.add(entries)
+
+    def lookup(self, selector: Union[str, int, bytes]) -> List[str]:
+        """선택자에 해당하는 시그니처 목록을 반환합니다 (없으면 빈 목록)."""
+        return self.lookup_many([selector]).get(selector_to_int(selector), [])
+
+    def lookup_many(self, selectors: Iterable[Union[str, int, bytes]]) -> Dict[int, List[str]]:
+        """여러 선택자를 한 번에 조회하여 {선택자 정수: 시그니처 목록}을 반환합니다."""
+        keys = np.array([selector_to_int(s) for s in selectors], dtype=np.uint32)
+        found = {}
+        selectors, signatures, delta_selectors, delta_signatures = self._segments
+        for table, names in ((selectors, signatures), (delta_selectors, delta_signatures)):
+            left = np.searchsorted(table, keys, side='left')
+            right = np.searchsorted(table, keys, side='right')
+            for key, lo, hi in zip(keys, left, right):
+                if hi > lo:
+                    found.setdefault(int(key), []).extend(names[lo:hi].tolist())
+        return found
+
+    def decode_calldata(self, calldata: str) -> Dict:
+        """트랜잭션 calldata의 앞 4바이트로 호출된 함수 시그니처를 찾습니다."""
+        selector = selector_to_int(calldata)
+        return {'selector': f"0x{selector:08x}", 'signatures': self.lookup(selector)}
+
+    def resolve_bytecode(self, bytecode: str) -> Dict[str, List[str]]:
+        """바이트코드의 선택자 후보 중 색인에 있는 것을 {"0x선택자": 시그니처 목록}으로 반환합니다."""
+        return {f"0x{key:08x}": signatures
+                for key, signatures in self.lookup_many(bytecode_selectors(bytecode)).items()}
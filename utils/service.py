@@ -0,0 +1,511 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from utils.metrics import registry
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 분석 서비스 설정 (환경 변수로 변경 가능)
+SERVICE_URL_ENV_VAR = "ETH_LENS_SERVICE_URL"        # 앱이 분석을 요청할 서비스 주소 (없으면 앱 안에서 분석)
+SERVICE_HOST = os.getenv("ETH_LENS_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("ETH_LENS_SERVICE_PORT", "8765"))
+SERVICE_WORKERS = int(os.getenv("ETH_LENS_SERVICE_WORKERS", "4"))            # 동시에 실행할 분석 수
+SERVICE_MAX_PENDING = int(os.getenv("ETH_LENS_SERVICE_MAX_PENDING", "64"))   # 대기/실행 중인 작업 상한 (넘으면 503)
+SERVICE_MAX_JOBS = 1024            # 결과 조회를 위해 보관하는 작업 수 (오래된 완료 작업부터 삭제)
+SERVICE_MAX_WAIT = 30.0            # result?wait= 로 기다릴 수 있는 최대 시간 (초)
+MAX_REQUEST_BODY = 64 * 1024
+REQUEST_TIMEOUT = 10.0             # 요청 헤더/본문을 읽는 제한 시간 (초)
+DEEP_POLL_INTERVAL = 1.0           # 정밀 분석 완료 확인 간격 (초)
+
+ADDRESS_PATTERN = re.compile(r'^0x[0-9a-fA-F]{40}$')
+ACTIVE_STATES = ("queued", "running")
+
+SERVICE_REQUESTS = registry.counter("eth_lens_service_requests_total", "분석 서비스 HTTP 요청 수", ["route", "status"])
+SERVICE_JOBS = registry.gauge("eth_lens_service_jobs", "분석 서비스 작업 수 (대기/실행 중)", ["state"])
+SERVICE_COALESCED = registry.counter("eth_lens_service_coalesced_total", "진행 중인 같은 주소 작업에 합쳐진 요청 수")
+
+class AnalysisJob:
+    """서비스 작업 하나의 상태와 단계별 이벤트(분석 결과 → 정밀 분석 → 보고서)를 보관합니다.
+
+    상태 변경은 모두 이벤트 루프 스레드에서 일어나며, stream 구독자는 changed 조건으로 새 이벤트를 기다립니다.
+    """
+
+    def __init__(self, address: str, deep: bool = False, report: bool = False):
+        self.job_id = uuid.uuid4().hex[:16]
+        self.address = address
+        self.deep = deep
+        self.report = report
+        self.state = "queued"
+        self.stage: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.requests = 1
+        self.analysis: Optional[Dict] = None
+        self.deep_result: Optional[Dict] = None
+        self.report_filename: Optional[str] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict] = []
+        self.changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.state not in ACTIVE_STATES
+
+    async def publish(self, event: str, **payload):
+        """이벤트를 기록하고 기다리는 구독자를 깨웁니다."""
+        self.events.append({'event': event, 'job_id': self.job_id, **payload})
+        async with self.changed:
+            self.changed.notify_all()
+
+    def status(self) -> Dict:
+        """작업 상태를 반환합니다."""
+        return {
+            'job_id': self.job_id,
+            'address': self.address,
+            'state': self.state,
+            'stage': self.stage,
+            'deep': self.deep,
+            'report': self.report,
+            'requests': self.requests,
+            'created': self.created,
+            'finished': self.finished,
+            'error': self.error
+        }
+
+    def result(self) -> Dict:
+        """지금까지 나온 결과를 반환합니다 (분석 결과가 먼저, 정밀 분석과 보고서는 끝난 뒤 채워짐)."""
+        return {**self.status(), 'analysis': self.analysis, 'deep_result': self.deep_result,
+                'report_filename': self.report_filename}
+
+class AnalysisService:
+    """분석 작업을 제한된 작업 스레드 풀에서 실행하는 asyncio 기반 HTTP 서비스.
+
+    POST /analyses                  {"address": "0x...", "deep": false, "report": false} → 작업 등록
+    GET  /analyses/<id>             작업 상태
+    GET  /analyses/<id>/result      지금까지의 결과 (?wait=초 를 주면 작업이 끝날 때까지 기다림)
+    GET  /analyses/<id>/stream      단계별 결과를 NDJSON으로 스트리밍 (분석 결과 먼저, 정밀 분석은 나중에)
+    GET  /analyses/<id>/report      생성된 PDF 보고서
+    GET  /health                    서비스 상태
+
+    같은 주소의 작업이 진행 중이면 새 작업을 만들지 않고 그 작업을 돌려줍니다.
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, max_pending: int = SERVICE_MAX_PENDING,
+                 file_manager=None):
+        if file_manager is None:
+            from utils.file_manager import FileManager
+            file_manager = FileManager()
+        self.file_manager = file_manager
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-service")
+        # pyplot은 스레드 안전하지 않으므로 PDF(그래프 이미지 포함) 생성은 한 스레드에서만 실행
+        self._report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis-report")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._active_by_address: Dict[str, AnalysisJob] = {}
+        self._deep_engine = None
+        self._deep_engine_lock = threading.Lock()
+
+    # 작업 관리
+
+    def _pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.done)
+
+    def _join_active(self, address: str, deep: bool, report: bool) -> Optional[AnalysisJob]:
+        """진행 중인 같은 주소 작업에 요청을 합칠 수 있으면 그 작업을 반환합니다.
+
+        아직 해당 단계에 도달하지 않았으면 요청한 정밀 분석/보고서를 기존 작업에 추가합니다.
+        """
+        job = self._active_by_address.get(address)
+        if job is None or job.done:
+            return None
+        if deep and not job.deep:
+            if job.stage not in (None, "analysis"):
+                return None
+            job.deep = True
+        if report and not job.report:
+            job.report = True
+        job.requests += 1
+        SERVICE_COALESCED.inc()
+        return job
+
+    def submit(self, address: str, deep: bool = False, report: bool = False) -> Tuple[AnalysisJob, bool]:
+        """작업을 등록하고 (작업, 기존 작업에 합쳐졌는지)를 반환합니다 (이벤트 루프에서 호출)."""
+        address = address.lower()
+        job = self._join_active(address, deep, report)
+        if job is not None:
+            return job, True
+        if self._pending_count() >= self.max_pending:
+            raise OverflowError("대기 중인 분석 작업이 너무 많습니다.")
+        job = AnalysisJob(address, deep=deep, report=report)
+        self._jobs[job.job_id] = job
+        self._active_by_address[address] = job
+        self._evict_finished()
+        SERVICE_JOBS.inc(state="queued")
+        asyncio.get_running_loop().create_task(self._run_job(job))
+        return job, False
+
+    def _evict_finished(self):
+        """보관 상한을 넘으면 오래된 완료 작업부터 삭제합니다."""
+        if len(self._jobs) <= SERVICE_MAX_JOBS:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done]:
+            if len(self._jobs) <= SERVICE_MAX_JOBS:
+                break
+            del self._jobs[job_id]
+
+    def _get_deep_engine(self):
+        """정밀 분석 엔진을 처음 요청될 때 만듭니다."""
+        with self._deep_engine_lock:
+            if self._deep_engine is None:
+                from utils.deep_analysis import DeepAnalysisEngine
+                self._deep_engine = DeepAnalysisEngine(os.path.join(self.file_manager.save_dir, "deep_cache"))
+            return self._deep_engine
+
+    # 작업 실행 (분석/보고서는 작업 스레드, 상태 변경은 이벤트 루프)
+
+    def _analyze(self, address: str):
+        """저장된 이전 결과가 있으면 증분 분석으로 컨트랙트를 분석합니다 (작업 스레드)."""
+        from utils.analyzer import analyze_contract
+        previous_result = self.file_manager.get_latest_analysis(address)
+        return analyze_contract(address, previous_result=previous_result)
+
+    def _analysis_payload(self, address: str, graph, dangerous_functions: List[str]) -> Dict:
+        """그래프를 JSON으로 보낼 수 있는 분석 결과로 변환합니다."""
+        from utils.analyzer import build_analysis_result
+        result = build_analysis_result(contract_address=address, graph=graph, dangerous_functions=dangerous_functions)
+        result['diff'] = graph.graph.get('diff')
+        result['previous_analysis_date'] = graph.graph.get('previous_analysis_date')
+        return result
+
+    def _generate_report(self, address: str, graph, dangerous_functions: List[str]) -> str:
+        """PDF 보고서를 만들어 저장하고 파일명을 반환합니다 (보고서 스레드)."""
+        from utils.report_generator import SecurityReportGenerator
+        pdf_bytes = SecurityReportGenerator().generate_report(
+            contract_address=address, graph=graph, dangerous_functions=dangerous_functions)
+        return self.file_manager.save_pdf_report(address, pdf_bytes)
+
+    async def _run_deep(self, job: AnalysisJob, graph, dangerous_functions: List[str]):
+        """정밀 분석을 등록하고 끝날 때까지 기다린 뒤 발견 사항을 합친 그래프를 반환합니다."""
+        from utils.analyzer import load_source_code
+        from utils.deep_analysis import merge_deep_findings
+        loop = asyncio.get_running_loop()
+        engine = self._get_deep_engine()
+        source_code = await loop.run_in_executor(self._executor, load_source_code, job.address)
+        # 작업 키 계산(도구 버전 확인 subprocess 포함)과 캐시 읽기는 디스크를 쓰므로 이벤트 루프 밖에서 실행
+        key = await loop.run_in_executor(self._executor, engine.submit, source_code)
+        status = await loop.run_in_executor(self._executor, engine.status, key)
+        while status in ACTIVE_STATES:
+            await asyncio.sleep(DEEP_POLL_INTERVAL)
+            status = await loop.run_in_executor(self._executor, engine.status, key)
+        deep_result = await loop.run_in_executor(self._executor, engine.result, key)
+        job.deep_result = deep_result or {'status': status, 'source_hash': key, 'findings': []}
+        if job.deep_result.get('status') == 'completed':
+            graph = await loop.run_in_executor(self._executor, merge_deep_findings, graph, job.deep_result)
+            dangerous_functions = [node for node, dangers in graph.nodes(data='dangers') if dangers]
+            job.analysis = await loop.run_in_executor(
+                self._executor, self._analysis_payload, job.address, graph, dangerous_functions)
+        await job.publish("deep", deep_result=job.deep_result, analysis=job.analysis)
+        return graph, dangerous_functions
+
+    async def _run_job(self, job: AnalysisJob):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._slots:
+                SERVICE_JOBS.dec(state="queued")
+                SERVICE_JOBS.inc(state="running")
+                job.state, job.stage = "running", "analysis"
+                await job.publish("running")
+                graph, dangerous_functions = await loop.run_in_executor(self._executor, self._analyze, job.address)
+                job.analysis = await loop.run_in_executor(
+                    self._executor, self._analysis_payload, job.address, graph, dangerous_functions)
+            # 정밀 분석 대기와 보고서 생성은 분석 작업 슬롯을 차지하지 않음
+            await job.publish("analysis", analysis=job.analysis)
+            if job.deep:
+                job.stage = "deep"
+                graph, dangerous_functions = await self._run_deep(job, graph, dangerous_functions)
+            if job.report:
+                job.stage = "report"
+                job.report_filename = await loop.run_in_executor(
+                    self._report_executor, self._generate_report, job.address, graph, dangerous_functions)
+                await job.publish("report", report_filename=job.report_filename)
+            job.state = "completed"
+        except Exception as e:
+            job.state, job.error = "failed", str(e)
+            log.warning("분석 서비스 작업 실패: %s (%s)", job.address, e, job_id=job.job_id, stage=job.stage)
+        finally:
+            SERVICE_JOBS.dec(state="running" if job.stage else "queued")
+            job.finished = time.time()
+            if self._active_by_address.get(job.address) is job:
+                del self._active_by_address[job.address]
+            await job.publish(job.state, error=job.error)
+
+    # HTTP 처리
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """요청 하나를 읽어 처리하고 연결을 닫습니다 (Connection: close)."""
+        route = "invalid"
+        status = HTTPStatus.BAD_REQUEST
+        try:
+            method, target, body = await asyncio.wait_for(self._read_request(reader), REQUEST_TIMEOUT)
+            route, status = await self._dispatch(method, target, body, writer)
+        except asyncio.TimeoutError:
+            status = HTTPStatus.REQUEST_TIMEOUT
+            await self._send_json(writer, status, {'error': "요청을 읽는 시간이 초과되었습니다."})
+        except (ValueError, asyncio.IncompleteReadError, UnicodeDecodeError) as e:
+            await self._send_json(writer, status, {'error': f"잘못된 요청입니다: {e}"})
+        except ConnectionError:
+            pass  # 스트리밍 중 클라이언트가 연결을 끊은 경우
+        finally:
+            SERVICE_REQUESTS.inc(route=route, status=str(int(status)))
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        method, target, _ = request_line.split(" ", 2)
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1')
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', "0"))
+        if length > MAX_REQUEST_BODY:
+            raise ValueError("요청 본문이 너무 큽니다.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes, writer) -> Tuple[str, int]:
+        """경로에 맞는 처리기를 호출하고 (지표용 경로 이름, 상태 코드)를 반환합니다."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["health"] and method == "GET":
+            status = HTTPStatus.OK
+            await self._send_json(writer, status, {'status': "ok", 'workers': self.workers,
+                                                   'pending_jobs': self._pending_count()})
+            return "health", status
+        if parts == ["analyses"] and method == "POST":
+            return "submit", await self._handle_submit(body, writer)
+        action = (parts[2] if len(parts) == 3 else "status") if len(parts) in (2, 3) else None
+        if parts[:1] == ["analyses"] and method == "GET" and action in ("status", "result", "stream", "report"):
+            job = self._jobs.get(parts[1])
+            if job is None:
+                status = HTTPStatus.NOT_FOUND
+                await self._send_json(writer, status, {'error': "작업을 찾을 수 없습니다."})
+                return action, status
+            if action == "status":
+                status = HTTPStatus.OK
+                await self._send_json(writer, status, job.status())
+                return action, status
+            if action == "result":
+                return action, await self._handle_result(job, query, writer)
+            if action == "stream":
+                return action, await self._handle_stream(job, writer)
+            return action, await self._handle_report(job, writer)
+        status = HTTPStatus.NOT_FOUND
+        await self._send_json(writer, status, {'error': "알 수 없는 경로입니다."})
+        return "unknown", status
+
+    async def _handle_submit(self, body: bytes, writer) -> int:
+        try:
+            request = json.loads(body or b"{}")
+            address = str(request.get('address', ""))
+        except (ValueError, AttributeError):
+            status = HTTPStatus.BAD_REQUEST
+            await self._send_json(writer, status, {'error': "요청 본문은 JSON 객체여야 합니다."})
+            return status
+        if not ADDRESS_PATTERN.match(address):
+            status = HTTPStatus.BAD_REQUEST
+            await self._send_json(writer, status, {'error': "올바른 이더리움 주소 형식이 아닙니다. (0x로 시작하는 42자리 주소)"})
+            return status
+        try:
+            job, coalesced = self.submit(address, deep=bool(request.get('deep')), report=bool(request.get('report')))
+        except OverflowError as e:
+            status = HTTPStatus.SERVICE_UNAVAILABLE
+            await self._send_json(writer, status, {'error': str(e)}, headers={'Retry-After': "5"})
+            return status
+        status = HTTPStatus.OK if coalesced else HTTPStatus.ACCEPTED
+        await self._send_json(writer, status, {**job.status(), 'coalesced': coalesced})
+        return status
+
+    async def _handle_result(self, job: AnalysisJob, query: Dict, writer) -> int:
+        wait = min(float(query.get('wait', ["0"])[0]), SERVICE_MAX_WAIT)
+        if wait > 0 and not job.done:
+            try:
+                async with job.changed:
+                    await asyncio.wait_for(job.changed.wait_for(lambda: job.done), wait)
+            except asyncio.TimeoutError:
+                pass
+        # 분석 결과가 아직 없으면 202 (나중에 다시 조회)
+        status = HTTPStatus.OK if job.analysis is not None or job.done else HTTPStatus.ACCEPTED
+        await self._send_json(writer, status, job.result())
+        return status
+
+    async def _handle_stream(self, job: AnalysisJob, writer) -> int:
+        """지금까지의 이벤트를 보내고, 작업이 끝날 때까지 새 이벤트를 한 줄씩 보냅니다."""
+        status = HTTPStatus.OK
+        writer.write(self._response_head(status, "application/x-ndjson"))
+        sent = 0
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.events) > sent or job.done)
+            for event in job.events[sent:]:
+                writer.write(json.dumps(event, ensure_ascii=False).encode('utf-8') + b"\n")
+            sent = len(job.events)
+            await writer.drain()
+            if job.done and sent == len(job.events):
+                return status
+
+    async def _handle_report(self, job: AnalysisJob, writer) -> int:
+        if not job.report_filename:
+            status = HTTPStatus.NOT_FOUND if job.done else HTTPStatus.ACCEPTED
+            await self._send_json(writer, status, {**job.status(), 'error': "보고서가 아직 없습니다."})
+            return status
+        content = self.file_manager.get_file_content(job.report_filename)
+        status = HTTPStatus.OK
+        writer.write(self._response_head(status, "application/pdf", len(content),
+                                         {'Content-Disposition': f'attachment; filename="{job.report_filename}"'}))
+        writer.write(content)
+        await writer.drain()
+        return status
+
+    @staticmethod
+    def _response_head(status: int, content_type: str, length: Optional[int] = None,
+                       headers: Optional[Dict[str, str]] = None) -> bytes:
+        lines = [f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}",
+                 f"Content-Type: {content_type}", "Connection: close"]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    async def _send_json(self, writer, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(self._response_head(status, "application/json; charset=utf-8", len(body), headers))
+        writer.write(body)
+        await writer.drain()
+
+    async def serve(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT):
+        """요청을 계속 처리합니다 (취소될 때까지 반환하지 않음)."""
+        self._slots = asyncio.Semaphore(self.workers)
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        log.info("분석 서비스 시작: http://%s:%s", host, server.sockets[0].getsockname()[1], workers=self.workers)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+            self._report_executor.shutdown(wait=False)
+            if self._deep_engine is not None:
+                self._deep_engine.shutdown()
+
+class AnalysisServiceClient:
+    """분석 서비스의 동기 클라이언트 (Streamlit 앱 등에서 사용)."""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict:
+        import requests
+        try:
+            response = requests.request(method, self.base_url + path, timeout=kwargs.pop('timeout', self.timeout),
+                                        **kwargs)
+            payload = response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"분석 서비스에 연결할 수 없습니다: {e}")
+        except ValueError:
+            raise Exception(f"분석 서비스 응답 오류: HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise Exception(f"분석 서비스 오류: {payload.get('error') or response.status_code}")
+        return payload
+
+    def submit(self, address: str, deep: bool = False, report: bool = False) -> Dict:
+        """분석 작업을 등록하고 작업 상태를 반환합니다."""
+        return self._request("POST", "/analyses", json={'address': address, 'deep': deep, 'report': report})
+
+    def status(self, job_id: str) -> Dict:
+        """작업 상태를 반환합니다."""
+        return self._request("GET", f"/analyses/{job_id}")
+
+    def result(self, job_id: str, wait: float = 0) -> Dict:
+        """지금까지의 결과를 반환합니다. wait 초까지 작업이 끝나기를 기다립니다."""
+        return self._request("GET", f"/analyses/{job_id}/result", params={'wait': wait},
+                             timeout=self.timeout + wait)
+
+    def stream(self, job_id: str) -> Iterator[Dict]:
+        """작업이 끝날 때까지 단계별 이벤트를 차례로 반환합니다."""
+        import requests
+        with requests.get(f"{self.base_url}/analyses/{job_id}/stream", stream=True,
+                          timeout=(self.timeout, None)) as response:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def analyze(self, address: str):
+        """분석을 요청하고 끝날 때까지 기다려 (그래프, 위험 함수 목록)을 반환합니다."""
+        job = self.submit(address)
+        result = self.result(job['job_id'], wait=SERVICE_MAX_WAIT)
+        while result['state'] in ACTIVE_STATES:
+            result = self.result(job['job_id'], wait=SERVICE_MAX_WAIT)
+        if result['state'] == "failed":
+            raise Exception(result['error'])
+        return graph_from_payload(result['analysis'])
+
+def graph_from_payload(analysis: Dict):
+    """서비스가 보낸 분석 결과를 앱이 사용하는 (그래프, 위험 함수 목록)으로 복원합니다."""
+    from utils.analyzer import graph_from_result
+    graph = graph_from_result(analysis)
+    for key, value in (('trace', analysis.get('timings')), ('budget_exceeded', analysis.get('budget_exceeded')),
+                       ('diff', analysis.get('diff')), ('previous_analysis_date', analysis.get('previous_analysis_date'))):
+        if value:
+            graph.graph[key] = value
+    return graph, analysis.get('dangerous_functions', [])
+
+_client: Optional[AnalysisServiceClient] = None
+
+def get_service_client() -> Optional[AnalysisServiceClient]:
+    """ETH_LENS_SERVICE_URL이 설정되어 있으면 분석 서비스 클라이언트를 반환합니다."""
+    global _client
+    base_url = os.getenv(SERVICE_URL_ENV_VAR)
+    if not base_url:
+        return None
+    if _client is None or _client.base_url != base_url.rstrip("/"):
+        _client = AnalysisServiceClient(base_url)
+    return _client
+
+def main(argv: List[str] = None) -> int:
+    """명령행에서 분석 서비스를 실행합니다."""
+    parser = argparse.ArgumentParser(description="ETH Anomaly Lens 분석 서비스 (HTTP API)")
+    parser.add_argument("--host", default=SERVICE_HOST, help=f"바인딩할 주소 (기본값: {SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help=f"포트 (기본값: {SERVICE_PORT})")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS,
+                        help=f"동시에 실행할 분석 수 (기본값: {SERVICE_WORKERS})")
+    args = parser.parse_args(argv)
+
+    from utils.metrics import start_metrics_server
+    start_metrics_server()
+    service = AnalysisService(workers=args.workers)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        log.info("분석 서비스 종료")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
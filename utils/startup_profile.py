@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import json
+import argparse
+import importlib
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+# 앱이 사용하는 무거운 모듈 (콜드 스타트 예산 측정 대상)
+HEAVY_MODULES = [
+    "streamlit",
+    "numpy",
+    "requests",
+    "networkx",
+    "matplotlib.pyplot",
+    "fpdf",
+    "utils.analyzer",
+    "utils.file_manager",
+    "utils.report_generator"
+]
+
+PROFILE_ENV_VAR = "ETH_LENS_PROFILE_STARTUP"
+
+class StartupProfiler:
+    """모듈 임포트와 초기화 단계별 소요 시간을 기록합니다.
+
+    환경변수 ETH_LENS_PROFILE_STARTUP=1 일 때만 기록하며, 꺼져 있으면 시간 측정을 하지 않습니다.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._records: List[Dict] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, kind: str = "init"):
+        """이름이 붙은 단계의 소요 시간을 측정합니다."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._records.append({
+                    'stage': name,
+                    'kind': kind,
+                    'seconds': round(elapsed, 4),
+                    'since_start': round(time.perf_counter() - self._started, 4)
+                })
+
+    def import_module(self, name: str):
+        """모듈을 임포트하고, 처음 임포트하는 경우 소요 시간을 기록합니다."""
+        if name in sys.modules:
+            return sys.modules[name]
+        with self.stage(f"import {name}", kind="import"):
+            return importlib.import_module(name)
+
+    def records(self) -> List[Dict]:
+        """기록된 단계 목록을 반환합니다."""
+        with self._lock:
+            return list(self._records)
+
+# 프로세스 전역 프로파일러 (Streamlit rerun 사이에도 유지됨)
+startup_profiler = StartupProfiler(enabled=os.getenv(PROFILE_ENV_VAR) == "1")
+
+def measure_cold_import(module: str) -> float:
+    """새 인터프리터에서 모듈 하나를 임포트하는 데 걸리는 시간을 측정합니다."""
+    code = (
+        "import time, importlib; start = time.perf_counter(); "
+        f"importlib.import_module({module!r}); print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    if result.returncode != 0:
+        raise Exception(f"{module} 임포트 실패: {result.stderr.strip().splitlines()[-1:]}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main(argv: List[str] = None) -> int:
+    """모듈별 콜드 임포트 시간을 측정하고 예산 초과 여부를 보고합니다."""
+    parser = argparse.ArgumentParser(description="ETH Anomaly Lens 콜드 스타트 임포트 시간 측정")
+    parser.add_argument("--budget", type=float, default=None, help="전체 임포트 시간 예산 (초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("modules", nargs="*", default=HEAVY_MODULES)
+    args = parser.parse_args(argv)
+
+    results = []
+    for module in args.modules:
+        try:
+            results.append({'module': module, 'seconds': round(measure_cold_import(module), 4)})
+        except Exception as e:
+            results.append({'module': module, 'seconds': None, 'error': str(e)})
+
+    # 모듈들은 서로 의존성을 공유하므로 합계는 상한값입니다
+    total = sum(r['seconds'] for r in results if r['seconds'] is not None)
+    over_budget = args.budget is not None and total > args.budget
+
+    if args.json:
+        print(json.dumps({'modules': results, 'total_seconds': round(total, 4),
+                          'budget_seconds': args.budget, 'over_budget': over_budget}, indent=2))
+    else:
+        for r in sorted(results, key=lambda r: -(r['seconds'] or 0)):
+            value = f"{r['seconds']:.3f}s" if r['seconds'] is not None else r['error']
+            print(f"{r['module']:<28} {value}")
+        print(f"{'total (upper bound)':<28} {total:.3f}s")
+        if args.budget is not None:
+            print(f"budget {args.budget:.3f}s: {'EXCEEDED' if over_budget else 'OK'}")
+
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+TRACING_ENV_VAR = "ETH_LENS_TRACING"
+
+# 현재 실행 중인 스팬 (스레드/세션마다 독립적으로 중첩 관계를 추적)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("eth_lens_current_span", default=None)
+
+class Span:
+    """이름이 붙은 단계 하나의 소요 시간과 하위 단계를 기록합니다.
+
+    with 블록 안에서 시작된 스팬은 자동으로 이 스팬의 하위 단계가 됩니다.
+    """
+
+    __slots__ = ('name', 'attributes', 'seconds', 'children', '_start', '_token')
+
+    def __init__(self, name: str, attributes: Dict):
+        self.name = name
+        self.attributes = attributes
+        self.seconds = 0.0
+        self.children: List["Span"] = []
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        if parent is not None:
+            parent.children.append(self)
+        self._token = _current_span.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.seconds = time.perf_counter() - self._start
+        _current_span.reset(self._token)
+        return False
+
+    def to_dict(self) -> Dict:
+        """저장/표시용 딕셔너리로 변환합니다."""
+        result = {'name': self.name, 'seconds': round(self.seconds, 6)}
+        if self.attributes:
+            result['attributes'] = self.attributes
+        if self.children:
+            result['children'] = [child.to_dict() for child in self.children]
+        return result
+
+class _NoopSpan:
+    """추적이 꺼져 있을 때 사용하는 아무 일도 하지 않는 스팬."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+    """분석/렌더링/보고서 생성 단계별 시간을 중첩된 스팬으로 측정합니다.
+
+    환경변수 ETH_LENS_TRACING=0 이면 span()이 공유 no-op 객체를 반환하므로 측정 비용이 거의 없습니다.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def span(self, name: str, **attributes):
+        """with 문으로 사용할 스팬을 반환합니다. 추적이 꺼져 있으면 as 대상은 None입니다."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(name, attributes)
+
+    def current(self) -> Optional[Span]:
+        """현재 실행 중인 스팬을 반환합니다."""
+        return _current_span.get()
+
+# 프로세스 전역 추적기
+tracer = Tracer(enabled=os.getenv(TRACING_ENV_VAR, "1") != "0")
+
+def flatten_trace(trace: Optional[Dict]) -> List[Dict]:
+    """저장된 스팬 트리를 표시용 행 목록(깊이, 단계, 초, 전체 대비 비율)으로 펼칩니다."""
+    if not trace:
+        return []
+    total = trace['seconds'] or 1e-9
+    rows = []
+    stack = [(trace, 0)]
+    while stack:
+        span, depth = stack.pop()
+        rows.append({
+            'depth': depth,
+            'stage': span['name'],
+            'seconds': span['seconds'],
+            'share': round(span['seconds'] / total, 4)
+        })
+        # 자식 순서를 유지하도록 역순으로 넣음
+        stack.extend((child, depth + 1) for child in reversed(span.get('children', [])))
+    return rows
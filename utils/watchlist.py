@@ -0,0 +1,334 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import argparse
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+from utils.metrics import registry
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 감시 설정 (환경 변수로 변경 가능)
+WATCH_INTERVAL = float(os.getenv("ETH_LENS_WATCH_INTERVAL", "3600"))   # 주소별 기본 확인 주기 (초)
+WATCH_JITTER = float(os.getenv("ETH_LENS_WATCH_JITTER", "0.1"))        # 주기에 더하는 무작위 편차 비율 (±)
+WATCH_WORKERS = int(os.getenv("ETH_LENS_WATCH_WORKERS", "4"))          # 동시에 확인할 주소 수
+WATCH_WEBHOOK_URL = os.getenv("ETH_LENS_WATCH_WEBHOOK")                # 경보를 POST로 보낼 주소 (선택)
+MAX_IDLE_SECONDS = 30.0            # 확인할 주소가 없을 때 새로 추가된 주소를 다시 찾는 간격
+
+ALERT_KINDS = ["new_finding", "new_reachable_path", "implementation_changed", "code_changed"]
+
+WATCH_CHECKS = registry.counter("eth_lens_watch_checks_total", "감시 주소 확인 수 (결과별)", ["outcome"])
+WATCH_ALERTS = registry.counter("eth_lens_watch_alerts_total", "감시 경보 수 (종류별)", ["kind"])
+WATCHED_ADDRESSES = registry.gauge("eth_lens_watched_addresses", "감시 중인 주소 수")
+
+def source_hash(source_code: str) -> str:
+    """소스코드의 SHA-256 해시를 반환합니다."""
+    return hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+
+def detect_alerts(previous_result: Dict, analysis_result: Dict) -> List[Dict]:
+    """이전 분석 결과 대비 새 위험 발견 사항과 새로 생긴 진입 지점 도달 경로를 찾습니다."""
+    previous = {(f['function'], f['category']): set(f.get('reachable_from', []))
+                for f in previous_result.get('findings', [])}
+    alerts = []
+    for finding in analysis_result.get('findings', []):
+        key = (finding['function'], finding['category'])
+        reachable = finding.get('reachable_from', [])
+        if key not in previous:
+            alerts.append({'kind': "new_finding", 'function': finding['function'], 'category': finding['category'],
+                           'severity': finding.get('severity'), 'reachable_from': reachable})
+            continue
+        new_entries = [entry for entry in reachable if entry not in previous[key]]
+        if new_entries:
+            alerts.append({'kind': "new_reachable_path", 'function': finding['function'],
+                           'category': finding['category'], 'severity': finding.get('severity'),
+                           'reachable_from': new_entries})
+    return alerts
+
+class Watchlist:
+    """감시 주소와 주소별 다음 확인 시각, 마지막으로 본 소스 해시를 디스크(SQLite)에 보관합니다.
+
+    다음 확인 시각에 색인이 있으므로 주소가 수만 개여도 확인할 주소를 바로 꺼낼 수 있고,
+    실행 중인 감시 프로세스도 다른 프로세스가 추가/삭제한 주소를 다음 조회에서 그대로 반영합니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS watchlist ("
+                "address TEXT PRIMARY KEY, interval REAL NOT NULL, next_due REAL NOT NULL, "
+                "source_hash TEXT, implementation TEXT, code_hash TEXT, analysis_file TEXT, "
+                "last_checked REAL, last_changed REAL, error TEXT, added_at REAL)"
+            )
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(watchlist)")}
+            if 'code_hash' not in columns:
+                # 바이트코드 해시를 기록하기 전에 만든 감시 목록
+                self._conn.execute("ALTER TABLE watchlist ADD COLUMN code_hash TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS watchlist_next_due ON watchlist (next_due)")
+
+    def add(self, addresses: Iterable[str], interval: float = WATCH_INTERVAL) -> int:
+        """주소를 감시 목록에 추가하고 (이미 있으면 주기만 변경) 처리한 주소 수를 반환합니다."""
+        now = time.time()
+        rows = [(address.lower(), interval, now, now) for address in addresses]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO watchlist (address, interval, next_due, added_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(address) DO UPDATE SET interval = excluded.interval", rows)
+        return len(rows)
+
+    def remove(self, addresses: Iterable[str]) -> int:
+        """주소를 감시 목록에서 삭제하고 삭제한 주소 수를 반환합니다."""
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM watchlist WHERE address = ?", [(address.lower(),) for address in addresses])
+            return cursor.rowcount
+
+    def claim_due(self, limit: int, jitter: float = WATCH_JITTER, now: Optional[float] = None) -> List[Dict]:
+        """확인할 때가 된 주소를 꺼내고, 각 주소의 다음 확인 시각을 주기(±jitter)만큼 뒤로 미룹니다.
+
+        주기에 무작위 편차를 주어 한꺼번에 추가된 주소들의 확인 시각이 시간이 지나며 고르게 퍼지게 합니다.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            rows = [dict(row) for row in self._conn.execute(
+                "SELECT * FROM watchlist WHERE next_due <= ? ORDER BY next_due LIMIT ?", (now, limit))]
+            self._conn.executemany(
+                "UPDATE watchlist SET next_due = ? WHERE address = ?",
+                [(now + row['interval'] * (1 + random.uniform(-jitter, jitter)), row['address']) for row in rows])
+        return rows
+
+    def next_due(self) -> Optional[float]:
+        """가장 빠른 다음 확인 시각을 반환합니다 (목록이 비었으면 None)."""
+        with self._lock:
+            return self._conn.execute("SELECT MIN(next_due) FROM watchlist").fetchone()[0]
+
+    def record_check(self, address: str, **fields):
+        """확인 결과(소스 해시, 구현 주소, 바이트코드 해시, 분석 파일, 오류 등)를 기록합니다."""
+        fields['last_checked'] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE watchlist SET {assignments} WHERE address = ?",
+                               (*fields.values(), address))
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict]:
+        """감시 중인 주소를 다음 확인 시각 순서로 반환합니다."""
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(
+                "SELECT * FROM watchlist ORDER BY next_due LIMIT ?", (limit if limit is not None else -1,))]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM watchlist").fetchone()[0]
+
+class AlertSink:
+    """감시 경보를 JSONL 파일과 로그에 기록하고, 설정되어 있으면 웹훅으로 보냅니다."""
+
+    def __init__(self, path: str, webhook_url: Optional[str] = WATCH_WEBHOOK_URL):
+        self.path = path
+        self.webhook_url = webhook_url
+        self._lock = threading.Lock()
+
+    def emit(self, alert: Dict):
+        WATCH_ALERTS.inc(kind=alert['kind'])
+        log.warning("감시 경보: %s %s", alert['kind'], alert['address'],
+                    function=alert.get('function'), category=alert.get('category'))
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+        if self.webhook_url:
+            import requests
+            try:
+                requests.post(self.webhook_url, json=alert, timeout=5)
+            except requests.exceptions.RequestException as e:
+                log.warning("경보 웹훅 전송 실패: %s", e)
+
+class WatchScheduler:
+    """감시 주소를 주기적으로 확인하고, 소스, 프록시 구현 주소, 런타임 바이트코드가 바뀐 컨트랙트만 다시 분석합니다.
+
+    구현 주소는 Etherscan의 Implementation 필드가 아니라 EIP-1967 슬롯에서 직접 읽으므로 슬롯만 바뀌는
+    업그레이드도 감지합니다. Etherscan 호출은 프로세스 전체가 공유하는 호출 한도(ETH_LENS_ETHERSCAN_RATE)
+    안에서 이루어지며, 확인 한 번은 소스 조회 하나와 동시에 보내는 온체인 조회 셋(슬롯 둘, 바이트코드 하나)입니다.
+    """
+
+    def __init__(self, watchlist: Watchlist, file_manager, alert_sink: AlertSink,
+                 workers: int = WATCH_WORKERS, jitter: float = WATCH_JITTER,
+                 on_alert: Optional[Callable[[Dict], None]] = None):
+        self.watchlist = watchlist
+        self.file_manager = file_manager
+        self.alert_sink = alert_sink
+        self.workers = workers
+        self.jitter = jitter
+        self.on_alert = on_alert
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _load_previous(self, entry: Dict) -> Optional[Dict]:
+        """마지막 분석 결과를 읽습니다 (감시 중 저장한 파일이 있으면 저장소 전체를 훑지 않음)."""
+        if entry.get('analysis_file'):
+            try:
+                with open(os.path.join(self.file_manager.save_dir, entry['analysis_file']), 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return self.file_manager.get_latest_analysis(entry['address'])
+
+    def check(self, entry: Dict) -> List[Dict]:
+        """주소 하나를 확인하고 발생한 경보 목록을 반환합니다."""
+        from utils.fetcher import get_fetcher
+        from utils.analyzer import analyze_contract, build_analysis_result
+        from utils.proxy import invalidate_mapping, read_onchain_state
+        address = entry['address']
+        try:
+            contract = get_fetcher().fetch_contract(address, refresh=True)
+            if not contract['verified']:
+                raise Exception("컨트랙트 소스코드가 공개되지 않았습니다.")
+            state = read_onchain_state(address)
+            current_hash = source_hash(contract['source_code'])
+            implementation = state['implementation']
+            if implementation is None and entry['implementation'] is not None:
+                # 슬롯을 읽지 못한 경우 바뀌지 않은 것으로 봄 (Etherscan 값과 번갈아 비교해 오경보가 나지 않도록)
+                implementation = entry['implementation']
+            elif not implementation:
+                # EIP-1967이 아닌 프록시는 Etherscan의 Implementation 필드 사용
+                implementation = (contract.get('implementation') or "").lower()
+            code_hash = state['code_hash'] or entry.get('code_hash')
+            code_changed = entry.get('code_hash') is not None and code_hash != entry['code_hash']
+            if (current_hash == entry['source_hash'] and implementation == (entry['implementation'] or "")
+                    and not code_changed):
+                WATCH_CHECKS.inc(outcome="unchanged")
+                self.watchlist.record_check(address, code_hash=code_hash, error=None)
+                return []
+
+            # 바뀐 함수만 다시 분석 (이전 결과의 함수 해시와 비교하는 증분 분석)
+            previous_result = self._load_previous(entry)
+            # 구현 주소가 바뀌었을 수 있으므로 캐시된 프록시 매핑을 버리고 슬롯을 다시 읽음
+            invalidate_mapping(address)
+            graph, dangerous_functions = analyze_contract(address, previous_result=previous_result)
+            analysis_result = build_analysis_result(
+                contract_address=address, graph=graph, dangerous_functions=dangerous_functions)
+            analysis_file = self.file_manager.save_json_report(address, analysis_result)
+        except Exception as e:
+            WATCH_CHECKS.inc(outcome="error")
+            log.warning("감시 주소 확인 실패: %s (%s)", address, e)
+            self.watchlist.record_check(address, error=str(e))
+            return []
+
+        WATCH_CHECKS.inc(outcome="changed")
+        alerts = []
+        # 처음 확인하는 주소는 기준선만 기록 (수만 개를 한 번에 추가해도 경보가 쏟아지지 않도록)
+        if entry['source_hash'] is not None:
+            if previous_result:
+                alerts.extend(detect_alerts(previous_result, analysis_result))
+            if implementation != (entry['implementation'] or ""):
+                alerts.append({'kind': "implementation_changed", 'previous': entry['implementation'],
+                               'implementation': implementation})
+            if code_changed:
+                alerts.append({'kind': "code_changed", 'previous': entry['code_hash'], 'code_hash': code_hash})
+        detected_at = analysis_result['analysis_date']
+        for alert in alerts:
+            alert.update(address=address, analysis_file=analysis_file, detected_at=detected_at)
+            self.alert_sink.emit(alert)
+            if self.on_alert is not None:
+                self.on_alert(alert)
+        self.watchlist.record_check(address, source_hash=current_hash, implementation=implementation,
+                                    code_hash=code_hash, analysis_file=analysis_file, last_changed=time.time(), error=None)
+        log.info("감시 주소 변경 감지: %s", address, alerts=len(alerts), functions=graph.number_of_nodes())
+        return alerts
+
+    def run(self, once: bool = False) -> Dict:
+        """확인할 때가 된 주소를 작업 스레드로 확인합니다. once면 지금 확인할 주소만 처리하고 끝냅니다."""
+        stats = {'checked': 0, 'alerts': 0}
+        in_flight = set()
+        WATCHED_ADDRESSES.set(len(self.watchlist))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch") as pool:
+            while not self._stop.is_set():
+                # 작업 스레드 수의 두 배까지만 꺼내 두므로 목록이 커도 메모리 사용량이 일정함
+                capacity = self.workers * 2 - len(in_flight)
+                if capacity > 0:
+                    in_flight.update(pool.submit(self.check, entry)
+                                     for entry in self.watchlist.claim_due(capacity, self.jitter))
+                if not in_flight:
+                    if once:
+                        break
+                    next_due = self.watchlist.next_due()
+                    delay = MAX_IDLE_SECONDS if next_due is None else next_due - time.time()
+                    self._stop.wait(min(max(delay, 0.0), MAX_IDLE_SECONDS))
+                    WATCHED_ADDRESSES.set(len(self.watchlist))
+                    continue
+                done, in_flight = wait(in_flight, timeout=MAX_IDLE_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats['checked'] += 1
+                    try:
+                        stats['alerts'] += len(future.result())
+                    except Exception as e:
+                        # 경보 기록 실패 등 (다음 주기에 다시 확인)
+                        log.error("감시 작업 오류: %s", e, exc_info=True)
+        return stats
+
+def main(argv: List[str] = None) -> int:
+    """명령행에서 감시 목록을 관리하거나 감시를 실행합니다."""
+    parser = argparse.ArgumentParser(description="ETH Anomaly Lens 컨트랙트 감시")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = subparsers.add_parser("add", help="감시 주소 추가 (이미 있으면 주기 변경)")
+    add_parser.add_argument("addresses", nargs="*", help="컨트랙트 주소")
+    add_parser.add_argument("--file", default=None, help="한 줄에 주소 하나씩 적힌 파일")
+    add_parser.add_argument("--interval", type=float, default=WATCH_INTERVAL,
+                            help=f"확인 주기 (초, 기본값: {WATCH_INTERVAL:g})")
+    remove_parser = subparsers.add_parser("remove", help="감시 주소 삭제")
+    remove_parser.add_argument("addresses", nargs="+", help="컨트랙트 주소")
+    list_parser = subparsers.add_parser("list", help="감시 주소 목록 (다음 확인 시각 순)")
+    list_parser.add_argument("--limit", type=int, default=100, help="출력할 최대 주소 수")
+    run_parser = subparsers.add_parser("run", help="감시 실행")
+    run_parser.add_argument("--workers", type=int, default=WATCH_WORKERS,
+                            help=f"동시에 확인할 주소 수 (기본값: {WATCH_WORKERS})")
+    run_parser.add_argument("--once", action="store_true", help="지금 확인할 주소만 처리하고 종료")
+    args = parser.parse_args(argv)
+
+    from utils.file_manager import FileManager
+    file_manager = FileManager()
+    watchlist = Watchlist(os.path.join(file_manager.save_dir, "watchlist.sqlite3"))
+
+    if args.command == "add":
+        addresses = list(args.addresses)
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                addresses.extend(line.strip() for line in f if line.strip())
+        invalid = [address for address in addresses if not (address.startswith('0x') and len(address) == 42)]
+        if invalid:
+            parser.error(f"올바른 이더리움 주소 형식이 아닙니다: {', '.join(invalid[:5])}")
+        print(json.dumps({'added': watchlist.add(addresses, args.interval), 'watched': len(watchlist)}))
+    elif args.command == "remove":
+        print(json.dumps({'removed': watchlist.remove(args.addresses), 'watched': len(watchlist)}))
+    elif args.command == "list":
+        for entry in watchlist.entries(args.limit):
+            print(json.dumps(entry, ensure_ascii=False))
+    else:
+        from utils.metrics import start_metrics_server
+        start_metrics_server()
+        scheduler = WatchScheduler(watchlist, file_manager,
+                                   AlertSink(os.path.join(file_manager.save_dir, "watch_alerts.jsonl")),
+                                   workers=args.workers)
+        log.info("감시 시작", watched=len(watchlist), workers=args.workers)
+        try:
+            stats = scheduler.run(once=args.once)
+        except KeyboardInterrupt:
+            scheduler.stop()
+            return 0
+        print(json.dumps(stats))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())